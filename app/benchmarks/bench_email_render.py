@@ -0,0 +1,65 @@
+"""
+Швидкість рендеру листів підтвердження під час сплеску реєстрацій.
+
+Порівнює три способи: нове оточення Jinja на кожен лист (як FastMail з
+template_name), спільне оточення з кешем байткоду та пакетний render_many
+для всієї партії:
+
+    python -m benchmarks.bench_email_render --users 500 --rounds 20
+"""
+import argparse
+import statistics
+import time
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from src.services.rendering import TEMPLATE_FOLDER, precompile, render, render_many, template_env
+
+TEMPLATE = "email_template.html"
+# довжина типового токена підтвердження
+TOKEN = "x" * 180
+
+
+def contexts(users: int) -> list[dict]:
+    return [{"host": "http://localhost:8000/", "username": f"user{i}", "token": TOKEN} for i in range(users)]
+
+
+def per_send(batch: list[dict]):
+    for context in batch:
+        env = Environment(loader=FileSystemLoader(TEMPLATE_FOLDER), autoescape=select_autoescape())
+        env.get_template(TEMPLATE).render(context)
+
+
+def shared(batch: list[dict]):
+    for context in batch:
+        render(TEMPLATE, context)
+
+
+def batched(batch: list[dict]):
+    render_many(TEMPLATE, batch)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=500, help="листів в одному сплеску")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    precompile(template_env)
+    print(f"precompile: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    batch = contexts(args.users)
+    print(f"{'mode':<10} {'renders/s':>12} {'burst ms':>10}")
+    for name, func in (("per-send", per_send), ("shared", shared), ("batch", batched)):
+        samples = []
+        for _ in range(args.rounds):
+            start = time.perf_counter()
+            func(batch)
+            samples.append(time.perf_counter() - start)
+        median = statistics.median(samples)
+        print(f"{name:<10} {args.users / median:>12.0f} {median * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Кількість перевірок JWT за секунду для кожного бекенду й алгоритму.
+
+Для кожної пари вимірюється повна перевірка (кеш вимкнено) та повторна
+перевірка того самого токена через кеш TokenCodec:
+
+    python -m benchmarks.bench_jwt_decode --iterations 20000
+"""
+import argparse
+import time
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, rsa
+
+from src.services.tokens import BACKENDS, TokenCodec
+
+SECRET = "benchmark-secret-key-of-at-least-32-bytes"
+
+
+def pem_pair(private_key) -> tuple[bytes, bytes]:
+    private = private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                        serialization.NoEncryption())
+    public = private_key.public_key().public_bytes(serialization.Encoding.PEM,
+                                                   serialization.PublicFormat.SubjectPublicKeyInfo)
+    return private, public
+
+
+def keys() -> dict:
+    return {
+        "HS256": {"secret_key": SECRET},
+        "RS256": dict(zip(("private_key", "public_key"),
+                          pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048)))),
+        "ES256": dict(zip(("private_key", "public_key"), pem_pair(ec.generate_private_key(ec.SECP256R1())))),
+        "EdDSA": dict(zip(("private_key", "public_key"), pem_pair(ed25519.Ed25519PrivateKey.generate()))),
+    }
+
+
+def decodes_per_second(codec: TokenCodec, token: str, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        codec.decode(token)
+    return iterations / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    claims = {"sub": "bench@example.com", "scope": "access_token", "exp": int(time.time()) + 3600}
+    print(f"{'backend':<8} {'alg':<6} {'decodes/s':>12} {'cached/s':>12}")
+    for algorithm, material in keys().items():
+        for backend in BACKENDS:
+            try:
+                uncached = TokenCodec(algorithm, backend=backend, cache_size=0, **material)
+            except (ImportError, ValueError) as err:
+                print(f"{backend:<8} {algorithm:<6} {'-':>12} {'-':>12}  {err}")
+                continue
+            cached = TokenCodec(algorithm, backend=backend, **material)
+            token = uncached.encode(claims)
+            print(f"{backend:<8} {algorithm:<6} {decodes_per_second(uncached, token, args.iterations):>12.0f} "
+                  f"{decodes_per_second(cached, token, args.iterations):>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
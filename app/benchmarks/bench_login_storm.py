@@ -0,0 +1,66 @@
+"""
+Затримка GET /api/notes під час шторму логінів.
+
+Спочатку вимірює p50/p99 запитів до нотаток без навантаження, потім ще раз,
+поки --logins клієнтів безперервно викликають /api/auth/login. Якщо bcrypt
+виконується в циклі подій, p99 нотаток зростає до сотень мілісекунд:
+
+    uvicorn main:app --workers 1
+    python -m benchmarks.bench_login_storm --token <access_token> --email user@example.com --password secret
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from benchmarks.bench_notes_concurrency import percentile
+
+
+async def notes_worker(client: httpx.AsyncClient, deadline: float, latencies: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.get("/api/notes/?limit=20")
+        if response.status_code == 200:
+            latencies.append(time.perf_counter() - start)
+
+
+async def login_worker(client: httpx.AsyncClient, deadline: float, email: str, password: str, counter: list):
+    while time.perf_counter() < deadline:
+        response = await client.post("/api/auth/login", data={"username": email, "password": password})
+        counter.append(response.status_code)
+
+
+async def phase(args, logins: int) -> tuple:
+    latencies, login_results = [], []
+    headers = {"Authorization": f"Bearer {args.token}"}
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, timeout=60) as notes_client, \
+            httpx.AsyncClient(base_url=args.url, timeout=60) as login_client:
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            *[notes_worker(notes_client, deadline, latencies) for _ in range(args.readers)],
+            *[login_worker(login_client, deadline, args.email, args.password, login_results) for _ in range(logins)],
+        )
+    return latencies, login_results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15.0)
+    args = parser.parse_args()
+
+    print(f"{'phase':<14} {'notes req/s':>12} {'p50 ms':>8} {'p99 ms':>8} {'logins/s':>9}")
+    for name, logins in (("idle", 0), ("login storm", args.logins)):
+        latencies, login_results = await phase(args, logins)
+        print(f"{name:<14} {len(latencies) / args.duration:>12.1f} {percentile(latencies, 0.5) * 1000:>8.1f} "
+              f"{percentile(latencies, 0.99) * 1000:>8.1f} {len(login_results) / args.duration:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
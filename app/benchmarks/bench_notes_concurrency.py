@@ -0,0 +1,71 @@
+"""
+Навантажувальний бенчмарк для GET /api/notes.
+
+Запускає зростаючу кількість одночасних клієнтів проти одного воркера uvicorn
+і виводить пропускну здатність та затримки для кожного рівня конкурентності.
+Щоб порівняти "до" і "після", запустіть сервер з потрібного коміту:
+
+    uvicorn main:app --workers 1
+    python -m benchmarks.bench_notes_concurrency --token <access_token>
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+async def worker(client: httpx.AsyncClient, url: str, deadline: float, latencies: list, errors: list):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await client.get(url)
+            if response.status_code != 200:
+                errors.append(response.status_code)
+                continue
+        except httpx.HTTPError as err:
+            errors.append(type(err).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_level(base_url: str, token: str, concurrency: int, duration: float, limit: int):
+    latencies, errors = [], []
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    headers = {"Authorization": f"Bearer {token}"}
+    async with httpx.AsyncClient(base_url=base_url, headers=headers, limits=limits, timeout=30) as client:
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*[
+            worker(client, f"/api/notes/?limit={limit}", deadline, latencies, errors) for _ in range(concurrency)
+        ])
+    return latencies, errors
+
+
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct))]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="access token of an existing confirmed user")
+    parser.add_argument("--levels", default="1,8,32,64,128,256")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per concurrency level")
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'conc':>6} {'req/s':>10} {'p50 ms':>10} {'p99 ms':>10} {'errors':>8}")
+    for concurrency in map(int, args.levels.split(",")):
+        latencies, errors = await run_level(args.url, args.token, concurrency, args.duration, args.limit)
+        rps = len(latencies) / args.duration
+        p50 = statistics.median(latencies) * 1000 if latencies else float("nan")
+        p99 = percentile(latencies, 0.99) * 1000
+        print(f"{concurrency:>6} {rps:>10.1f} {p50:>10.1f} {p99:>10.1f} {len(errors):>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
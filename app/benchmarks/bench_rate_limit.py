@@ -0,0 +1,84 @@
+"""
+Накладні витрати RateLimitMiddleware на один запит.
+
+Викликає middleware напряму з порожнім ASGI-застосунком, щоб виміряти саме
+рішення ліміту: без middleware, з локальними відрами (Redis вимкнено) і з
+Redis, якщо він доступний за --redis-url:
+
+    python -m benchmarks.bench_rate_limit --requests 20000 --users 100
+"""
+import argparse
+import asyncio
+import time
+
+import redis.asyncio as redis
+from redis.exceptions import RedisError
+
+from src.services.rate_limit import Policy, RateLimiter, RateLimitMiddleware, token_subject
+from src.services.tokens import InvalidToken, TokenCodec
+
+SECRET = "benchmark-secret-key-of-at-least-32-bytes"
+
+
+async def app(scope, receive, send):
+    pass
+
+
+async def send(message):
+    pass
+
+
+def policies() -> list[Policy]:
+    # ліміти з запасом, щоб вимірювались пропущені запити, а не відповіді 429
+    return [
+        Policy("write", "/api/*", "sliding_window", methods=["POST"], limit=10 ** 9, window=60),
+        Policy("read", "/api/*", "token_bucket", methods=["GET"], rate=10 ** 6, burst=10 ** 6),
+    ]
+
+
+async def measure(handler, scopes: list[dict]) -> float:
+    start = time.perf_counter()
+    for scope in scopes:
+        await handler(scope, None, send)
+    return (time.perf_counter() - start) / len(scopes) * 1_000_000
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--redis-url", default="redis://localhost:6379/0")
+    args = parser.parse_args()
+
+    codec = TokenCodec("HS256", secret_key=SECRET)
+    tokens = [codec.encode({"sub": f"user{i}@example.com", "exp": int(time.time()) + 3600})
+              for i in range(args.users)]
+    identify = token_subject(codec.decode, (InvalidToken,))
+    print(f"{'mode':<10} {'algorithm':<15} {'us/request':>11}")
+
+    for method, algorithm in (("GET", "token_bucket"), ("POST", "sliding_window")):
+        scopes = [
+            {"type": "http", "method": method, "path": "/api/notes/", "client": ("10.0.0.1", 5000),
+             "headers": [(b"authorization", f"Bearer {tokens[i % args.users]}".encode())]}
+            for i in range(args.requests)
+        ]
+        print(f"{'none':<10} {algorithm:<15} {await measure(app, scopes):>11.1f}")
+
+        local = RateLimiter(policies())
+        print(f"{'local':<10} {algorithm:<15} {await measure(RateLimitMiddleware(app, local, identify), scopes):>11.1f}")
+
+        client = redis.from_url(args.redis_url)
+        try:
+            await client.ping()
+        except (RedisError, OSError) as err:
+            print(f"{'redis':<10} {algorithm:<15} {'-':>11}  {err}")
+            continue
+        remote = RateLimiter(policies(), prefix="rl:bench")
+        remote.init(client)
+        print(f"{'redis':<10} {algorithm:<15} {await measure(RateLimitMiddleware(app, remote, identify), scopes):>11.1f}")
+        await client.delete(*[key async for key in client.scan_iter(match="rl:bench:*")])
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
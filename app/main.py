@@ -1,18 +1,23 @@
-from pathlib import Path
-
 import uvicorn
 from fastapi import FastAPI, BackgroundTasks
 from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
 from pydantic import EmailStr, BaseModel
 import uvicorn
 from starlette.middleware.cors import CORSMiddleware
-from src.routes import notes, tags, auth
+from src.routes import notes, tags, auth, metrics
 import os
 
 import redis.asyncio as redis
 from fastapi import FastAPI
-from fastapi_limiter import FastAPILimiter
 from src.conf.config import settings
+from src.database.db import sessionmanager
+from src.services.cache import user_cache
+from src.services.email_queue import email_queue
+from src.services.rate_limit import RateLimiter, RateLimitMiddleware, load_policies, token_subject
+from src.services.refresh_tokens import refresh_token_store
+from src.services.rendering import TEMPLATE_FOLDER, precompile, render
+from src.services.auth import auth_service
+from src.services.tokens import InvalidToken
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
@@ -26,14 +31,34 @@ app = FastAPI()
 app.include_router(auth.router, prefix='/api')
 app.include_router(tags.router, prefix='/api')
 app.include_router(notes.router, prefix='/api')
+app.include_router(metrics.router, prefix='/api')
+
+rate_limiter = RateLimiter(load_policies(settings.rate_limit_policies), redis_retry=settings.rate_limit_redis_retry,
+                           local_maxsize=settings.rate_limit_local_maxsize)
+if settings.rate_limit_enabled:
+    app.add_middleware(RateLimitMiddleware, limiter=rate_limiter,
+                       identify=token_subject(auth_service.tokens.decode, (InvalidToken,)))
 
 
 
 @app.on_event("startup")
 async def startup():
+    sessionmanager.init(settings.sqlalchemy_database_url)
     r = await redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0, encoding="utf-8",
                           decode_responses=True)
-    await FastAPILimiter.init(r)
+    rate_limiter.init(r)
+    email_queue.init(r)
+    refresh_token_store.init(r, ttl=settings.refresh_token_ttl)
+    precompile()
+    user_cache.init(redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0),
+                    maxsize=settings.user_cache_maxsize, ttl=settings.user_cache_ttl,
+                    local_ttl=settings.user_cache_local_ttl)
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    await sessionmanager.close()
+    auth_service.password_hasher.close()
 
 
 
@@ -68,10 +93,9 @@ conf = ConnectionConfig(
     MAIL_SSL_TLS=True,
     USE_CREDENTIALS=True,
     VALIDATE_CERTS=True,
-    TEMPLATE_FOLDER=Path(__file__).parent / 'templates',
+    TEMPLATE_FOLDER=TEMPLATE_FOLDER,
 )
-
-app = FastAPI()
+fm = FastMail(conf)
 
 
 @app.post("/send-email")
@@ -79,13 +103,11 @@ async def send_in_background(background_tasks: BackgroundTasks, body: EmailSchem
     message = MessageSchema(
         subject="Fastapi mail module",
         recipients=[body.email],
-        template_body={"fullname": "Billy Jones"},
+        body=render("example_email.html", {"fullname": "Billy Jones"}),
         subtype=MessageType.html
     )
 
-    fm = FastMail(conf)
-
-    background_tasks.add_task(fm.send_message, message, template_name="example_email.html")
+    background_tasks.add_task(fm.send_message, message)
 
     return {"message": "email has been sent"}
 """
@@ -0,0 +1,27 @@
+"""Keyset pagination indexes
+
+Revision ID: 3f1c2a7d9b10
+Revises: 88376a5f4f2c
+Create Date: 2026-10-18 10:12:40.512304
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '3f1c2a7d9b10'
+down_revision: Union[str, None] = '88376a5f4f2c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_notes_user_id_created_at_id', 'notes', ['user_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_tags_user_id_name_id', 'tags', ['user_id', 'name', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_tags_user_id_name_id', table_name='tags')
+    op.drop_index('ix_notes_user_id_created_at_id', table_name='notes')
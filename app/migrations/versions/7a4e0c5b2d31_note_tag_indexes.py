@@ -0,0 +1,37 @@
+"""Indexes on note_m2m_tag
+
+Revision ID: 7a4e0c5b2d31
+Revises: 3f1c2a7d9b10
+Create Date: 2026-10-18 12:03:17.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '7a4e0c5b2d31'
+down_revision: Union[str, None] = '3f1c2a7d9b10'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # notes.user_id і tags.user_id уже покриті першим стовпцем індексів з 3f1c2a7d9b10.
+    # Перед унікальним обмеженням прибираємо дублікати пар (note_id, tag_id).
+    op.execute(
+        "DELETE FROM note_m2m_tag a USING note_m2m_tag b "
+        "WHERE a.id > b.id AND a.note_id = b.note_id AND a.tag_id = b.tag_id"
+    )
+    with op.get_context().autocommit_block():
+        op.create_index('unique_note_tag', 'note_m2m_tag', ['note_id', 'tag_id'], unique=True,
+                        postgresql_concurrently=True)
+        op.create_index('ix_note_m2m_tag_tag_id_note_id', 'note_m2m_tag', ['tag_id', 'note_id'], unique=False,
+                        postgresql_concurrently=True)
+    op.execute("ALTER TABLE note_m2m_tag ADD CONSTRAINT unique_note_tag UNIQUE USING INDEX unique_note_tag")
+
+
+def downgrade() -> None:
+    op.drop_index('ix_note_m2m_tag_tag_id_note_id', table_name='note_m2m_tag')
+    op.drop_constraint('unique_note_tag', 'note_m2m_tag', type_='unique')
@@ -0,0 +1,29 @@
+"""User roles
+
+Revision ID: 9d2b6e4c1f08
+Revises: 5c8d1e2f4a67
+Create Date: 2026-10-18 16:41:52.630417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = '9d2b6e4c1f08'
+down_revision: Union[str, None] = '5c8d1e2f4a67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+role = sa.Enum('admin', 'moderator', 'user', name='role')
+
+
+def upgrade() -> None:
+    role.create(op.get_bind(), checkfirst=True)
+    op.add_column('users', sa.Column('role', role, server_default='user', nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'role')
+    role.drop(op.get_bind(), checkfirst=True)
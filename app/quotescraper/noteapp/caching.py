@@ -0,0 +1,76 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import patch_vary_headers
+from django.utils.http import urlencode
+from django.views.decorators.http import condition
+
+
+VERSION_KEY = 'quotes:version:{}'
+PAGE_KEY = 'quotes:page:{}'
+
+
+def get_versions(scopes):
+    """
+    Поточні версії областей кешу; відсутня версія стартує з поточного часу.
+    """
+    keys = [VERSION_KEY.format(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            now = time.time()
+            cache.add(key, now, timeout=None)
+            versions[key] = cache.get(key, now)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*scopes):
+    now = time.time()
+    cache.set_many({VERSION_KEY.format(scope): now for scope in scopes}, timeout=None)
+
+
+def invalidate_on_commit(*scopes):
+    transaction.on_commit(lambda: bump_versions(*scopes))
+
+
+def cached_page(*scopes, params=()):
+    """
+    Кешує відповідь view для анонімних користувачів та відповідає 304 на умовні GET.
+
+    Ключ сторінки містить версії областей, тож після bump_versions старі сторінки
+    просто перестають читатися. Області можуть посилатися на аргументи view,
+    наприклад 'author:{author_id}'. До ключа входять шлях і лише перелічені в params
+    параметри запиту, тож довільний query string не створює нових записів у кеші.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            # шапка сторінки залежить від користувача
+            if request.method not in ('GET', 'HEAD') or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+
+            versions = get_versions([scope.format(**kwargs) for scope in scopes])
+            query = urlencode(sorted((name, request.GET[name]) for name in params if name in request.GET))
+            etag = hashlib.md5(f'{request.path}?{query}:{versions}'.encode()).hexdigest()
+            last_modified = datetime.fromtimestamp(max(versions), tz=timezone.utc)
+
+            @condition(etag_func=lambda *_, **__: etag, last_modified_func=lambda *_, **__: last_modified)
+            def render_page(request, *args, **kwargs):
+                key = PAGE_KEY.format(etag)
+                response = cache.get(key)
+                if response is None:
+                    response = view(request, *args, **kwargs)
+                    if response.status_code == 200:
+                        cache.set(key, response, settings.PAGE_CACHE_TIMEOUT)
+                return response
+
+            response = render_page(request, *args, **kwargs)
+            patch_vary_headers(response, ('Cookie',))
+            return response
+        return wrapper
+    return decorator
@@ -1,7 +1,38 @@
 from django.forms import ModelForm, CharField, TextInput, DateField, DateInput, ModelMultipleChoiceField, SelectMultiple, ModelChoiceField, Select
+from django.urls import reverse
 from .models import Author, Quote, Tag
 
 
+class AutocompleteSelect(Select):
+    """
+    Select, що рендерить лише вибране значення, а інші варіанти
+    підвантажує з JSON-ендпоінта автодоповнення за введеним префіксом.
+    """
+
+    class Media:
+        js = ['quotes/autocomplete.js']
+
+    def __init__(self, kind, attrs=None):
+        super().__init__(attrs)
+        self.kind = kind
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse('quotes:autocomplete', args=[self.kind])
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        # у невалідній формі value - сирі дані POST, не обов'язково числа
+        selected = [v for v in value if v not in field.empty_values and str(v).isdigit()]
+        options = [('', field.empty_label)] if field.empty_label is not None else []
+        options += [(obj.pk, field.label_from_instance(obj)) for obj in field.queryset.filter(pk__in=selected)]
+        return [
+            (None, [self.create_option(name, option_value, label, str(option_value) in value, index)], index)
+            for index, (option_value, label) in enumerate(options)
+        ]
+
+
 class RegisterAuthor(ModelForm):
     fullname = CharField(max_length=100,
                          required=True,
@@ -24,11 +55,12 @@ class RegisterQuote(ModelForm):
     quote = CharField(required=True,
                       widget=TextInput(attrs={'class': 'form-control'}))
 
-    tags = ModelChoiceField(queryset=Tag.objects.all().order_by('name'), empty_label="(Nothing)",
-                                    widget=Select(attrs={"class": "form-select"}))
+    # варіанти не вибираються з бази під час рендеру, а підвантажуються з quotes:autocomplete
+    tags = ModelChoiceField(queryset=Tag.objects.all(), empty_label="(Nothing)",
+                            widget=AutocompleteSelect('tags', attrs={"class": "form-select"}))
 
-    author = ModelChoiceField(queryset=Author.objects.all().order_by('fullname'), empty_label="(Nothing)",
-                              widget=Select(attrs={"class": "form-select"}))
+    author = ModelChoiceField(queryset=Author.objects.all(), empty_label="(Nothing)",
+                              widget=AutocompleteSelect('authors', attrs={"class": "form-select"}))
 
     class Meta:
         model = Quote
@@ -36,9 +68,7 @@ class RegisterQuote(ModelForm):
 
     def __init__(self, *args, **kwargs):
         super(RegisterQuote, self).__init__(*args, **kwargs)
-        self.fields['tags'].queryset = Tag.objects.all().order_by('name')
         self.fields['tags'].label_from_instance = lambda obj: obj.name
-        self.fields['author'].queryset = Author.objects.all().order_by('fullname')
         self.fields['author'].label_from_instance = lambda obj: obj.fullname
 
 
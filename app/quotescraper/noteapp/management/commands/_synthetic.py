@@ -0,0 +1,34 @@
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from ...models import Author, Quote, Tag
+
+
+BENCH_AUTHOR = 'Benchmark Author'
+BENCH_TAG_PREFIX = 'bench-tag-'
+
+
+def get_bench_author():
+    author, _ = Author.objects.get_or_create(fullname=BENCH_AUTHOR, born_date='', born_location='',
+                                             description='')
+    return author
+
+
+def drop_bench_data():
+    """
+    Видалення синтетичних даних одним SQL на таблицю: каскад через ORM надсилав би
+    pre_delete для кожної цитати окремо.
+    """
+    quotes = Quote._meta.db_table
+    authors = Author.objects.filter(fullname__startswith=BENCH_AUTHOR).values_list('pk', flat=True)
+    with transaction.atomic(), connection.cursor() as cursor:
+        author_ids = list(authors)
+        cursor.execute(
+            f'DELETE FROM {Quote.tags.through._meta.db_table} '
+            f'WHERE quote_id IN (SELECT id FROM {quotes} WHERE author_id = ANY(%s))',
+            [author_ids],
+        )
+        cursor.execute(f'DELETE FROM {quotes} WHERE author_id = ANY(%s)', [author_ids])
+        Tag.objects.filter(name__startswith=BENCH_TAG_PREFIX).delete()
+        Author.objects.filter(pk__in=author_ids).delete()
+    cache.clear()
@@ -0,0 +1,60 @@
+import time
+import tracemalloc
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from ...models import Quote
+from ... import views
+from ._synthetic import drop_bench_data, get_bench_author
+
+
+class Command(BaseCommand):
+    help = 'Measures quotes index page latency and memory as the quote table grows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', default='100,1000,10000,100000,1000000')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--batch', type=int, default=10000)
+        parser.add_argument('--keep', action='store_true', help='do not delete synthetic quotes afterwards')
+
+    def handle(self, *args, **options):
+        author = get_bench_author()
+        factory = RequestFactory()
+        self.stdout.write(f"{'rows':>9} {'page':>8} {'median ms':>10} {'peak KiB':>10}")
+        try:
+            for size in map(int, options['sizes'].split(',')):
+                self.grow(author, size, options['batch'])
+                cache.clear()
+                pages = (size + 9) // 10
+                for page in sorted({1, max(pages // 2, 1), pages}):
+                    elapsed, peak = self.measure(factory, page, options['repeat'])
+                    self.stdout.write(f'{size:>9} {page:>8} {elapsed:>10.2f} {peak / 1024:>10.1f}')
+        finally:
+            if not options['keep']:
+                drop_bench_data()
+
+    def grow(self, author, size, batch):
+        total = Quote.objects.count()
+        while total < size:
+            chunk = min(batch, size - total)
+            Quote.objects.bulk_create(
+                Quote(quote=f'Synthetic quote {total + i}', author=author) for i in range(chunk)
+            )
+            total += chunk
+
+    def measure(self, factory, page, repeat):
+        samples = []
+        peak = 0
+        for _ in range(repeat):
+            request = factory.get(f'/{page}')
+            tracemalloc.start()
+            start = time.perf_counter()
+            # вимірюється сам рендер, оминаючи кеш сторінок
+            views.main.__wrapped__(request, page=page)
+            samples.append(time.perf_counter() - start)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        samples.sort()
+        return samples[len(samples) // 2] * 1000, peak
@@ -0,0 +1,79 @@
+import json
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from ...models import Author, Quote
+from ...search import search_quotes, update_author_vectors, update_quote_vectors
+from ._synthetic import BENCH_AUTHOR, drop_bench_data
+
+
+class Command(BaseCommand):
+    help = 'Compares full-text quote search with naive icontains on the quotes.json corpus replicated to N rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000)
+        parser.add_argument('--batch', type=int, default=10000)
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--corpus-dir', default=str(Path(settings.BASE_DIR) / 'utils'))
+        parser.add_argument('--queries', default='imagination,love,einstein,truth,friendship books,world')
+        parser.add_argument('--keep', action='store_true', help='do not delete the synthetic corpus afterwards')
+
+    def handle(self, *args, **options):
+        try:
+            self.build_corpus(Path(options['corpus_dir']), options['rows'], options['batch'])
+            self.stdout.write(f"{'query':>20} {'fts ms':>9} {'fts rows':>9} {'icontains ms':>13} {'icontains rows':>15}")
+            for q in options['queries'].split(','):
+                fts_ms, fts_rows = self.measure(search_quotes(q), options['repeat'])
+                naive_ms, naive_rows = self.measure(self.naive(q), options['repeat'])
+                self.stdout.write(f'{q:>20} {fts_ms:>9.1f} {fts_rows:>9} {naive_ms:>13.1f} {naive_rows:>15}')
+        finally:
+            if not options['keep']:
+                drop_bench_data()
+
+    def build_corpus(self, corpus_dir, rows, batch):
+        start = time.perf_counter()
+        authors = json.loads((corpus_dir / 'authors.json').read_text())
+        quotes = json.loads((corpus_dir / 'quotes.json').read_text())
+
+        created = Author.objects.bulk_create([
+            Author(fullname=f"{BENCH_AUTHOR}: {author['fullname']}", born_date=author['born_date'],
+                   born_location=author['born_location'], description=author['description'])
+            for author in authors
+        ])
+        author_ids = {author['fullname']: obj.pk for author, obj in zip(authors, created)}
+        update_author_vectors(Author.objects.filter(pk__in=author_ids.values()))
+
+        for batch_start in range(0, rows, batch):
+            objs = Quote.objects.bulk_create(
+                Quote(quote=f"{quote['quote']} #{i // len(quotes)}", author_id=author_ids.get(quote['author'][0]))
+                for i in range(batch_start, min(batch_start + batch, rows))
+                for quote in [quotes[i % len(quotes)]]
+            )
+            update_quote_vectors(Quote.objects.filter(pk__in=[obj.pk for obj in objs]))
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {Quote._meta.db_table}')
+            cursor.execute(f'ANALYZE {Author._meta.db_table}')
+        self.stdout.write(f'corpus: {rows} quotes in {time.perf_counter() - start:.1f}s')
+
+    def naive(self, q):
+        return (
+            Quote.objects.with_related()
+            .filter(Q(quote__icontains=q) | Q(author__fullname__icontains=q) | Q(author__description__icontains=q))
+            .order_by('id')
+        )
+
+    def measure(self, queryset, repeat):
+        # як у view: перша сторінка і загальна кількість для пагінатора
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(queryset.all()[:10])
+            total = queryset.count()
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        return samples[len(samples) // 2] * 1000, total
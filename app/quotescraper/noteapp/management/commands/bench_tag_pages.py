@@ -0,0 +1,102 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from ...models import Quote, Tag
+from ...utils import refresh_quote_count
+from ... import views
+from ._synthetic import BENCH_TAG_PREFIX, drop_bench_data, get_bench_author
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Command(BaseCommand):
+    help = 'Load-tests tag pages over a synthetic corpus with Zipf-distributed tag popularity'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--quotes', type=int, default=100000)
+        parser.add_argument('--tags', type=int, default=500)
+        parser.add_argument('--tags-per-quote', type=int, default=3)
+        parser.add_argument('--skew', type=float, default=1.1, help='Zipf exponent of tag popularity')
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--batch', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--keep', action='store_true', help='do not delete the synthetic corpus afterwards')
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        weights = [1 / rank ** options['skew'] for rank in range(1, options['tags'] + 1)]
+        author = get_bench_author()
+        try:
+            tags = self.build_corpus(author, rng, weights, options)
+            self.load(tags, rng, weights, options['requests'])
+        finally:
+            if not options['keep']:
+                drop_bench_data()
+
+    def build_corpus(self, author, rng, weights, options):
+        start = time.perf_counter()
+        Tag.objects.bulk_create(
+            [Tag(name=f'{BENCH_TAG_PREFIX}{rank}') for rank in range(len(weights))], ignore_conflicts=True
+        )
+        tags = list(Tag.objects.filter(name__startswith=BENCH_TAG_PREFIX))
+        tags.sort(key=lambda tag: int(tag.name.removeprefix(BENCH_TAG_PREFIX)))
+
+        through = Quote.tags.through
+        offset = Quote.objects.count()
+        for batch_start in range(0, options['quotes'], options['batch']):
+            size = min(options['batch'], options['quotes'] - batch_start)
+            quotes = Quote.objects.bulk_create(
+                Quote(quote=f'Synthetic tagged quote {offset + batch_start + i}', author=author) for i in range(size)
+            )
+            through.objects.bulk_create(
+                through(quote_id=quote.pk, tag_id=tag.pk)
+                for quote in quotes
+                for tag in set(rng.choices(tags, weights, k=options['tags_per_quote']))
+            )
+        refresh_quote_count([tag.pk for tag in tags])
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {through._meta.db_table}')
+
+        for tag in tags:
+            tag.refresh_from_db(fields=['quote_count'])
+        self.stdout.write(
+            f"corpus: {options['quotes']} quotes, {len(tags)} tags in {time.perf_counter() - start:.1f}s; "
+            f'hottest tag {tags[0].quote_count} quotes, coldest {tags[-1].quote_count}'
+        )
+        return tags
+
+    def load(self, tags, rng, weights, requests):
+        factory = RequestFactory()
+        # тег обирається з тим самим перекосом, що й у корпусі; сторінка - рівномірно
+        buckets = {'head': [], 'torso': [], 'tail': []}
+        queries = {name: [] for name in buckets}
+        head, torso = max(len(tags) // 100, 1), max(len(tags) // 10, 1)
+        for _ in range(requests):
+            rank = rng.choices(range(len(tags)), weights)[0]
+            tag = tags[rank]
+            page = rng.randint(1, max((tag.quote_count + 9) // 10, 1))
+            request = factory.get(f'/tag/{tag.name}/{page}')
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                # вимірюється сам рендер, оминаючи кеш сторінок
+                views.selected_tag.__wrapped__(request, tag_name=tag.name, page=page)
+                elapsed = time.perf_counter() - start
+            bucket = 'head' if rank < head else 'torso' if rank < torso else 'tail'
+            buckets[bucket].append(elapsed * 1000)
+            queries[bucket].append(len(captured))
+
+        self.stdout.write(f"{'tags':>6} {'requests':>9} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'queries':>8}")
+        for name, samples in buckets.items():
+            if samples:
+                self.stdout.write(
+                    f'{name:>6} {len(samples):>9} {percentile(samples, 0.5):>8.2f} {percentile(samples, 0.95):>8.2f} '
+                    f'{max(samples):>8.2f} {sum(queries[name]) / len(samples):>8.1f}'
+                )
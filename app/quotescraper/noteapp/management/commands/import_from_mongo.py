@@ -0,0 +1,134 @@
+import hashlib
+import time
+from itertools import islice
+from pathlib import Path
+
+from bson import json_util
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models.functions import MD5
+
+from ...caching import invalidate_on_commit
+from ...models import Author, Quote, Tag
+from ...search import update_author_vectors, update_quote_vectors
+from ...utils import get_mongodb, invalidate_quotes_count, refresh_quote_count
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def quote_hash(text):
+    return hashlib.md5(text.encode()).hexdigest()
+
+
+class Command(BaseCommand):
+    help = 'Imports authors and quotes from MongoDB in batches; reruns are idempotent and resume from a checkpoint'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch', type=int, default=1000)
+        parser.add_argument('--checkpoint', default='.import_from_mongo.json',
+                            help='file with the last imported Mongo _id of each collection')
+        parser.add_argument('--restart', action='store_true', help='ignore the saved checkpoint')
+
+    def handle(self, *args, **options):
+        self.db = get_mongodb()
+        self.batch_size = options['batch']
+        self.checkpoint_path = Path(options['checkpoint'])
+        self.checkpoint = {} if options['restart'] else self.load_checkpoint()
+        # Mongo _id автора -> id у Postgres, назва тегу -> id
+        self.author_ids = {}
+        self.tag_ids = {}
+
+        self.import_collection('authors', self.import_authors)
+        self.import_collection('quotes', self.import_quotes)
+
+    def load_checkpoint(self):
+        if self.checkpoint_path.exists():
+            return json_util.loads(self.checkpoint_path.read_text())
+        return {}
+
+    def save_checkpoint(self):
+        self.checkpoint_path.write_text(json_util.dumps(self.checkpoint))
+
+    def import_collection(self, name, import_batch):
+        query = {}
+        if name in self.checkpoint:
+            query = {'_id': {'$gt': self.checkpoint[name]}}
+        cursor = self.db[name].find(query).sort('_id', 1).batch_size(self.batch_size)
+
+        total = 0
+        start = time.perf_counter()
+        for docs in batched(cursor, self.batch_size):
+            with transaction.atomic():
+                import_batch(docs)
+            self.checkpoint[name] = docs[-1]['_id']
+            self.save_checkpoint()
+            total += len(docs)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'{name}: {total} rows, {total / elapsed:.0f} rows/s')
+        self.stdout.write(self.style.SUCCESS(f'{name}: imported {total} rows in {time.perf_counter() - start:.2f}s'))
+
+    def import_authors(self, docs):
+        Author.objects.bulk_create(
+            [
+                Author(fullname=doc['fullname'], born_date=doc.get('born_date', ''),
+                       born_location=doc.get('born_location', ''), description=doc.get('description', ''))
+                for doc in docs
+            ],
+            ignore_conflicts=True,
+        )
+        authors = Author.objects.filter(fullname__in={doc['fullname'] for doc in docs})
+        update_author_vectors(authors.filter(search_vector=None))
+        ids = dict(authors.values_list('fullname', 'id'))
+        self.author_ids.update((doc['_id'], ids[doc['fullname']]) for doc in docs)
+        invalidate_on_commit('quotes', 'autocomplete:authors', *(f'author:{author_id}' for author_id in ids.values()))
+
+    def resolve_authors(self, mongo_ids):
+        # після відновлення з контрольної точки частини авторів ще немає в мапі
+        missing = [mongo_id for mongo_id in mongo_ids if mongo_id not in self.author_ids]
+        if not missing:
+            return
+        fullnames = {doc['_id']: doc['fullname']
+                     for doc in self.db.authors.find({'_id': {'$in': missing}}, {'fullname': 1})}
+        ids = dict(Author.objects.filter(fullname__in=set(fullnames.values())).values_list('fullname', 'id'))
+        self.author_ids.update((mongo_id, ids.get(fullname)) for mongo_id, fullname in fullnames.items())
+
+    def resolve_tags(self, names):
+        missing = [name for name in names if name not in self.tag_ids]
+        if not missing:
+            return
+        Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+        invalidate_on_commit('autocomplete:tags')
+        self.tag_ids.update(Tag.objects.filter(name__in=missing).values_list('name', 'id'))
+
+    def import_quotes(self, docs):
+        docs = list({quote_hash(doc['quote']): doc for doc in docs}.items())
+        self.resolve_authors({doc['author'] for _, doc in docs if doc.get('author') is not None})
+        self.resolve_tags({name for _, doc in docs for name in doc.get('tags', [])})
+
+        Quote.objects.bulk_create(
+            [Quote(quote=doc['quote'], author_id=self.author_ids.get(doc.get('author'))) for _, doc in docs],
+            ignore_conflicts=True,
+        )
+        quote_ids = dict(
+            Quote.objects.annotate(quote_md5=MD5('quote'))
+            .filter(quote_md5__in=[digest for digest, _ in docs])
+            .values_list('quote_md5', 'id')
+        )
+
+        update_quote_vectors(Quote.objects.filter(pk__in=quote_ids.values(), search_vector=None))
+
+        through = Quote.tags.through
+        links = [
+            through(quote_id=quote_ids[digest], tag_id=self.tag_ids[name])
+            for digest, doc in docs
+            for name in dict.fromkeys(doc.get('tags', []))
+        ]
+        # bulk_create не надсилає post_save і m2m_changed, тож лічильники оновлюються тут
+        through.objects.bulk_create(links, ignore_conflicts=True)
+        refresh_quote_count({link.tag_id for link in links})
+        transaction.on_commit(invalidate_quotes_count)
+        invalidate_on_commit('quotes')
@@ -0,0 +1,30 @@
+import asyncio
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...scraper import QuoteCrawler
+
+
+class Command(BaseCommand):
+    help = 'Crawls a quotes.toscrape-style site into quotes.json/authors.json for utils/quotes_to_scrape.py'
+
+    def add_arguments(self, parser):
+        parser.add_argument('start_urls', nargs='*', default=['https://quotes.toscrape.com/'])
+        parser.add_argument('--out-dir', default=str(Path(settings.BASE_DIR) / 'scraped'),
+                            help='directory for quotes.json/authors.json; pass utils to replace the shipped dataset')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--rate', type=float, default=5.0, help='requests per second per host')
+        parser.add_argument('--retries', type=int, default=3)
+        parser.add_argument('--checkpoint', help='frontier state file, defaults to <out-dir>/.frontier.json')
+        parser.add_argument('--restart', action='store_true', help='ignore the saved frontier and overwrite output')
+
+    def handle(self, *args, **options):
+        checkpoint = options['checkpoint'] or Path(options['out_dir']) / '.frontier.json'
+        crawler = QuoteCrawler(options['start_urls'], options['out_dir'], concurrency=options['concurrency'],
+                               rate=options['rate'], retries=options['retries'], checkpoint=checkpoint)
+        quotes, authors = asyncio.run(crawler.run(resume=not options['restart']))
+        self.stdout.write(self.style.SUCCESS(f'quotes: {quotes}, authors: {authors}'))
+        for url in crawler.failed:
+            self.stderr.write(f'failed: {url}')
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.2 on 2026-10-18 19:52
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_quote_count(apps, schema_editor):
+    Tag = apps.get_model('quotes', 'Tag')
+    for tag in Tag.objects.annotate(num_quotes=Count('quote')).iterator():
+        if tag.num_quotes:
+            Tag.objects.filter(pk=tag.pk).update(quote_count=tag.num_quotes)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0005_remove_author_user_remove_quote_user_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='quote_count',
+            field=models.IntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(fill_quote_count, migrations.RunPython.noop),
+    ]
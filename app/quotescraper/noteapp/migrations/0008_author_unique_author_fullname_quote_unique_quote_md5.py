@@ -0,0 +1,54 @@
+# Generated by Django 4.2.2 on 2026-10-18 19:58
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+# Повторні запуски старого migration.py дублювали авторів і цитати,
+# тож перед створенням обмежень дублікати зливаються в рядок з найменшим id.
+MERGE_DUPLICATES = '''
+UPDATE quotes_quote q SET author_id = d.keep
+FROM (SELECT id, min(id) OVER (PARTITION BY fullname) AS keep FROM quotes_author) d
+WHERE q.author_id = d.id AND d.id <> d.keep;
+
+DELETE FROM quotes_author a USING quotes_author b
+WHERE a.fullname = b.fullname AND a.id > b.id;
+
+INSERT INTO quotes_quote_tags (quote_id, tag_id)
+SELECT d.keep, t.tag_id
+FROM quotes_quote_tags t
+JOIN (SELECT id, min(id) OVER (PARTITION BY md5(quote)) AS keep FROM quotes_quote) d ON t.quote_id = d.id
+WHERE d.id <> d.keep
+ON CONFLICT DO NOTHING;
+
+DELETE FROM quotes_quote_tags t USING quotes_quote a, quotes_quote b
+WHERE t.quote_id = a.id AND md5(a.quote) = md5(b.quote) AND a.id > b.id;
+
+DELETE FROM quotes_quote a USING quotes_quote b
+WHERE md5(a.quote) = md5(b.quote) AND a.id > b.id;
+
+UPDATE quotes_tag t SET quote_count = (
+    SELECT count(*) FROM quotes_quote_tags l WHERE l.tag_id = t.id
+);
+
+SET CONSTRAINTS ALL IMMEDIATE;
+'''
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0007_quote_quote_created_at_id_idx'),
+    ]
+
+    operations = [
+        migrations.RunSQL(MERGE_DUPLICATES, migrations.RunSQL.noop),
+        migrations.AddConstraint(
+            model_name='author',
+            constraint=models.UniqueConstraint(fields=('fullname',), name='unique_author_fullname'),
+        ),
+        migrations.AddConstraint(
+            model_name='quote',
+            constraint=models.UniqueConstraint(django.db.models.functions.text.MD5('quote'), name='unique_quote_md5'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.2 on 2026-10-18 20:01
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY не може виконуватися всередині транзакції
+    atomic = False
+
+    dependencies = [
+        ('quotes', '0008_author_unique_author_fullname_quote_unique_quote_md5'),
+    ]
+
+    # Django створює для таблиці зв'язків лише unique (quote_id, tag_id) та окремі індекси
+    # на кожен стовпець. Сторінка тегу шукає цитати за tag_id у порядку quote_id,
+    # тож складений індекс дає впорядковане сканування лише за індексом.
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX CONCURRENTLY IF NOT EXISTS quote_tags_tag_id_quote_id_idx '
+            'ON quotes_quote_tags (tag_id, quote_id);',
+            'DROP INDEX CONCURRENTLY IF EXISTS quote_tags_tag_id_quote_id_idx;',
+        ),
+    ]
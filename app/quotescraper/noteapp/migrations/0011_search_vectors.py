@@ -0,0 +1,47 @@
+# Generated by Django 4.2.2 on 2026-10-18 20:05
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def fill_search_vectors(apps, schema_editor):
+    Author = apps.get_model('quotes', 'Author')
+    Quote = apps.get_model('quotes', 'Quote')
+    Author.objects.update(search_vector=SearchVector('fullname', weight='A', config='english')
+                          + SearchVector('description', weight='B', config='english'))
+    author_name = Subquery(Author.objects.filter(pk=OuterRef('author_id')).values('fullname')[:1])
+    Quote.objects.update(search_vector=SearchVector('quote', weight='A', config='english')
+                         + SearchVector(author_name, weight='B', config='english'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0010_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        # індекси створюються після заповнення, щоб не оновлювати GIN для кожного рядка
+        migrations.RunPython(fill_search_vectors, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='author',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='author_search_vector_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='quote_search_vector_idx'),
+        ),
+    ]
@@ -1,4 +1,7 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVectorField
+from django.db.models.functions import MD5, Lower
 from django.contrib.auth.models import User
 
 
@@ -8,14 +11,53 @@ class Author(models.Model):
     born_location = models.CharField()
     description = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['fullname'], name='unique_author_fullname'),
+        ]
+        indexes = [
+            # пошук за префіксом без урахування регістру: LOWER(fullname) LIKE 'abc%'
+            models.Index(OpClass(Lower('fullname'), name='text_pattern_ops'), name='author_fullname_prefix_idx'),
+            GinIndex(fields=['search_vector'], name='author_search_vector_idx'),
+        ]
 
 
 class Tag(models.Model):
     name = models.CharField(null=False, unique=True)
+    quote_count = models.IntegerField(default=0, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(OpClass(Lower('name'), name='text_pattern_ops'), name='tag_name_prefix_idx'),
+        ]
+
+
+class QuoteQuerySet(models.QuerySet):
+
+    def with_related(self):
+        """
+        Автор через JOIN і теги одним додатковим запитом на всю сторінку.
+        """
+        return self.select_related('author').prefetch_related('tags')
 
 
 class Quote(models.Model):
     quote = models.TextField()
     tags = models.ManyToManyField(Tag)
     author = models.ForeignKey(Author, on_delete=models.CASCADE, default=None, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at = models.DateTimeField(auto_now_add=True)
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = QuoteQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at', 'id'], name='quote_created_at_id_idx'),
+            GinIndex(fields=['search_vector'], name='quote_search_vector_idx'),
+        ]
+        constraints = [
+            # текст цитати може перевищити ліміт рядка btree-індексу, тому унікальним є його хеш
+            models.UniqueConstraint(MD5('quote'), name='unique_quote_md5'),
+        ]
\ No newline at end of file
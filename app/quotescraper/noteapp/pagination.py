@@ -0,0 +1,33 @@
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator, що бере загальну кількість рядків з кешу, а не з COUNT(*) на кожен запит.
+    Сторінки вибираються з бази через LIMIT/OFFSET, тож object_list має бути QuerySet.
+    """
+
+    def __init__(self, object_list, per_page, cache_key, timeout=300, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.cache_key = cache_key
+        self.timeout = timeout
+
+    @cached_property
+    def count(self):
+        return cache.get_or_set(self.cache_key, self.object_list.count, self.timeout)
+
+
+class KnownCountPaginator(Paginator):
+    """
+    Paginator із наперед відомою кількістю рядків, наприклад з денормалізованого лічильника.
+    """
+
+    def __init__(self, object_list, per_page, count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self._count = count
+
+    @cached_property
+    def count(self):
+        return self._count
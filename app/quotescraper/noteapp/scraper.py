@@ -0,0 +1,309 @@
+import asyncio
+import json
+import logging
+import os
+import random
+from pathlib import Path
+from urllib.parse import urljoin, urlsplit
+
+import aiohttp
+from bs4 import BeautifulSoup
+
+
+logger = logging.getLogger(__name__)
+
+LIST_PAGE = 'list'
+AUTHOR_PAGE = 'author'
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class HostRateLimiter:
+    """
+    Не більше ``rate`` запитів на секунду до кожного хоста.
+    """
+
+    def __init__(self, rate):
+        self.interval = 1 / rate if rate else 0
+        self._next_slot = {}
+        self._lock = asyncio.Lock()
+
+    async def wait(self, host):
+        if not self.interval:
+            return
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            now = loop.time()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        await asyncio.sleep(slot - now)
+
+
+class Frontier:
+    """
+    Знайдені адреси та вже оброблені; стан зберігається у файл після кожної сторінки,
+    тож перерваний обхід продовжується з тих адрес, що лишились.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.urls = {}
+        self.done = set()
+
+    def load(self):
+        """
+        :return: True, якщо стан прочитано з контрольної точки.
+        """
+        if self.path and self.path.exists():
+            state = json.loads(self.path.read_text())
+            self.urls = state['urls']
+            self.done = set(state['done'])
+            return True
+        return False
+
+    def save(self):
+        if self.path is None:
+            return
+        tmp = self.path.with_suffix(self.path.suffix + '.tmp')
+        tmp.write_text(json.dumps({'urls': self.urls, 'done': sorted(self.done)}))
+        os.replace(tmp, self.path)
+
+    def add(self, url, kind):
+        """
+        :return: True, якщо адреса нова.
+        """
+        if url in self.urls:
+            return False
+        self.urls[url] = kind
+        return True
+
+    def pending(self):
+        return [(url, kind) for url, kind in self.urls.items() if url not in self.done]
+
+    def mark_done(self, url):
+        self.done.add(url)
+        self.save()
+
+
+class JsonArrayWriter:
+    """
+    Дописує елементи в JSON-масив так, що після кожного запису файл лишається валідним JSON.
+    Формат збігається з quotes.json/authors.json, які читає utils/quotes_to_scrape.py.
+    """
+
+    def __init__(self, path, resume=False):
+        path = Path(path)
+        if resume and path.exists() and path.stat().st_size:
+            self._file = open(path, 'r+b')
+            try:
+                self._pos, self._empty = self._find_end()
+            except ValueError:
+                self._file.close()
+                raise
+        else:
+            self._file = open(path, 'w+b')
+            self._file.write(b'[\n]')
+            self._pos, self._empty = 1, True
+        self.count = 0
+
+    def _find_end(self):
+        size = self._file.seek(0, os.SEEK_END)
+        self._file.seek(max(size - 4096, 0))
+        tail = self._file.read()
+        lines = tail.rstrip().rsplit(b'\n', 1)
+        if lines[-1].strip() == b']':
+            before = lines[0].rstrip() if len(lines) > 1 else b''
+            return size - len(tail) + len(before), before.endswith(b'[')
+        return self._repair(size)
+
+    def _repair(self, size):
+        """
+        Після збою посеред запису закриваючої дужки немає: файл обрізається до
+        останнього повного елемента. Кожен елемент записується окремим рядком.
+        """
+        block = 4096
+        while True:
+            start = max(size - block, 0)
+            self._file.seek(start)
+            lines = self._file.read().split(b'\n')
+            offset = size
+            # перший рядок блоку може бути неповним, якщо блок не з початку файлу
+            for index in range(len(lines) - 1, 0 if start else -1, -1):
+                line = lines[index]
+                offset -= len(line) + (1 if index < len(lines) - 1 else 0)
+                content = line.rstrip()
+                if content == b'[':
+                    end, empty = offset + len(content), True
+                    break
+                try:
+                    item = json.loads(content.rstrip(b','))
+                except ValueError:
+                    continue
+                if isinstance(item, dict):
+                    end, empty = offset + len(content.rstrip(b',')), False
+                    break
+            else:
+                if start == 0:
+                    raise ValueError(f'{self._file.name}: not a JSON array, remove it or start a fresh crawl')
+                block *= 2
+                continue
+            break
+        logger.warning('%s: truncated incomplete write at byte %d', self._file.name, end)
+        self._file.seek(end)
+        self._file.write(b'\n]')
+        self._file.truncate()
+        self._file.flush()
+        return end, empty
+
+    def write(self, item):
+        self._file.seek(self._pos)
+        data = ('\n' if self._empty else ',\n') + json.dumps(item, ensure_ascii=False)
+        self._file.write(data.encode())
+        self._pos = self._file.tell()
+        self._file.write(b'\n]')
+        self._file.truncate()
+        self._file.flush()
+        self._empty = False
+        self.count += 1
+
+    def close(self):
+        self._file.close()
+
+
+def parse_list_page(html, url):
+    """
+    Цитати сторінки у форматі quotes.json, посилання на авторів і на наступну сторінку.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    quotes = []
+    authors = []
+    for block in soup.select('div.quote'):
+        quotes.append({
+            'tags': [tag.get_text(strip=True) for tag in block.select('a.tag')],
+            'author': [block.select_one('small.author').get_text(strip=True)],
+            'quote': block.select_one('span.text').get_text(strip=True),
+        })
+        link = block.select_one('a[href*="/author/"]')
+        if link is not None:
+            authors.append(urljoin(url, link['href']))
+    next_link = soup.select_one('li.next a')
+    return quotes, authors, urljoin(url, next_link['href']) if next_link else None
+
+
+def parse_author_page(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    return {
+        'fullname': soup.select_one('h3.author-title').get_text(strip=True),
+        'born_date': soup.select_one('span.author-born-date').get_text(strip=True),
+        'born_location': soup.select_one('span.author-born-location').get_text(strip=True),
+        'description': soup.select_one('div.author-description').get_text(strip=True),
+    }
+
+
+class QuoteCrawler:
+    """
+    Асинхронний обхід сайту у стилі quotes.toscrape.com.
+
+    Одночасні запити обмежені семафором, з'єднання беруться зі спільного пулу aiohttp,
+    до кожного хоста діє власне обмеження частоти. Тимчасові помилки повторюються
+    з експоненційною затримкою. Цитати й автори пишуться у quotes.json та authors.json.
+    """
+
+    def __init__(self, start_urls, out_dir, concurrency=8, rate=5.0, retries=3, backoff=0.5,
+                 timeout=30, checkpoint=None):
+        self.start_urls = list(start_urls)
+        self.out_dir = Path(out_dir)
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.frontier = Frontier(checkpoint)
+        self.rate_limiter = HostRateLimiter(rate)
+        self.failed = []
+
+    async def fetch(self, session, url):
+        """
+        :return: Текст сторінки або None, якщо всі спроби вичерпано.
+        """
+        for attempt in range(self.retries + 1):
+            await self.rate_limiter.wait(urlsplit(url).netloc)
+            try:
+                async with session.get(url) as response:
+                    if response.status not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        return await response.text()
+            except aiohttp.ClientResponseError:
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            if attempt < self.retries:
+                await asyncio.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+        return None
+
+    async def process(self, session, url, kind):
+        html = await self.fetch(session, url)
+        if html is None:
+            # лишається в frontier без позначки done і буде повторена при наступному запуску
+            self.failed.append(url)
+            return
+        try:
+            if kind == LIST_PAGE:
+                quotes, authors, next_url = parse_list_page(html, url)
+            else:
+                author = parse_author_page(html)
+        except (AttributeError, KeyError, TypeError) as err:
+            # сторінка не тієї структури, що очікується; обхід решти сайту триває
+            logger.warning('failed to parse %s: %r', url, err)
+            self.failed.append(url)
+            return
+        if kind == LIST_PAGE:
+            for quote in quotes:
+                self.quotes.write(quote)
+            for author_url in authors:
+                self.enqueue(author_url, AUTHOR_PAGE)
+            if next_url:
+                self.enqueue(next_url, LIST_PAGE)
+        else:
+            self.authors.write(author)
+        self.frontier.mark_done(url)
+
+    def enqueue(self, url, kind):
+        if self.frontier.add(url, kind):
+            self._queue.append((url, kind))
+
+    async def run(self, resume=True):
+        """
+        Обхід до вичерпання frontier.
+
+        :param resume: Продовжити з контрольної точки та дописувати у наявні файли.
+            Без збереженої контрольної точки файли перезаписуються.
+        :return: Кількість записаних цитат і авторів.
+        """
+        resume = resume and self.frontier.load()
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.quotes = JsonArrayWriter(self.out_dir / 'quotes.json', resume)
+        self.authors = JsonArrayWriter(self.out_dir / 'authors.json', resume)
+        self._queue = self.frontier.pending()
+        for url in self.start_urls:
+            self.enqueue(url, LIST_PAGE)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(session, url, kind):
+            async with semaphore:
+                await self.process(session, url, kind)
+
+        connector = aiohttp.TCPConnector(limit=self.concurrency)
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=self.timeout) as session:
+                tasks = set()
+                while self._queue or tasks:
+                    while self._queue:
+                        url, kind = self._queue.pop()
+                        tasks.add(asyncio.create_task(bounded(session, url, kind)))
+                    done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+        finally:
+            self.quotes.close()
+            self.authors.close()
+        return self.quotes.count, self.authors.count
@@ -0,0 +1,72 @@
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank, SearchVector
+from django.db.models import F, OuterRef, Subquery
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .models import Author, Quote
+
+
+SEARCH_CONFIG = 'english'
+# маркери з області приватного використання Unicode: текст екранується вже після ts_headline
+START_SEL = '\ue000'
+STOP_SEL = '\ue001'
+
+
+def quote_search_vector():
+    """
+    Текст цитати (вага A) та ім'я її автора (вага B).
+    """
+    author_name = Subquery(Author.objects.filter(pk=OuterRef('author_id')).values('fullname')[:1])
+    return (SearchVector('quote', weight='A', config=SEARCH_CONFIG)
+            + SearchVector(author_name, weight='B', config=SEARCH_CONFIG))
+
+
+def author_search_vector():
+    return (SearchVector('fullname', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('description', weight='B', config=SEARCH_CONFIG))
+
+
+def update_quote_vectors(quotes):
+    """
+    Оновлення збережених векторів пошуку; update() не надсилає сигналів post_save.
+
+    :param quotes: QuerySet цитат.
+    """
+    quotes.update(search_vector=quote_search_vector())
+
+
+def update_author_vectors(authors):
+    # id фіксуються до update(), бо фільтр authors може залежати від search_vector
+    author_ids = list(authors.values_list('pk', flat=True))
+    Author.objects.filter(pk__in=author_ids).update(search_vector=author_search_vector())
+    update_quote_vectors(Quote.objects.filter(author_id__in=author_ids))
+
+
+def highlight(text):
+    return mark_safe(escape(text).replace(START_SEL, '<mark>').replace(STOP_SEL, '</mark>'))
+
+
+def _headline(field, query):
+    return SearchHeadline(field, query, config=SEARCH_CONFIG, start_sel=START_SEL, stop_sel=STOP_SEL,
+                          max_words=35, min_words=15)
+
+
+def search_quotes(q):
+    """
+    Цитати, що відповідають запиту, від найрелевантніших; headline - фрагмент з виділеними збігами.
+    """
+    query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+    return (
+        Quote.objects.with_related().filter(search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query), headline=_headline('quote', query))
+        .order_by('-rank', 'id')
+    )
+
+
+def search_authors(q):
+    query = SearchQuery(q, search_type='websearch', config=SEARCH_CONFIG)
+    return (
+        Author.objects.filter(search_vector=query)
+        .annotate(rank=SearchRank(F('search_vector'), query), headline=_headline('description', query))
+        .order_by('-rank', 'id')
+    )
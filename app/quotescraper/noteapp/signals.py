@@ -0,0 +1,95 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import m2m_changed, pre_delete, post_save, post_delete
+from django.dispatch import receiver
+
+from .caching import invalidate_on_commit
+from .models import Author, Quote, Tag
+from .search import update_author_vectors, update_quote_vectors
+from .utils import invalidate_popular_tags, invalidate_quotes_count
+
+
+def shift_quote_count(tag_ids, delta):
+    if not tag_ids or not delta:
+        return
+    Tag.objects.filter(pk__in=tag_ids).update(quote_count=F('quote_count') + delta)
+    transaction.on_commit(invalidate_popular_tags)
+
+
+@receiver(m2m_changed, sender=Quote.tags.through)
+def update_tag_popularity(sender, instance, action, reverse, pk_set, **kwargs):
+    links = Quote.tags.through.objects
+    if action == 'pre_remove':
+        # Django передає в pk_set усі id, які просили видалити, а не лише наявні зв'язки
+        if reverse:
+            instance._removed_links = links.filter(tag=instance, quote_id__in=pk_set).count()
+        else:
+            instance._removed_links = list(
+                links.filter(quote=instance, tag_id__in=pk_set).values_list('tag_id', flat=True)
+            )
+    elif action == 'pre_clear':
+        if reverse:
+            instance._removed_links = links.filter(tag=instance).count()
+        else:
+            instance._removed_links = list(links.filter(quote=instance).values_list('tag_id', flat=True))
+    elif action == 'post_add':
+        if reverse:
+            shift_quote_count([instance.pk], len(pk_set))
+        else:
+            shift_quote_count(pk_set, 1)
+    elif action in ('post_remove', 'post_clear'):
+        removed = instance.__dict__.pop('_removed_links', None)
+        if reverse:
+            shift_quote_count([instance.pk], -(removed or 0))
+        else:
+            shift_quote_count(removed, -1)
+
+
+@receiver(pre_delete, sender=Quote)
+def forget_deleted_quote(sender, instance, **kwargs):
+    # каскадне видалення рядків m2m не надсилає m2m_changed
+    shift_quote_count(list(instance.tags.values_list('pk', flat=True)), -1)
+
+
+@receiver(post_save, sender=Quote)
+@receiver(post_delete, sender=Quote)
+def update_quotes_count(sender, instance, created=True, **kwargs):
+    if created:
+        transaction.on_commit(invalidate_quotes_count)
+
+
+# Списки цитат, сторінки тегів і блок популярних тегів показують текст цитат,
+# імена авторів і теги, тож будь-яка з цих змін робить їх застарілими.
+# Сторінка автора залежить лише від самого автора.
+@receiver(post_save, sender=Quote)
+@receiver(post_delete, sender=Quote)
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_quote_pages(sender, **kwargs):
+    if sender is Tag:
+        invalidate_on_commit('quotes', 'autocomplete:tags')
+    else:
+        invalidate_on_commit('quotes')
+
+
+@receiver(m2m_changed, sender=Quote.tags.through)
+def invalidate_tagged_pages(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_on_commit('quotes')
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def invalidate_author_pages(sender, instance, **kwargs):
+    invalidate_on_commit('quotes', f'author:{instance.pk}', 'autocomplete:authors')
+
+
+@receiver(post_save, sender=Quote)
+def update_quote_search_vector(sender, instance, **kwargs):
+    update_quote_vectors(Quote.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Author)
+def update_author_search_vector(sender, instance, **kwargs):
+    # ім'я автора входить і до векторів його цитат
+    update_author_vectors(Author.objects.filter(pk=instance.pk))
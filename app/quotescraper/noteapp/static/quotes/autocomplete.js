@@ -0,0 +1,32 @@
+// Підвантаження варіантів для <select data-autocomplete-url> за введеним префіксом.
+document.addEventListener('DOMContentLoaded', () => {
+    document.querySelectorAll('select[data-autocomplete-url]').forEach((select) => {
+        const search = document.createElement('input');
+        search.type = 'search';
+        search.className = 'form-control mb-1';
+        search.placeholder = 'Start typing...';
+        select.before(search);
+
+        let timer = null;
+        let controller = null;
+        search.addEventListener('input', () => {
+            clearTimeout(timer);
+            timer = setTimeout(async () => {
+                controller?.abort();
+                controller = new AbortController();
+                const url = `${select.dataset.autocompleteUrl}?q=${encodeURIComponent(search.value)}`;
+                try {
+                    const response = await fetch(url, {signal: controller.signal});
+                    const {results} = await response.json();
+                    const kept = [...select.options].filter((option) => !option.value || option.selected);
+                    select.replaceChildren(...kept);
+                    results
+                        .filter(({id}) => !kept.some((option) => option.value === String(id)))
+                        .forEach(({id, text}) => select.add(new Option(text, id)));
+                } catch (err) {
+                    if (err.name !== 'AbortError') console.error(err);
+                }
+            }, 200);
+        });
+    });
+});
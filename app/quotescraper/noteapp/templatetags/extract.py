@@ -1,13 +1,26 @@
+from collections.abc import Mapping
+
 from django import template
-from ..utils import get_mongodb
+from ..search import highlight
+from ..utils import author_resolver
 
 register = template.Library()
 
 
 def get_author(fullname):
-    db = get_mongodb()
-    author = db.authors.find_one({'_id': fullname})
-    return author['fullname']
+    return author_resolver.get(fullname) or ''
+
+
+@register.simple_tag
+def prefetch_authors(items, field='author'):
+    """
+    Завантажує імена авторів усіх елементів сторінки одним запитом,
+    щоб наступні виклики фільтра author брали їх з кешу.
+    """
+    author_ids = [item[field] if isinstance(item, Mapping) else getattr(item, field) for item in items]
+    author_resolver.prime(author_ids)
+    return ''
 
 
 register.filter('author', get_author)
+register.filter('highlight', highlight)
@@ -1,3 +1,655 @@
-from django.test import TestCase
+import asyncio
+import importlib.util
+import json
+import tempfile
+import threading
+import warnings
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import mongomock
+from django.core.cache import cache
+from django.core.cache.backends.base import CacheKeyWarning
+from django.core.management import call_command
+from django.template import Context, Template
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from .models import Tag, Author, Quote
+from . import utils
+from .caching import bump_versions
+from .forms import RegisterQuote
+from .scraper import JsonArrayWriter, QuoteCrawler
+from .search import search_quotes
+from .pagination import CachedCountPaginator
+from .utils import get_popular_tags, QUOTES_COUNT_KEY
+
+
+def load_script(name):
+    # скрипти з utils/ не є пакетом і запускаються напряму
+    path = Path(__file__).resolve().parent.parent / 'utils' / f'{name}.py'
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+quotes_to_scrape = load_script('quotes_to_scrape')
+
+class TagPopularityTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.author = Author.objects.create(fullname='Albert Einstein', born_date='March 14, 1879',
+                                            born_location='in Ulm, Germany', description='')
+        self.life = Tag.objects.create(name='life')
+        self.love = Tag.objects.create(name='love')
+
+    def create_quote(self, *tags):
+        quote = Quote.objects.create(quote=f'Life is like riding a bicycle #{Quote.objects.count()}.',
+                                     author=self.author)
+        quote.tags.add(*tags)
+        return quote
+
+    def assertCounts(self, life, love):
+        self.life.refresh_from_db()
+        self.love.refresh_from_db()
+        self.assertEqual((self.life.quote_count, self.love.quote_count), (life, love))
+
+    def test_add_and_remove(self):
+        quote = self.create_quote(self.life, self.love)
+        quote.tags.add(self.life)
+        self.assertCounts(1, 1)
+        quote.tags.remove(self.love, self.love)
+        self.assertCounts(1, 0)
+        quote.tags.remove(self.love)
+        self.assertCounts(1, 0)
+
+    def test_clear(self):
+        quote = self.create_quote(self.life, self.love)
+        quote.tags.clear()
+        self.assertCounts(0, 0)
+
+    def test_reverse_side(self):
+        first = self.create_quote()
+        second = self.create_quote()
+        self.life.quote_set.add(first, second)
+        self.assertCounts(2, 0)
+        self.life.quote_set.remove(first)
+        self.assertCounts(1, 0)
+        self.life.quote_set.clear()
+        self.assertCounts(0, 0)
+
+    def test_delete_quote(self):
+        self.create_quote(self.life)
+        self.create_quote(self.life, self.love).delete()
+        self.assertCounts(1, 0)
+
+    def test_popular_tags_cached_and_invalidated(self):
+        self.create_quote(self.life, self.love)
+        self.create_quote(self.life)
+        self.assertEqual([tag.name for tag, _ in get_popular_tags()], ['life', 'love'])
+        with self.assertNumQueries(0):
+            get_popular_tags()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_quote(self.love)
+            self.create_quote(self.love)
+        self.assertEqual([(tag.name, size) for tag, size in get_popular_tags()], [('love', 8.25), ('life', 5.5)])
+
+
+class CachedCountPaginatorTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        author = Author.objects.create(fullname='Albert Einstein', born_date='', born_location='', description='')
+        Quote.objects.bulk_create(Quote(quote=f'Quote {i}', author=author) for i in range(25))
+
+    def paginator(self):
+        return CachedCountPaginator(Quote.objects.order_by('created_at', 'id'), 10, cache_key=QUOTES_COUNT_KEY)
+
+    def test_count_cached(self):
+        self.assertEqual(self.paginator().num_pages, 3)
+        with self.assertNumQueries(1):
+            page = self.paginator().page(3)
+            self.assertEqual(len(page.object_list), 5)
+
+    def test_count_invalidated(self):
+        self.assertEqual(self.paginator().count, 25)
+        with self.captureOnCommitCallbacks(execute=True):
+            Quote.objects.create(quote='Quote 25')
+        self.assertEqual(self.paginator().count, 26)
+        with self.captureOnCommitCallbacks(execute=True):
+            Quote.objects.first().delete()
+        self.assertEqual(self.paginator().count, 25)
+
+
+class QuotePageQueriesTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.life = Tag.objects.create(name='life')
+        self.love = Tag.objects.create(name='love')
+
+    def create_quotes(self, count):
+        start = Quote.objects.count()
+        for i in range(start, start + count):
+            author = Author.objects.create(fullname=f'Author {i}', born_date='', born_location='', description='')
+            quote = Quote.objects.create(quote=f'Quote {i}', author=author)
+            quote.tags.add(self.life, self.love)
+
+    def assertConstantQueries(self, url, num):
+        self.create_quotes(1)
+        cache.clear()
+        self.client.get(url)
+        # лічильник і популярні теги лишаються в кеші, а сама сторінка рендериться заново
+        bump_versions('quotes')
+        with self.assertNumQueries(num):
+            self.client.get(url)
+        self.create_quotes(9)
+        cache.clear()
+        self.client.get(url)
+        bump_versions('quotes')
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertContains(response, 'Author 9')
+
+    def test_main(self):
+        self.assertConstantQueries(reverse('quotes:root'), 2)
+
+    def test_selected_tag(self):
+        self.assertConstantQueries(reverse('quotes:selected_tag', args=['life']), 3)
+
+
+class AuthorResolverTests(TestCase):
+
+    def setUp(self):
+        utils.get_mongo_client.cache_clear()
+        mock.patch.object(utils, 'MongoClient', mongomock.MongoClient).start()
+        self.addCleanup(mock.patch.stopall)
+        self.addCleanup(utils.get_mongo_client.cache_clear)
+        self.addCleanup(utils.author_resolver.clear)
+        utils.author_resolver.clear()
+
+        self.db = utils.get_mongodb()
+        self.db.authors.insert_many([
+            {'_id': 'einstein', 'fullname': 'Albert Einstein'},
+            {'_id': 'rowling', 'fullname': 'J.K. Rowling'},
+        ])
+        self.quotes = [{'author': 'einstein'}, {'author': 'rowling'}, {'author': 'einstein'}]
+        self.find = mock.patch.object(mongomock.collection.Collection, 'find', autospec=True,
+                                      side_effect=mongomock.collection.Collection.find).start()
+
+    def render(self):
+        template = Template('{% load extract %}{% prefetch_authors quotes %}'
+                            '{% for quote in quotes %}{{ quote.author|author }};{% endfor %}')
+        return template.render(Context({'quotes': self.quotes}))
+
+    def test_shared_client(self):
+        self.assertIs(utils.get_mongo_client(), utils.get_mongo_client())
+
+    def test_page_resolved_with_one_query(self):
+        self.assertEqual(self.render(), 'Albert Einstein;J.K. Rowling;Albert Einstein;')
+        self.assertEqual(self.find.call_count, 1)
+
+    def test_cached_between_renders(self):
+        self.render()
+        self.db.authors.delete_many({})
+        self.find.reset_mock()
+        self.assertEqual(self.render(), 'Albert Einstein;J.K. Rowling;Albert Einstein;')
+        self.find.assert_not_called()
+
+    def test_lru_eviction(self):
+        resolver = utils.AuthorResolver(maxsize=1)
+        self.assertEqual(resolver.prime(['einstein', 'rowling']),
+                         {'einstein': 'Albert Einstein', 'rowling': 'J.K. Rowling'})
+        self.assertEqual(resolver.get('rowling'), 'J.K. Rowling')
+        self.assertEqual(self.find.call_count, 1)
+        self.assertEqual(resolver.get('einstein'), 'Albert Einstein')
+        self.assertEqual(self.find.call_count, 2)
+
+
+class ImportFromMongoTests(TestCase):
+
+    def setUp(self):
+        utils.get_mongo_client.cache_clear()
+        mock.patch.object(utils, 'MongoClient', mongomock.MongoClient).start()
+        self.addCleanup(mock.patch.stopall)
+        self.addCleanup(utils.get_mongo_client.cache_clear)
+
+        self.mongo = utils.get_mongodb()
+        einstein, rowling = self.mongo.authors.insert_many([
+            {'fullname': 'Albert Einstein', 'born_date': 'March 14, 1879', 'born_location': 'in Ulm, Germany',
+             'description': ''},
+            {'fullname': 'J.K. Rowling', 'born_date': 'July 31, 1965', 'born_location': 'in Yate', 'description': ''},
+        ]).inserted_ids
+        self.einstein = einstein
+        self.mongo.quotes.insert_many([
+            {'quote': 'Life is like riding a bicycle.', 'author': einstein, 'tags': ['life', 'simile']},
+            {'quote': 'Imagination is more important than knowledge.', 'author': einstein, 'tags': ['life']},
+            {'quote': 'It is our choices that show what we truly are.', 'author': rowling,
+             'tags': ['choices', 'choices']},
+        ])
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.checkpoint = Path(tmp.name) / 'checkpoint.json'
+
+    def run_import(self, **options):
+        out = StringIO()
+        call_command('import_from_mongo', checkpoint=str(self.checkpoint), batch=2, stdout=out, **options)
+        return out.getvalue()
+
+    def assertImported(self):
+        self.assertEqual(Author.objects.count(), 2)
+        self.assertEqual(Quote.objects.count(), 3)
+        self.assertEqual(
+            dict(Tag.objects.values_list('name', 'quote_count')), {'life': 2, 'simile': 1, 'choices': 1}
+        )
+        quote = Quote.objects.get(quote='Life is like riding a bicycle.')
+        self.assertEqual(quote.author.fullname, 'Albert Einstein')
+        self.assertEqual(sorted(quote.tags.values_list('name', flat=True)), ['life', 'simile'])
+
+    def test_import(self):
+        output = self.run_import()
+        self.assertImported()
+        self.assertIn('quotes: imported 3 rows', output)
+        self.assertIn('rows/s', output)
+
+    def test_rerun_is_idempotent(self):
+        self.run_import()
+        self.run_import(restart=True)
+        self.assertImported()
+
+    def test_resume_from_checkpoint(self):
+        self.run_import()
+        self.mongo.quotes.insert_one({'quote': 'Try not to become a man of success.', 'author': self.einstein,
+                                      'tags': ['life']})
+        output = self.run_import()
+        self.assertIn('authors: imported 0 rows', output)
+        self.assertIn('quotes: imported 1 rows', output)
+        self.assertEqual(Quote.objects.get(quote='Try not to become a man of success.').author.fullname,
+                         'Albert Einstein')
+        self.assertEqual(Tag.objects.get(name='life').quote_count, 3)
+
+
+class IterJsonArrayTests(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'data.json'
+
+    def parse(self, text, chunk_size):
+        self.path.write_text(text, encoding='utf-8')
+        return list(quotes_to_scrape.iter_json_array(self.path, chunk_size))
+
+    def test_chunk_boundaries(self):
+        items = [
+            {'quote': '“Say \\"hi\\", then \\u2014 go”', 'tags': ['a b', 'c,d]']},
+            {'author': ['Jane Austen'], 'score': 12.5},
+            1.25, 3e10, -4.5e-3, 'plain', None, True,
+        ]
+        text = json.dumps(items, indent=1, ensure_ascii=False)
+        for chunk_size in (1, 2, 3, 5, 7, 16):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(self.parse(text, chunk_size), items)
+
+    def test_empty_array(self):
+        self.assertEqual(self.parse(' [ ] ', 1), [])
+
+    def test_rejects_truncated_and_non_array(self):
+        with self.assertRaises(ValueError):
+            self.parse('[{"a": 1}, {"b": 2}', 4)
+        with self.assertRaises(ValueError):
+            self.parse('[1.5', 2)
+        with self.assertRaises(ValueError):
+            self.parse('{"a": 1}', 4)
+
+
+class MongoLoaderTests(SimpleTestCase):
+
+    def setUp(self):
+        self.db = mongomock.MongoClient().quotescraper
+        self.authors = [
+            {'fullname': 'Albert Einstein', 'born_date': 'March 14, 1879', 'born_location': 'in Ulm, Germany',
+             'description': ''},
+            {'fullname': 'Jane Austen', 'born_date': 'December 16, 1775', 'born_location': 'in Steventon',
+             'description': ''},
+        ]
+        self.quotes = [
+            {'quote': 'Life is like riding a bicycle.', 'author': ['Albert Einstein'], 'tags': ['life']},
+            {'quote': 'There is no charm equal to tenderness of heart.', 'author': ['Jane Austen'], 'tags': []},
+            {'quote': 'Unknown wisdom.', 'author': ['Nobody'], 'tags': ['misc']},
+        ]
+
+    def test_indexes_created(self):
+        quotes_to_scrape.ensure_indexes(self.db)
+        quotes_to_scrape.ensure_indexes(self.db)
+        self.assertTrue(self.db.authors.index_information()['fullname_1']['unique'])
+        self.assertTrue(self.db.quotes.index_information()['quote_1']['unique'])
+
+    def test_rerun_is_idempotent(self):
+        quotes_to_scrape.ensure_indexes(self.db)
+        for _ in range(2):
+            self.assertEqual(quotes_to_scrape.load_authors(self.db, self.authors, batch_size=1), 2)
+            self.assertEqual(quotes_to_scrape.load_quotes(self.db, self.quotes, batch_size=2), (2, 1))
+            self.assertEqual(self.db.authors.count_documents({}), 2)
+            self.assertEqual(self.db.quotes.count_documents({}), 2)
+
+        einstein = self.db.authors.find_one({'fullname': 'Albert Einstein'})
+        quote = self.db.quotes.find_one({'quote': 'Life is like riding a bicycle.'})
+        self.assertEqual(quote['author'], einstein['_id'])
+        self.assertEqual(quote['tags'], ['life'])
+
+
+class TagPageTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.life = Tag.objects.create(name='life')
+        for i in range(15):
+            Quote.objects.create(quote=f'Quote {i}').tags.add(self.life)
+
+    def test_paginated(self):
+        first = self.client.get(reverse('quotes:selected_tag', args=['life']))
+        self.assertEqual(len(first.context['quotes']), 10)
+        self.assertContains(first, reverse('quotes:selected_tag_paginate', args=['life', 2]))
+        second = self.client.get(reverse('quotes:selected_tag_paginate', args=['life', 2]))
+        self.assertEqual([quote.quote for quote in second.context['quotes']], [f'Quote {i}' for i in range(10, 15)])
+        self.assertFalse(second.context['quotes'].has_next())
+
+    def test_unknown_tag(self):
+        self.assertEqual(self.client.get(reverse('quotes:selected_tag', args=['missing'])).status_code, 404)
+
+
+class PageCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.einstein = Author.objects.create(fullname='Albert Einstein', born_date='', born_location='',
+                                              description='')
+        self.rowling = Author.objects.create(fullname='J.K. Rowling', born_date='', born_location='',
+                                             description='')
+        self.root = reverse('quotes:root')
+        self.einstein_page = reverse('quotes:author_detail', args=[self.einstein.pk])
+
+    def test_cached_response(self):
+        first = self.client.get(self.root)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.root)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertIn('Cookie', second['Vary'])
+
+    def test_query_string_ignored(self):
+        first = self.client.get(self.root)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.root, {'x': 1})
+        self.assertEqual(first['ETag'], second['ETag'])
+
+    def test_conditional_get(self):
+        response = self.client.get(self.einstein_page)
+        self.assertEqual(self.client.get(self.einstein_page, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+        self.assertEqual(
+            self.client.get(self.einstein_page, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304
+        )
+
+    def test_quote_invalidates_lists(self):
+        etag = self.client.get(self.root)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            Quote.objects.create(quote='Life is like riding a bicycle.', author=self.einstein)
+        response = self.client.get(self.root, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Life is like riding a bicycle.')
+
+    def test_author_invalidates_own_page_only(self):
+        einstein_etag = self.client.get(self.einstein_page)['ETag']
+        rowling_page = reverse('quotes:author_detail', args=[self.rowling.pk])
+        rowling_etag = self.client.get(rowling_page)['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.einstein.born_location = 'in Ulm, Germany'
+            self.einstein.save()
+        self.assertContains(self.client.get(self.einstein_page, HTTP_IF_NONE_MATCH=einstein_etag), 'in Ulm, Germany')
+        self.assertEqual(self.client.get(rowling_page, HTTP_IF_NONE_MATCH=rowling_etag).status_code, 304)
+
+    def test_authenticated_not_cached(self):
+        user = User.objects.create_user('tester', password='secret')
+        self.client.force_login(user)
+        response = self.client.get(self.root)
+        self.assertContains(response, 'tester')
+        self.assertNotIn('ETag', response)
+
+
+class AutocompleteTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for name in ['Life', 'lifestyle', 'love', 'inspirational']:
+            Tag.objects.create(name=name)
+        self.einstein = Author.objects.create(fullname='Albert Einstein', born_date='', born_location='',
+                                              description='')
+
+    def complete(self, kind, q):
+        response = self.client.get(reverse('quotes:autocomplete', args=[kind]), {'q': q})
+        return [item['text'] for item in response.json()['results']]
+
+    def test_prefix_case_insensitive(self):
+        self.assertEqual(self.complete('tags', 'LIF'), ['Life', 'lifestyle'])
+        self.assertEqual(self.complete('authors', 'al'), ['Albert Einstein'])
+        self.assertEqual(self.client.get(reverse('quotes:autocomplete', args=['quotes'])).status_code, 404)
+
+    def test_hot_prefix_cached_until_change(self):
+        self.complete('tags', 'li')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.complete('tags', 'li'), ['Life', 'lifestyle'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(name='literature')
+        self.assertEqual(self.complete('tags', 'li'), ['Life', 'lifestyle', 'literature'])
+
+    def test_prefix_not_used_as_raw_cache_key(self):
+        # locmem попереджає про ключі, які memcached відхилив би
+        with warnings.catch_warnings():
+            warnings.simplefilter('error', CacheKeyWarning)
+            self.assertEqual(self.complete('authors', 'albert ein'), ['Albert Einstein'])
+            self.assertEqual(self.complete('tags', 'l' * 300), [])
+            self.assertEqual(self.complete('tags', 'li\n\x01'), [])
+
+    def test_form_renders_selected_options_only(self):
+        with self.assertNumQueries(0):
+            html = str(RegisterQuote())
+        self.assertNotIn('inspirational', html)
+        self.assertIn(reverse('quotes:autocomplete', args=['tags']), html)
+
+        love = Tag.objects.get(name='love')
+        form = RegisterQuote(data={'quote': 'All you need is love.', 'tags': love.pk, 'author': self.einstein.pk})
+        self.assertTrue(form.is_valid())
+        html = str(form['tags'])
+        self.assertIn(f'<option value="{love.pk}" selected>love</option>', html)
+        self.assertNotIn('lifestyle', html)
+
+    def test_form_rerenders_invalid_choice(self):
+        form = RegisterQuote(data={'quote': 'All you need is love.', 'tags': 'love', 'author': self.einstein.pk})
+        self.assertFalse(form.is_valid())
+        self.assertIn('tags', form.errors)
+        self.assertIn(f'<option value="{self.einstein.pk}" selected>Albert Einstein</option>', str(form))
+
+
+class SearchTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.einstein = Author.objects.create(fullname='Albert Einstein', born_date='', born_location='',
+                                              description='Theoretical physicist who developed relativity.')
+        self.rowling = Author.objects.create(fullname='J.K. Rowling', born_date='', born_location='',
+                                             description='British author of the Harry Potter series.')
+        Quote.objects.create(quote='Imagination is more important than knowledge.', author=self.einstein)
+        Quote.objects.create(quote='Knowledge is power & imagination <rules>.', author=self.rowling)
+        Quote.objects.create(quote='It is our choices that show what we truly are.', author=self.rowling)
+
+    def search(self, q, **params):
+        return self.client.get(reverse('quotes:search'), {'q': q, **params})
+
+    def test_ranked_and_highlighted(self):
+        response = self.search('imagination knowledge')
+        quotes = response.context['quotes']
+        self.assertEqual(len(quotes), 2)
+        self.assertGreaterEqual(quotes[0].rank, quotes[1].rank)
+        self.assertContains(response, '<mark>Imagination</mark>')
+        self.assertContains(response, 'power &amp; <mark>imagination</mark>')
+
+    def test_matches_author_name_and_description(self):
+        response = self.search('rowling')
+        self.assertEqual(len(response.context['quotes']), 2)
+        self.assertEqual(list(response.context['authors']), [self.rowling])
+        self.assertEqual(list(self.search('physicist').context['authors']), [self.einstein])
+
+    def test_vectors_follow_saves(self):
+        quote = Quote.objects.get(quote__startswith='It is our choices')
+        quote.quote = 'Happiness can be found in the darkest of times.'
+        quote.save()
+        self.assertEqual(list(search_quotes('happiness')), [quote])
+        self.rowling.fullname = 'Robert Galbraith'
+        self.rowling.save()
+        self.assertEqual(search_quotes('galbraith').count(), 2)
+        self.assertEqual(search_quotes('rowling').count(), 0)
+
+    def test_paginated(self):
+        for i in range(12):
+            Quote.objects.create(quote=f'Another imagination quote {i}', author=self.einstein)
+        self.assertEqual(len(self.search('imagination').context['quotes']), 10)
+        self.assertEqual(len(self.search('imagination', page=2).context['quotes']), 4)
+
+
+FIXTURE_SITE = Path(__file__).parent / 'testdata' / 'quotes_site'
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    # кількість відповідей 503 перед нормальною відповіддю для кожного шляху
+    failures = {}
+    # шляхи, що віддають сторінку без очікуваної розмітки
+    broken = set()
+
+    def do_GET(self):
+        if self.failures.get(self.path, 0) > 0:
+            self.failures[self.path] -= 1
+            self.send_error(503)
+            return
+        if self.path in self.broken:
+            body = b'<html><body><h1>Maintenance</h1></body></html>'
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        super().do_GET()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class QuoteCrawlerTests(SimpleTestCase):
+
+    def setUp(self):
+        FixtureHandler.failures = {}
+        FixtureHandler.broken = set()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), partial(FixtureHandler, directory=str(FIXTURE_SITE)))
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/'
+
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.out_dir = Path(tmp.name)
+
+    def crawl(self, resume=True, retries=2):
+        crawler = QuoteCrawler([self.url], self.out_dir, concurrency=4, rate=0, retries=retries, backoff=0.01,
+                               checkpoint=self.out_dir / 'frontier.json')
+        asyncio.run(crawler.run(resume=resume))
+        return crawler
+
+    def output(self, name):
+        return json.loads((self.out_dir / name).read_text())
+
+    def test_crawl(self):
+        self.crawl()
+        quotes = self.output('quotes.json')
+        self.assertEqual(len(quotes), 3)
+        self.assertIn({'tags': ['abilities', 'choices'], 'author': ['J.K. Rowling'],
+                       'quote': '“It is our choices, Harry, that show what we truly are, far more than our abilities.”'},
+                      quotes)
+        authors = {author['fullname']: author for author in self.output('authors.json')}
+        self.assertEqual(set(authors), {'Albert Einstein', 'J.K. Rowling'})
+        self.assertEqual(authors['Albert Einstein']['born_location'], 'in Ulm, Germany')
+
+    def test_retries_transient_errors(self):
+        FixtureHandler.failures = {'/page/2/': 2}
+        crawler = self.crawl()
+        self.assertEqual(crawler.failed, [])
+        self.assertEqual(len(self.output('quotes.json')), 3)
+
+    def test_resume_after_failure(self):
+        FixtureHandler.failures = {'/page/2/': 10}
+        crawler = self.crawl(retries=1)
+        self.assertEqual(crawler.failed, [self.url + 'page/2/'])
+        self.assertEqual(len(self.output('quotes.json')), 2)
+
+        FixtureHandler.failures = {}
+        crawler = self.crawl()
+        self.assertEqual(crawler.failed, [])
+        quotes = self.output('quotes.json')
+        self.assertEqual(len(quotes), 3)
+        self.assertEqual(len(self.output('authors.json')), 2)
+
+    def test_first_run_overwrites_existing_output(self):
+        (self.out_dir / 'quotes.json').write_text('[\n{"quote": "shipped"}\n]')
+        self.crawl()
+        quotes = self.output('quotes.json')
+        self.assertEqual(len(quotes), 3)
+        self.assertNotIn({'quote': 'shipped'}, quotes)
+
+    def test_malformed_page_does_not_stop_crawl(self):
+        FixtureHandler.broken = {'/author/Albert-Einstein/'}
+        with self.assertLogs(level='WARNING'):
+            crawler = self.crawl()
+        self.assertEqual(crawler.failed, [self.url + 'author/Albert-Einstein'])
+        self.assertEqual(len(self.output('quotes.json')), 3)
+        self.assertEqual([author['fullname'] for author in self.output('authors.json')], ['J.K. Rowling'])
+
+
+class JsonArrayWriterTests(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = Path(tmp.name) / 'quotes.json'
+
+    def append(self, *items):
+        writer = JsonArrayWriter(self.path, resume=True)
+        for item in items:
+            writer.write(item)
+        writer.close()
+        return json.loads(self.path.read_text())
+
+    def test_resume_appends(self):
+        self.append({'quote': 'a ] b'})
+        self.assertEqual(self.append({'quote': 'c'}), [{'quote': 'a ] b'}, {'quote': 'c'}])
+
+    def test_truncated_file_repaired(self):
+        self.append({'quote': 'first', 'tags': ['x']}, {'quote': 'second', 'tags': ['y']})
+        data = self.path.read_bytes()
+        # обрив посеред другого елемента, якраз після "]" списку тегів
+        self.path.write_bytes(data[:data.rindex(b'"y"]') + 4])
+        with self.assertLogs(level='WARNING'):
+            quotes = self.append({'quote': 'third'})
+        self.assertEqual(quotes, [{'quote': 'first', 'tags': ['x']}, {'quote': 'third'}])
+
+    def test_not_an_array(self):
+        self.path.write_text('garbage')
+        with self.assertRaises(ValueError):
+            JsonArrayWriter(self.path, resume=True)
@@ -1,8 +1,141 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Lower
 from pymongo import MongoClient
 
+from .caching import get_versions
+from .models import Author, Tag, Quote
+
+
+POPULAR_TAGS_KEY = 'quotes:popular_tags'
+QUOTES_COUNT_KEY = 'quotes:count'
+AUTOCOMPLETE_KEY = 'quotes:autocomplete:{}:{}:{}'
+# довші префікси не звужують вибірку, а лише навантажують базу
+AUTOCOMPLETE_MAX_PREFIX = 100
+
+# вид -> (модель, поле з назвою)
+AUTOCOMPLETE_SOURCES = {
+    'tags': (Tag, 'name'),
+    'authors': (Author, 'fullname'),
+}
+
+
+@lru_cache(maxsize=None)
+def get_mongo_client():
+    """
+    Один MongoClient на процес: він сам тримає пул з'єднань і безпечний для потоків.
+    """
+    return MongoClient(settings.MONGO_URL, maxPoolSize=settings.MONGO_MAX_POOL_SIZE)
+
 
 def get_mongodb():
-    client = MongoClient('mongodb://localhost')
+    return get_mongo_client()[settings.MONGO_DB]
+
+
+class AuthorResolver:
+    """
+    Імена авторів з MongoDB за їхніми _id.
+
+    prime() довантажує всі відсутні в кеші id сторінки одним запитом $in,
+    get() бере значення з LRU-кешу і звертається до бази лише при промаху.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def prime(self, author_ids):
+        with self._lock:
+            resolved = {}
+            missing = []
+            for author_id in dict.fromkeys(author_ids):
+                if author_id in self._cache:
+                    self._cache.move_to_end(author_id)
+                    resolved[author_id] = self._cache[author_id]
+                else:
+                    missing.append(author_id)
+        if missing:
+            authors = get_mongodb().authors.find({'_id': {'$in': missing}}, {'fullname': 1})
+            found = {author['_id']: author['fullname'] for author in authors}
+            with self._lock:
+                for author_id, fullname in found.items():
+                    self._cache[author_id] = fullname
+                    self._cache.move_to_end(author_id)
+                while len(self._cache) > self.maxsize:
+                    self._cache.popitem(last=False)
+            resolved.update(found)
+        return resolved
+
+    def get(self, author_id):
+        return self.prime([author_id]).get(author_id)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+
+author_resolver = AuthorResolver(settings.AUTHOR_CACHE_SIZE)
+
+
+def get_popular_tags(limit=10):
+    popular_tags = cache.get(POPULAR_TAGS_KEY)
+    if popular_tags is None:
+        tags = Tag.objects.filter(quote_count__gt=0).order_by('-quote_count', 'name')[:limit]
+        popular_tags = [(tag, 2.75 * tag.quote_count) for tag in tags]
+        cache.set(POPULAR_TAGS_KEY, popular_tags, timeout=None)
+    return popular_tags
+
+
+def invalidate_popular_tags():
+    cache.delete(POPULAR_TAGS_KEY)
+
+
+def invalidate_quotes_count():
+    cache.delete(QUOTES_COUNT_KEY)
+
+
+def refresh_quote_count(tag_ids):
+    """
+    Перерахунок Tag.quote_count за таблицею зв'язків для змін, що оминають сигнали m2m_changed.
+    """
+    links = (
+        Quote.tags.through.objects.filter(tag_id=OuterRef('pk'))
+        .order_by().values('tag_id').annotate(total=Count('*')).values('total')
+    )
+    Tag.objects.filter(pk__in=tag_ids).update(quote_count=Coalesce(Subquery(links), 0))
+    transaction.on_commit(invalidate_popular_tags)
+
+
+def autocomplete(kind, prefix, limit=20):
+    """
+    Варіанти для автодоповнення за префіксом без урахування регістру.
+
+    Результати кешуються за префіксом до зміни відповідної таблиці,
+    тож популярні префікси не доходять до бази. У ключ кешу йде хеш
+    префікса, бо memcached не приймає пробілів і ключів довших за 250 символів.
 
-    db = client.quotescraper
-    return db
+    :param kind: Ключ з AUTOCOMPLETE_SOURCES.
+    :param prefix: Введений користувачем початок назви.
+    :return: Список словників {'id', 'text'}.
+    """
+    model, field = AUTOCOMPLETE_SOURCES[kind]
+    prefix = prefix.strip().lower()[:AUTOCOMPLETE_MAX_PREFIX]
+    version, = get_versions([f'autocomplete:{kind}'])
+    key = AUTOCOMPLETE_KEY.format(kind, version, hashlib.md5(prefix.encode()).hexdigest())
+    results = cache.get(key)
+    if results is None:
+        rows = (
+            model.objects.annotate(label=Lower(field)).filter(label__startswith=prefix)
+            .order_by('label').values_list('id', field)[:limit]
+        )
+        results = [{'id': pk, 'text': text} for pk, text in rows]
+        cache.set(key, results, settings.AUTOCOMPLETE_CACHE_TIMEOUT)
+    return results
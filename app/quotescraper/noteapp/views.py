@@ -1,48 +1,76 @@
-from django.shortcuts import render, redirect
-from django.core.paginator import Paginator
-from django.db.models import Count
+from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
+from django.core.paginator import Paginator
+from django.http import Http404, JsonResponse
+from django.views.decorators.http import require_GET
 
-from .utils import get_mongodb
+from .caching import cached_page
+from .utils import get_mongodb, get_popular_tags, autocomplete, QUOTES_COUNT_KEY, AUTOCOMPLETE_SOURCES
+from .pagination import CachedCountPaginator, KnownCountPaginator
 from .models import Tag, Author, Quote
+from .search import search_authors, search_quotes
 from .forms import RegisterAuthor, RegisterQuote, RegisterTag
 
 
-popular_tags = Tag.objects.annotate(num_quotes=Count('quote')).order_by('-num_quotes')[:10]
-popular_tags = [(tag, 2.75 * tag.num_quotes) for tag in popular_tags]
-
-
+@cached_page('quotes')
 def main(request, page=1):
     context = {}
     # db = get_mongodb()
     # quotes = db.quotes.find()
-    quotes = Quote.objects.all()
+    quotes = Quote.objects.with_related().order_by('created_at', 'id')
 
     per_page = 10
-    paginator = Paginator(list(quotes), per_page)
+    paginator = CachedCountPaginator(quotes, per_page, cache_key=QUOTES_COUNT_KEY)
     quotes_on_page = paginator.page(page)
 
-    context['popular_tags'] = popular_tags
+    context['popular_tags'] = get_popular_tags()
     context['quotes'] = quotes_on_page
     return render(request, 'quotes/index.html', context=context)
 
 
+@cached_page('author:{author_id}')
 def author_detail(request, author_id):
     author = Author.objects.get(pk=author_id)
     return render(request, 'quotes/author.html', context={'author': author})
 
 
+@cached_page('quotes')
 def selected_tag(request, tag_name, page=1):
-    tag = Tag.objects.get(name=tag_name)
-    quotes = Quote.objects.filter(tags=tag)
+    tag = get_object_or_404(Tag, name=tag_name)
+    # порядок за id збігається з індексом (tag_id, quote_id) таблиці зв'язків
+    quotes = Quote.objects.with_related().filter(tags=tag).order_by('id')
+
+    per_page = 10
+    paginator = KnownCountPaginator(quotes, per_page, count=tag.quote_count)
     context = {
         'tag': tag,
-        'quotes': quotes,
-        'popular_tags': popular_tags,
+        'quotes': paginator.get_page(page),
+        'popular_tags': get_popular_tags(),
     }
     return render(request, 'quotes/tags.html', context=context)
 
 
+def search(request):
+    q = request.GET.get('q', '').strip()
+    context = {
+        'q': q,
+        'popular_tags': get_popular_tags(),
+    }
+    if q:
+        per_page = 10
+        paginator = Paginator(search_quotes(q), per_page)
+        context['quotes'] = paginator.get_page(request.GET.get('page'))
+        context['authors'] = search_authors(q)[:5]
+    return render(request, 'quotes/search.html', context=context)
+
+
+@require_GET
+def autocomplete_view(request, kind):
+    if kind not in AUTOCOMPLETE_SOURCES:
+        raise Http404
+    return JsonResponse({'results': autocomplete(kind, request.GET.get('q', ''))})
+
+
 @login_required
 def add_author(request):
     if request.method == 'POST':
@@ -42,6 +42,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'quotes',
     'users',
 ]
@@ -91,6 +92,18 @@ DATABASES = {
     }
 }
 
+MONGO_URL = env('MONGO_URL', default='mongodb://localhost')
+MONGO_DB = env('MONGO_DB', default='quotescraper')
+MONGO_MAX_POOL_SIZE = env.int('MONGO_MAX_POOL_SIZE', default=50)
+AUTHOR_CACHE_SIZE = env.int('AUTHOR_CACHE_SIZE', default=1024)
+
+# локальна пам'ять за замовчуванням; у продакшені спільний бекенд, напр. CACHE_URL=pymemcache://127.0.0.1:11211
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://'),
+}
+PAGE_CACHE_TIMEOUT = env.int('PAGE_CACHE_TIMEOUT', default=24 * 60 * 60)
+AUTOCOMPLETE_CACHE_TIMEOUT = env.int('AUTOCOMPLETE_CACHE_TIMEOUT', default=10 * 60)
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -1,22 +1,113 @@
 import json
-from bson.objectid import ObjectId
+import sys
+from itertools import islice
+from pathlib import Path
 
-from pymongo import MongoClient
+from pymongo import ASCENDING, MongoClient, UpdateOne
 
 
-client = MongoClient('mongodb://localhost')
+BATCH_SIZE = 1000
+CHUNK_SIZE = 64 * 1024
 
-db = client.quotescraper
 
-with open('quotes.json', 'r') as f:
-    quotes = json.load(f)
+def iter_json_array(path, chunk_size=CHUNK_SIZE):
+    """
+    Елементи JSON-масиву з файлу по одному, без завантаження всього файлу в пам'ять.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(chunk_size).lstrip()
+        while not buffer and (chunk := f.read(chunk_size)):
+            buffer = chunk.lstrip()
+        if not buffer.startswith('['):
+            raise ValueError(f'{path}: expected a JSON array')
+        buffer = buffer[1:]
+        while True:
+            buffer = buffer.lstrip().lstrip(',').lstrip()
+            if buffer.startswith(']'):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                buffer += chunk
+                continue
+            rest = buffer[end:].lstrip()
+            if not rest or rest[0] not in ',]':
+                # число на межі блоку могло бути прочитане не повністю: "1." або "1e" перед "5"
+                chunk = f.read(chunk_size)
+                if chunk:
+                    buffer += chunk
+                    continue
+                raise json.JSONDecodeError("Expecting ',' delimiter or ']'", buffer, end)
+            yield item
+            buffer = buffer[end:]
 
-for quote in quotes:
-    author = db.authors.find_one({'fullname': quote['author'][0]})
-    if author:
-        db.quotes.insert_one({
-            'tags': quote['tags'],
-            'author': ObjectId(author['_id']),
-            'quote': quote['quote']
-        })
-        print('Done')
+
+def batched(iterable, size=BATCH_SIZE):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def ensure_indexes(db):
+    db.authors.create_index([('fullname', ASCENDING)], unique=True)
+    db.quotes.create_index([('quote', ASCENDING)], unique=True)
+
+
+def load_authors(db, authors, batch_size=BATCH_SIZE):
+    """
+    Upsert авторів за fullname, тож повторний запуск не створює дублікатів.
+
+    :return: Кількість оброблених записів.
+    """
+    total = 0
+    for batch in batched(authors, batch_size):
+        db.authors.bulk_write(
+            [UpdateOne({'fullname': author['fullname']}, {'$set': author}, upsert=True) for author in batch],
+            ordered=False,
+        )
+        total += len(batch)
+    return total
+
+
+def load_quotes(db, quotes, batch_size=BATCH_SIZE):
+    """
+    Upsert цитат за текстом. Автори беруться з однієї попередньо завантаженої мапи fullname -> _id,
+    цитати невідомих авторів пропускаються.
+
+    :return: Кількість записаних і пропущених цитат.
+    """
+    author_ids = {author['fullname']: author['_id'] for author in db.authors.find({}, {'fullname': 1})}
+    total = skipped = 0
+    for batch in batched(quotes, batch_size):
+        requests = []
+        for quote in batch:
+            author_id = author_ids.get(quote['author'][0])
+            if author_id is None:
+                skipped += 1
+                continue
+            requests.append(UpdateOne(
+                {'quote': quote['quote']},
+                {'$set': {'tags': quote['tags'], 'author': author_id, 'quote': quote['quote']}},
+                upsert=True,
+            ))
+        if requests:
+            db.quotes.bulk_write(requests, ordered=False)
+        total += len(requests)
+    return total, skipped
+
+
+if __name__ == '__main__':
+    client = MongoClient('mongodb://localhost')
+
+    db = client.quotescraper
+    # каталог з результатом manage.py scrape_quotes, за замовчуванням - набір даних поруч зі скриптом
+    data_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent
+
+    ensure_indexes(db)
+    print(f"Authors: {load_authors(db, iter_json_array(data_dir / 'authors.json'))}")
+    loaded, skipped = load_quotes(db, iter_json_array(data_dir / 'quotes.json'))
+    print(f'Quotes: {loaded}, skipped without author: {skipped}')
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from pydantic import BaseSettings
 
 
@@ -16,13 +18,46 @@ class Settings(BaseSettings):
     sqlalchemy_database_url: str
     secret_key: str
     algorithm: str
+    jwt_backend: str = 'jose'
+    jwt_private_key: str | None = None
+    jwt_public_key: str | None = None
+    jwt_cache_size: int = 4096
+    jwt_cache_ttl: int = 300
+    refresh_token_ttl: int = 7 * 24 * 3600
+    rate_limit_enabled: bool = True
+    rate_limit_policies: str = str(Path(__file__).parent / 'rate_limits.json')
+    rate_limit_redis_retry: float = 5.0
+    rate_limit_local_maxsize: int = 10000
     mail_username: str
     mail_password: str
     mail_from: str
     mail_port: int
     mail_server: str
+    mail_from_name: str = 'Desired Name'
+    mail_starttls: bool = False
+    mail_ssl_tls: bool = True
+    mail_validate_certs: bool = True
     redis_host: str = 'localhost'
     redis_port: int = 6379
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_pre_ping: bool = True
+    db_pool_recycle: int = 1800
+    db_statement_cache_size: int = 100
+    db_command_timeout: float = 60.0
+    user_cache_maxsize: int = 1024
+    user_cache_ttl: int = 900
+    user_cache_local_ttl: int = 30
+    bcrypt_rounds: int = 12
+    password_hash_concurrency: int = 4
+    password_hash_pool: str = 'thread'
+    email_worker_name: str = 'default'
+    email_batch_size: int = 50
+    email_max_attempts: int = 5
+    email_retry_backoff: float = 5.0
+    email_retry_max_delay: float = 600.0
+    email_poll_timeout: float = 5.0
 
 
 settings = Settings()
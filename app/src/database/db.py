@@ -1,186 +1,165 @@
 import contextlib
+import time
 from typing import AsyncIterator
 
+from sqlalchemy import exc
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-from src.conf.config import config
-from fastapi import FastAPI, Depends, HTTPException,Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from src.schemas import ContactCreate, Contact, ContactUpdate   
-from src import crud
-from datetime import date, timedelta
-from sqlalchemy.orm import selectinload
-from sqlalchemy import or_, and_
-from sqlalchemy.ext.asyncio import AsyncSession
-from src.database import Base, DatabaseSessionManager
-from src.conf import settings
-from src import crud
+from src.conf.config import settings
 
 
-app = FastAPI()
-
-
-SQLALCHEMY_DATABASE_URL = settings.sqlalchemy_database_url
-
 class Base(DeclarativeBase):
     pass
 
 
-class DatabaseSessionManager:
-    def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url)
-        self._session_maker: async_sessionmaker | None = async_sessionmaker(autocommit=False,
-                                                                            autoflush=False,
-                                                                            expire_on_commit=False,
-                                                                            bind=self._engine)
+class PoolMetrics:
     """
-    Менеджер сесій для роботи з базою даних.
+    Метрики пулу з'єднань: час очікування checkout та насиченість пулу.
     """
-    @contextlib.asynccontextmanager
-    async def session(self) -> AsyncIterator[AsyncSession]:
-        if self._session_maker is None:
-            raise Exception("DatabaseSessionManager is not initialized")
-        session = self._session_maker()
-        try:
-            yield session
-        except Exception as err:
-            print(err)
-            await session.rollback()
-        finally:
-            await session.close()
 
+    def __init__(self):
+        self.reset()
 
-sessionmanager = DatabaseSessionManager(config.DB_URL)
+    def reset(self):
+        self.checkouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
 
+    def observe_checkout(self, wait: float, timed_out: bool = False):
+        self.checkouts += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+        if timed_out:
+            self.timeouts += 1
 
+    def snapshot(self, pool: AsyncAdaptedQueuePool | None) -> dict:
+        """
+        Поточний стан пулу та накопичені метрики checkout.
 
-async def get_db():
-    async with sessionmanager.session() as session:
-        yield session
+        :param pool: Пул з'єднань двигуна або None, якщо двигун ще не створено.
+        :type pool: AsyncAdaptedQueuePool | None
+        :return: Словник з метриками.
+        :rtype: dict
         """
-    Залежність для отримання асинхронної сесії бази даних.
-    """
+        data = {
+            "checkouts": self.checkouts,
+            "checkout_wait_avg_ms": self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0,
+            "checkout_wait_max_ms": self.wait_max * 1000,
+            "checkout_timeouts": self.timeouts,
+        }
+        if isinstance(pool, AsyncAdaptedQueuePool):
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            data.update({
+                "pool_size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": pool.overflow(),
+                "saturation": pool.checkedout() / capacity if capacity else 0.0,
+            })
+        return data
 
-@app.post("/contacts/", response_model=Contact)
-async def create_contact(contact: ContactCreate, db: AsyncSession = Depends(get_db)):
-    return crud.create_contact(db, contact)
-    """
-    Створення нового контакту.
-
-    :param contact: Дані для створення контакту.
-    :type contact: ContactCreate
-    :param db: Асинхронна сесія бази даних.
-    :type db: AsyncSession
-    :return: Дані створеного контакту.
-    :rtype: Contact
-    """
 
-@app.get("/contacts/", response_model=list[Contact])
-async def get_contacts(skip: int = 0, limit: int = 10, db: AsyncSession = Depends(get_db)):
-    return crud.get_contacts(db, skip=skip, limit=limit)
-    """
-    Отримання списку контактів.
-
-    :param skip: Кількість записів для пропуску.
-    :type skip: int
-    :param limit: Максимальна кількість записів для повернення.
-    :type limit: int
-    :param db: Асинхронна сесія бази даних.
-    :type db: AsyncSession
-    :return: Список контактів.
-    :rtype: list[Contact]
-    """
+pool_metrics = PoolMetrics()
 
-@app.get("/contacts/{contact_id}", response_model=Contact)
-async def get_contact(contact_id: int, db: AsyncSession = Depends(get_db)):
-    contact = crud.get_contact(db, contact_id)
-    if contact is None:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
-    """
-    Отримання інформації про контакт за його ідентифікатором.
-
-    :param contact_id: Ідентифікатор контакту.
-    :type contact_id: int
-    :param db: Асинхронна сесія бази даних.
-    :type db: AsyncSession
-    :return: Інформація про контакт.
-    :rtype: Contact
-    """
 
-@app.put("/contacts/{contact_id}", response_model=Contact)
-async def update_contact(contact_id: int, updated_contact: ContactUpdate, db: AsyncSession = Depends(get_db)):
-    contact = crud.update_contact(db, contact_id, updated_contact)
-    if contact is None:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
     """
-    Оновлення інформації про контакт.
-
-    :param contact_id: Ідентифікатор контакту.
-    :type contact_id: int
-    :param updated_contact: Оновлені дані контакту.
-    :type updated_contact: ContactUpdate
-    :param db: Асинхронна сесія бази даних.
-    :type db: AsyncSession
-    :return: Оновлена інформація про контакт.
-    :rtype: Contact
+    Пул з'єднань, що вимірює час очікування вільного з'єднання.
     """
 
-@app.delete("/contacts/{contact_id}", response_model=Contact)
-async def delete_contact(contact_id: int, db: AsyncSession = Depends(get_db)):
-    contact = crud.delete_contact(db, contact_id)
-    if contact is None:
-        raise HTTPException(status_code=404, detail="Contact not found")
-    return contact
+    def connect(self):
+        start = time.perf_counter()
+        timed_out = False
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            timed_out = True
+            raise
+        finally:
+            pool_metrics.observe_checkout(time.perf_counter() - start, timed_out)
+
+
+class DatabaseSessionManager:
     """
-    Видалення контакту за його ідентифікатором.
-
-    :param contact_id: Ідентифікатор контакту.
-    :type contact_id: int
-    :param db: Асинхронна сесія бази даних.
-    :type db: AsyncSession
-    :return: Видалена інформація про контакт.
-    :rtype: Contact
+    Менеджер сесій для роботи з базою даних.
+
+    Двигун створюється методом ``init`` під час старту застосунку
+    та звільняється методом ``close`` під час його зупинки.
     """
 
+    def __init__(self):
+        self._engine: AsyncEngine | None = None
+        self._session_maker: async_sessionmaker | None = None
 
+    @property
+    def engine(self) -> AsyncEngine | None:
+        return self._engine
 
+    def init(self, url: str):
+        """
+        Створення двигуна з налаштуваннями пулу з ``Settings``.
 
+        :param url: Адреса бази даних.
+        :type url: str
+        """
+        connect_args = {}
+        if url.startswith("postgresql+asyncpg"):
+            connect_args = {
+                "statement_cache_size": settings.db_statement_cache_size,
+                "command_timeout": settings.db_command_timeout,
+            }
+        self._engine = create_async_engine(
+            url,
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_pre_ping=settings.db_pool_pre_ping,
+            pool_recycle=settings.db_pool_recycle,
+            connect_args=connect_args,
+        )
+        self._session_maker = async_sessionmaker(autocommit=False,
+                                                 autoflush=False,
+                                                 expire_on_commit=False,
+                                                 bind=self._engine)
+
+    async def close(self):
+        """
+        Закриття всіх з'єднань пулу.
+        """
+        if self._engine is None:
+            return
+        await self._engine.dispose()
+        self._engine = None
+        self._session_maker = None
 
-@app.get("/contacts/search/", response_model=list[Contact])
-async def search_contacts(
-    query: str = Query(..., description="Search query for name, last name, or email"),
-    db: AsyncSession = Depends(get_db)
-):
-    return crud.search_contacts(db, query)
-    """
-    Пошук контактів за запитом.
-
-    :param query: Запит для пошуку (ім'я, прізвище або електронна пошта).
-    :type query: str
-    :param db: Асинхронна сесія бази даних.
-    :type db: AsyncSession
-    :return: Список знайдених контактів.
-    :rtype: list[Contact]
-    """
+    def metrics(self) -> dict:
+        return pool_metrics.snapshot(self._engine.pool if self._engine else None)
 
-@app.get("/contacts/birthdays/", response_model=list[Contact])
-async def upcoming_birthdays(db: AsyncSession = Depends(get_db)):
-    today = date.today()
-    next_week = today + timedelta(days=7)
-    return crud.get_upcoming_birthdays(db, today, next_week)
-    """
-    Пошук контактів за запитом.
-
-    :param query: Запит для пошуку (ім'я, прізвище або електронна пошта).
-    :type query: str
-    :param db: Асинхронна сесія бази даних.
-    :type db: AsyncSession
-    :return: Список знайдених контактів.
-    :rtype: list[Contact]
-    """
+    @contextlib.asynccontextmanager
+    async def session(self) -> AsyncIterator[AsyncSession]:
+        if self._session_maker is None:
+            raise Exception("DatabaseSessionManager is not initialized")
+        session = self._session_maker()
+        try:
+            yield session
+        except Exception as err:
+            print(err)
+            await session.rollback()
+        finally:
+            await session.close()
 
 
+sessionmanager = DatabaseSessionManager()
 
+
+async def get_db():
+    """
+    Залежність для отримання асинхронної сесії бази даних.
+    """
+    async with sessionmanager.session() as session:
+        yield session
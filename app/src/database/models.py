@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, Boolean, func, Table, UniqueConstraint
+import enum
+
+from sqlalchemy import Column, Integer, String, Boolean, func, Table, UniqueConstraint, Index, Enum
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.schema import ForeignKey
 from sqlalchemy.sql.sqltypes import DateTime
@@ -12,11 +14,16 @@ note_m2m_tag = Table(
     Column("id", Integer, primary_key=True),
     Column("note_id", Integer, ForeignKey("notes.id", ondelete="CASCADE")),
     Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE")),
+    UniqueConstraint("note_id", "tag_id", name="unique_note_tag"),
+    Index("ix_note_m2m_tag_tag_id_note_id", "tag_id", "note_id"),
 )
 
 
 class Note(Base):
     __tablename__ = "notes"
+    __table_args__ = (
+        Index('ix_notes_user_id_created_at_id', 'user_id', 'created_at', 'id'),
+    )
     id = Column(Integer, primary_key=True)
     title = Column(String(50), nullable=False)
     created_at = Column('created_at', DateTime, default=func.now())
@@ -31,6 +38,7 @@ class Tag(Base):
     __tablename__ = "tags"
     __table_args__ = (
         UniqueConstraint('name', 'user_id', name='unique_tag_user'),
+        Index('ix_tags_user_id_name_id', 'user_id', 'name', 'id'),
     )
     id = Column(Integer, primary_key=True)
     name = Column(String(25), nullable=False)
@@ -38,6 +46,12 @@ class Tag(Base):
     user = relationship('User', backref="tags")
 
 
+class Role(enum.Enum):
+    admin: str = "admin"
+    moderator: str = "moderator"
+    user: str = "user"
+
+
 class User(Base):
     __tablename__ = "users"
     id = Column(Integer, primary_key=True)
@@ -47,4 +61,5 @@ class User(Base):
     created_at = Column('crated_at', DateTime, default=func.now())
     avatar = Column(String(255), nullable=True)
     refresh_token = Column(String(255), nullable=True)
-    confirmed = Column(Boolean, default=False)
\ No newline at end of file
+    confirmed = Column(Boolean, default=False)
+    role = Column('role', Enum(Role), default=Role.user)
\ No newline at end of file
@@ -1,72 +1,199 @@
-from typing import List
+from datetime import datetime
+from typing import List, Tuple
 
-from sqlalchemy import and_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, select, tuple_, insert, func, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
-from src.database.models import Note, Tag, User
-from src.schemas import NoteModel, NoteUpdate, NoteStatusUpdate
+from src.database.models import Note, Tag, User, note_m2m_tag
+from src.schemas import NoteModel, NoteUpdate, NoteStatusUpdate, NoteTagsAssignment
 
+# Згенерований стовпець notes.search_vector створюється міграцією 5c8d1e2f4a67
+# і навмисно не описаний у моделі, щоб не завантажувати його разом із нотатками.
+SEARCH_CONFIG = "simple"
+search_vector = literal_column("notes.search_vector", type_=TSVECTOR)
 
-async def get_notes(skip: int, limit: int, user: User, db: Session) -> List[Note]:
-    return (
-        db.query(Note).filter(Note.user_id == user.id).offset(skip).limit(limit).all()
+
+async def get_notes(skip: int, limit: int, user: User, db: AsyncSession) -> List[Note]:
+    stmt = (
+        select(Note).options(selectinload(Note.tags))
+        .filter(Note.user_id == user.id).offset(skip).limit(limit)
     )
+    notes = await db.execute(stmt)
+    return notes.scalars().all()
+
+
+async def get_notes_after(
+    after: Tuple[datetime, int] | None, limit: int, user: User, db: AsyncSession
+) -> List[Note]:
+    stmt = select(Note).options(selectinload(Note.tags)).filter(Note.user_id == user.id)
+    if after is not None:
+        stmt = stmt.filter(tuple_(Note.created_at, Note.id) < tuple_(*after))
+    stmt = stmt.order_by(Note.created_at.desc(), Note.id.desc()).limit(limit)
+    notes = await db.execute(stmt)
+    return notes.scalars().all()
 
 
-async def get_note(note_id: int, user: User, db: Session) -> Note:
-    return (
-        db.query(Note).filter(and_(Note.id == note_id, Note.user_id == user.id)).first()
+async def search_notes(
+    q: str,
+    tags: List[int],
+    done: bool | None,
+    after: Tuple[float, int] | None,
+    limit: int,
+    user: User,
+    db: AsyncSession,
+) -> List[Tuple[Note, float]]:
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    rank = func.ts_rank_cd(search_vector, query)
+    stmt = (
+        select(Note, rank.label("rank")).options(selectinload(Note.tags))
+        .filter(and_(Note.user_id == user.id, search_vector.op("@@")(query)))
     )
+    if done is not None:
+        stmt = stmt.filter(Note.done == done)
+    if tags:
+        tagged = (
+            select(note_m2m_tag.c.note_id)
+            .filter(note_m2m_tag.c.tag_id.in_(tags))
+            .group_by(note_m2m_tag.c.note_id)
+            .having(func.count(note_m2m_tag.c.tag_id.distinct()) == len(set(tags)))
+        )
+        stmt = stmt.filter(Note.id.in_(tagged))
+    if after is not None:
+        stmt = stmt.filter(tuple_(rank, Note.id) < tuple_(*after))
+    stmt = stmt.order_by(rank.desc(), Note.id.desc()).limit(limit)
+    notes = await db.execute(stmt)
+    return notes.all()
 
 
-async def create_note(body: NoteModel, user: User, db: Session) -> Note:
-    tags = (
-        db.query(Tag).filter(and_(Tag.id.in_(body.tags), Tag.user_id == user.id)).all()
+async def get_note(note_id: int, user: User, db: AsyncSession) -> Note:
+    stmt = (
+        select(Note).options(selectinload(Note.tags))
+        .filter(and_(Note.id == note_id, Note.user_id == user.id))
     )
-    note = Note(title=body.title, description=body.description, tags=tags, user=user)
+    note = await db.execute(stmt)
+    return note.scalar_one_or_none()
+
+
+async def create_note(body: NoteModel, user: User, db: AsyncSession) -> Note:
+    stmt = select(Tag).filter(and_(Tag.id.in_(body.tags), Tag.user_id == user.id))
+    tags = await db.execute(stmt)
+    note = Note(title=body.title, description=body.description, tags=tags.scalars().all(), user_id=user.id)
     db.add(note)
-    db.commit()
-    db.refresh(note)
+    await db.commit()
+    await db.refresh(note, attribute_names=["created_at"])
     return note
 
 
-async def remove_note(note_id: int, user: User, db: Session) -> Note | None:
-    note = (
-        db.query(Note).filter(and_(Note.id == note_id, Note.user_id == user.id)).first()
+async def _get_user_tags(tag_ids: set, user: User, db: AsyncSession) -> dict:
+    if not tag_ids:
+        return {}
+    stmt = select(Tag).filter(and_(Tag.id.in_(tag_ids), Tag.user_id == user.id))
+    tags = await db.execute(stmt)
+    return {tag.id: tag for tag in tags.scalars().all()}
+
+
+async def create_notes(bodies: List[NoteModel], user: User, db: AsyncSession) -> List[dict]:
+    tags = await _get_user_tags({tag_id for body in bodies for tag_id in body.tags}, user, db)
+
+    results = []
+    valid = []
+    for body in bodies:
+        missing = sorted(set(body.tags) - tags.keys())
+        if missing:
+            results.append({"note": None, "error": f"Tags not found: {missing}"})
+        else:
+            results.append({"note": None, "error": None})
+            valid.append(body)
+
+    if valid:
+        stmt = insert(Note).returning(Note, sort_by_parameter_order=True)
+        notes = await db.scalars(stmt, [
+            {"title": body.title, "description": body.description, "done": bool(body.done), "user_id": user.id}
+            for body in valid
+        ])
+        notes = notes.all()
+        links = [
+            {"note_id": note.id, "tag_id": tag_id}
+            for note, body in zip(notes, valid)
+            for tag_id in dict.fromkeys(body.tags)
+        ]
+        if links:
+            await db.execute(insert(note_m2m_tag), links)
+        await db.commit()
+
+        created = iter(zip(notes, valid))
+        for result in results:
+            if result["error"] is None:
+                note, body = next(created)
+                set_committed_value(note, "tags", [tags[tag_id] for tag_id in dict.fromkeys(body.tags)])
+                result["note"] = note
+    return results
+
+
+async def assign_tags(assignments: List[NoteTagsAssignment], user: User, db: AsyncSession) -> List[dict]:
+    note_ids = {item.note_id for item in assignments}
+    stmt = (
+        select(Note).options(selectinload(Note.tags))
+        .filter(and_(Note.id.in_(note_ids), Note.user_id == user.id))
     )
+    notes = await db.execute(stmt)
+    notes = {note.id: note for note in notes.scalars().all()}
+    tags = await _get_user_tags({tag_id for item in assignments for tag_id in item.tags}, user, db)
+
+    results = []
+    links = []
+    for item in assignments:
+        note = notes.get(item.note_id)
+        missing = sorted(set(item.tags) - tags.keys())
+        if note is None:
+            results.append({"note": None, "error": "Note not found"})
+            continue
+        if missing:
+            results.append({"note": None, "error": f"Tags not found: {missing}"})
+            continue
+        current = {tag.id for tag in note.tags}
+        new_tags = [tags[tag_id] for tag_id in dict.fromkeys(item.tags) if tag_id not in current]
+        links.extend({"note_id": note.id, "tag_id": tag.id} for tag in new_tags)
+        set_committed_value(note, "tags", note.tags + new_tags)
+        results.append({"note": note, "error": None})
+
+    if links:
+        await db.execute(insert(note_m2m_tag), links)
+        await db.commit()
+    return results
+
+
+async def remove_note(note_id: int, user: User, db: AsyncSession) -> Note | None:
+    note = await get_note(note_id, user, db)
     if note:
-        db.delete(note)
-        db.commit()
+        await db.delete(note)
+        await db.commit()
     return note
 
 
 async def update_note(
-    note_id: int, body: NoteUpdate, user: User, db: Session
+    note_id: int, body: NoteUpdate, user: User, db: AsyncSession
 ) -> Note | None:
-    note = (
-        db.query(Note).filter(and_(Note.id == note_id, Note.user_id == user.id)).first()
-    )
+    note = await get_note(note_id, user, db)
     if note:
-        tags = (
-            db.query(Tag)
-            .filter(and_(Tag.id.in_(body.tags), Note.user_id == user.id))
-            .all()
-        )
+        stmt = select(Tag).filter(and_(Tag.id.in_(body.tags), Tag.user_id == user.id))
+        tags = await db.execute(stmt)
         note.title = body.title
         note.description = body.description
         note.done = body.done
-        note.tags = tags
-        db.commit()
+        note.tags = tags.scalars().all()
+        await db.commit()
     return note
 
 
 async def update_status_note(
-    note_id: int, body: NoteStatusUpdate, user: User, db: Session
+    note_id: int, body: NoteStatusUpdate, user: User, db: AsyncSession
 ) -> Note | None:
-    note = (
-        db.query(Note).filter(and_(Note.id == note_id, Note.user_id == user.id)).first()
-    )
+    note = await get_note(note_id, user, db)
     if note:
         note.done = body.done
-        db.commit()
-    return note
\ No newline at end of file
+        await db.commit()
+    return note
@@ -1,41 +1,56 @@
-from typing import List
+from typing import List, Tuple
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Tag, User
 from src.schemas import TagModel
 
 
-async def get_tags(skip: int, limit: int, user: User, db: Session) -> List[Tag]:
-    return db.query(Tag).filter(Tag.user_id == user.id).offset(skip).limit(limit).all()
+async def get_tags(skip: int, limit: int, user: User, db: AsyncSession) -> List[Tag]:
+    stmt = select(Tag).filter(Tag.user_id == user.id).offset(skip).limit(limit)
+    tags = await db.execute(stmt)
+    return tags.scalars().all()
 
 
-async def get_tag(tag_id: int, user: User, db: Session) -> Tag:
-    return db.query(Tag).filter(and_(Tag.id == tag_id, Tag.user_id == user.id)).first()
+async def get_tags_after(
+    after: Tuple[str, int] | None, limit: int, user: User, db: AsyncSession
+) -> List[Tag]:
+    stmt = select(Tag).filter(Tag.user_id == user.id)
+    if after is not None:
+        stmt = stmt.filter(tuple_(Tag.name, Tag.id) > tuple_(*after))
+    stmt = stmt.order_by(Tag.name, Tag.id).limit(limit)
+    tags = await db.execute(stmt)
+    return tags.scalars().all()
 
 
-async def create_tag(body: TagModel, user: User, db: Session) -> Tag:
+async def get_tag(tag_id: int, user: User, db: AsyncSession) -> Tag:
+    stmt = select(Tag).filter(and_(Tag.id == tag_id, Tag.user_id == user.id))
+    tag = await db.execute(stmt)
+    return tag.scalar_one_or_none()
+
+
+async def create_tag(body: TagModel, user: User, db: AsyncSession) -> Tag:
     tag = Tag(name=body.name, user_id=user.id)
     db.add(tag)
-    db.commit()
-    db.refresh(tag)
+    await db.commit()
+    await db.refresh(tag)
     return tag
 
 
 async def update_tag(
-    tag_id: int, body: TagModel, user: User, db: Session
+    tag_id: int, body: TagModel, user: User, db: AsyncSession
 ) -> Tag | None:
-    tag = db.query(Tag).filter(and_(Tag.id == tag_id, Tag.user_id == user.id)).first()
+    tag = await get_tag(tag_id, user, db)
     if tag:
         tag.name = body.name
-        db.commit()
+        await db.commit()
     return tag
 
 
-async def remove_tag(tag_id: int, user: User, db: Session) -> Tag | None:
-    tag = db.query(Tag).filter(and_(Tag.id == tag_id, Tag.user_id == user.id)).first()
+async def remove_tag(tag_id: int, user: User, db: AsyncSession) -> Tag | None:
+    tag = await get_tag(tag_id, user, db)
     if tag:
-        db.delete(tag)
-        db.commit()
-    return tag
\ No newline at end of file
+        await db.delete(tag)
+        await db.commit()
+    return tag
@@ -1,18 +1,20 @@
 from typing import List
-from fastapi import APIRouter, HTTPException, Depends, status, Security,BackgroundTasks, Request
+from fastapi import APIRouter, HTTPException, Depends, status, Security, Request, Header
 
 from fastapi.security import (
     OAuth2PasswordRequestForm,
     HTTPAuthorizationCredentials,
     HTTPBearer,
 )
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
+from src.database.models import User
 from src.schemas import UserModel, UserResponse, TokenModel
 from src.repository import users as repository_users
 from src.services.auth import auth_service
 from src.services.email import send_email
+from src.services.refresh_tokens import Rotation, refresh_token_store
 from src.schemas import UserModel, UserResponse, TokenModel, RequestEmail
 
 
@@ -21,50 +23,66 @@ security = HTTPBearer()
 
 
 @router.post("/signup", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def signup(body: UserModel, background_tasks: BackgroundTasks, request: Request, db: Session = Depends(get_db)):
+async def signup(body: UserModel, request: Request, db: AsyncSession = Depends(get_db)):
     exist_user = await repository_users.get_user_by_email(body.email, db)
     if exist_user:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Account already exists")
-    body.password = auth_service.get_password_hash(body.password)
+    body.password = await auth_service.get_password_hash(body.password)
     new_user = await repository_users.create_user(body, db)
-    background_tasks.add_task(send_email, new_user.email, new_user.username, request.base_url)
+    await send_email(new_user.email, new_user.username, request.base_url)
     return {"user": new_user, "detail": "User successfully created. Check your email for confirmation."}
 
 
 
 @router.post("/login", response_model=TokenModel)
-async def login(body: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(body: OAuth2PasswordRequestForm = Depends(), device: str = Header("default", alias="X-Device-Id"),
+                db: AsyncSession = Depends(get_db)):
     user = await repository_users.get_user_by_email(body.username, db)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email")
     if not user.confirmed:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email not confirmed")
-    if not auth_service.verify_password(body.password, user.password):
+    valid, new_hash = await auth_service.verify_and_update_password(body.password, user.password)
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid password")
+    if new_hash:
+        await repository_users.update_password(user, new_hash, db)
     # Generate JWT
     access_token = await auth_service.create_access_token(data={"sub": user.email})
-    refresh_token = await auth_service.create_refresh_token(data={"sub": user.email})
-    await repository_users.update_token(user, refresh_token, db)
+    family, jti = await refresh_token_store.start(user.email, device)
+    refresh_token = await auth_service.create_refresh_token(data={"sub": user.email, "fid": family, "jti": jti},
+                                                            expires_delta=refresh_token_store.ttl)
     return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer"}
 
 
 @router.get("/refresh_token", response_model=TokenModel)
-async def refresh_token(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-    db: Session = Depends(get_db),
-):
-    token = credentials.credentials
-    email = await auth_service.decode_refresh_token(token)
-    user = await repository_users.get_user_by_email(email, db)
-    if user.refresh_token != token:
-        await repository_users.update_token(user, None, db)
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
-        )
-
-    access_token = await auth_service.create_access_token(data={"email": email})
-    refresh_token = await auth_service.create_refresh_token(data={"email": email})
-    await repository_users.update_token(user, refresh_token, db)
+async def refresh_token(credentials: HTTPAuthorizationCredentials = Security(security)):
+    """
+    Ротація токену оновлення без звернень до бази даних.
+
+    Кожен токен можна використати один раз; повторне використання вже заміненого
+    токена відкликає сесію пристрою.
+
+    :param credentials: Токен оновлення в заголовку Authorization.
+    :type credentials: HTTPAuthorizationCredentials
+    :return: Нові токени доступу та оновлення.
+    :rtype: dict
+    """
+    payload = await auth_service.decode_refresh_payload(credentials.credentials)
+    email, family, jti = payload["sub"], payload.get("fid"), payload.get("jti")
+    if family is None or jti is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    rotation, new_jti = await refresh_token_store.rotate(email, family, jti)
+    if rotation is Rotation.REUSED:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                            detail="Refresh token reuse detected, session revoked")
+    if rotation is not Rotation.ROTATED:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
+
+    access_token = await auth_service.create_access_token(data={"sub": email})
+    refresh_token = await auth_service.create_refresh_token(data={"sub": email, "fid": family, "jti": new_jti},
+                                                            expires_delta=refresh_token_store.ttl)
     return {
         "access_token": access_token,
         "refresh_token": refresh_token,
@@ -72,8 +90,46 @@ async def refresh_token(
     }
 
 
+@router.get("/sessions")
+async def list_sessions(current_user: User = Depends(auth_service.get_current_user)):
+    """
+    Активні сесії поточного користувача за пристроями.
+
+    :param current_user: Поточний користувач.
+    :type current_user: User
+    :return: Пристрій, час входу та останнього оновлення токена.
+    :rtype: list[dict]
+    """
+    return await refresh_token_store.sessions(current_user.email)
+
+
+@router.delete("/sessions/{device}", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_session(device: str, current_user: User = Depends(auth_service.get_current_user)):
+    """
+    Вихід з одного пристрою: його токен оновлення більше не приймається.
+
+    :param device: Ідентифікатор пристрою (заголовок X-Device-Id при вході).
+    :type device: str
+    :param current_user: Поточний користувач.
+    :type current_user: User
+    """
+    if not await refresh_token_store.revoke(current_user.email, device):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+
+
+@router.delete("/sessions", status_code=status.HTTP_204_NO_CONTENT)
+async def revoke_all_sessions(current_user: User = Depends(auth_service.get_current_user)):
+    """
+    Вихід з усіх пристроїв.
+
+    :param current_user: Поточний користувач.
+    :type current_user: User
+    """
+    await refresh_token_store.revoke_all(current_user.email)
+
+
 @router.get('/confirmed_email/{token}')
-async def confirmed_email(token: str, db: Session = Depends(get_db)):
+async def confirmed_email(token: str, db: AsyncSession = Depends(get_db)):
     email = await auth_service.get_email_from_token(token)
     user = await repository_users.get_user_by_email(email, db)
     if user is None:
@@ -85,12 +141,12 @@ async def confirmed_email(token: str, db: Session = Depends(get_db)):
 
 
 @router.post('/request_email')
-async def request_email(body: RequestEmail, background_tasks: BackgroundTasks, request: Request,
-                        db: Session = Depends(get_db)):
+async def request_email(body: RequestEmail, request: Request,
+                        db: AsyncSession = Depends(get_db)):
     user = await repository_users.get_user_by_email(body.email, db)
 
     if user.confirmed:
         return {"message": "Your email is already confirmed"}
     if user:
-        background_tasks.add_task(send_email, user.email, user.username, request.base_url)
+        await send_email(user.email, user.username, request.base_url)
     return {"message": "Check your email for confirmation."}
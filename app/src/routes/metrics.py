@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends
+
+from src.database.db import sessionmanager
+from src.database.models import Role
+from src.services.email_queue import email_queue
+from src.services.roles import RoleAccess
+
+# внутрішній стан сервісу бачать лише адміністратори
+router = APIRouter(prefix="/metrics", tags=["metrics"], dependencies=[Depends(RoleAccess([Role.admin]))])
+
+
+@router.get("/db")
+async def db_metrics():
+    """
+    Метрики пулу з'єднань з базою даних.
+
+    :return: Час очікування checkout, кількість зайнятих з'єднань та насиченість пулу.
+    :rtype: dict
+    """
+    return sessionmanager.metrics()
+
+
+@router.get("/email")
+async def email_metrics():
+    """
+    Метрики черги вихідних листів.
+
+    :return: Кількість листів у черзі, в обробці, відкладених до повтору та мертвих.
+    :rtype: dict
+    """
+    return await email_queue.depth()
@@ -1,33 +1,63 @@
-from typing import List
+from datetime import datetime
+from typing import List, Union
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, status, Query, Body
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.database.models import User
-from src.schemas import NoteModel, NoteUpdate, NoteStatusUpdate, NoteResponse
+from src.schemas import NoteModel, NoteUpdate, NoteStatusUpdate, NoteResponse, NotePage, NoteTagsAssignment, \
+    BulkNoteResult
 from src.repository import notes as repository_notes
 from src.services.auth import auth_service
-from fastapi_limiter.depends import RateLimiter
+from src.services.pagination import encode_cursor, decode_cursor
     
 router = APIRouter(prefix="/notes", tags=["notes"])
 
 
-@router.get("/", response_model=List[NoteResponse])
+@router.get("/", response_model=Union[NotePage, List[NoteResponse]])
 async def read_notes(
     skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="Keyset pagination: empty for the first page, "
+                                                 "then next_cursor from the previous response"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
-    notes = await repository_notes.get_notes(skip, limit, current_user, db)
-    return notes
+    if cursor is None:
+        notes = await repository_notes.get_notes(skip, limit, current_user, db)
+        return notes
+    after = decode_cursor(cursor, datetime, int)
+    notes = await repository_notes.get_notes_after(after, limit, current_user, db)
+    next_cursor = None
+    if len(notes) == limit:
+        next_cursor = encode_cursor(notes[-1].created_at, notes[-1].id)
+    return {"items": notes, "next_cursor": next_cursor}
+
+
+@router.get("/search", response_model=NotePage)
+async def search_notes(
+    q: str = Query(..., min_length=1, max_length=200),
+    tags: List[int] = Query([], description="Only notes that have all of these tags"),
+    done: bool | None = None,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: str = "",
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    after = decode_cursor(cursor, float, int)
+    rows = await repository_notes.search_notes(q, tags, done, after, limit, current_user, db)
+    next_cursor = None
+    if len(rows) == limit:
+        note, rank = rows[-1]
+        next_cursor = encode_cursor(rank, note.id)
+    return {"items": [note for note, _ in rows], "next_cursor": next_cursor}
 
 
 @router.get("/{note_id}", response_model=NoteResponse)
 async def read_note(
     note_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
     note = await repository_notes.get_note(note_id, current_user, db)
@@ -41,17 +71,35 @@ async def read_note(
 @router.post("/", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
 async def create_note(
     body: NoteModel,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
     return await repository_notes.create_note(body, current_user, db)
 
 
+@router.post("/bulk", response_model=List[BulkNoteResult], status_code=status.HTTP_201_CREATED)
+async def create_notes(
+    body: List[NoteModel] = Body(..., max_length=1000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    return await repository_notes.create_notes(body, current_user, db)
+
+
+@router.post("/bulk-tags", response_model=List[BulkNoteResult])
+async def assign_tags(
+    body: List[NoteTagsAssignment] = Body(..., max_length=1000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(auth_service.get_current_user),
+):
+    return await repository_notes.assign_tags(body, current_user, db)
+
+
 @router.put("/{note_id}", response_model=NoteResponse)
 async def update_note(
     body: NoteUpdate,
     note_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
     note = await repository_notes.update_note(note_id, body, current_user, db)
@@ -66,7 +114,7 @@ async def update_note(
 async def update_status_note(
     body: NoteStatusUpdate,
     note_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
     note = await repository_notes.update_status_note(note_id, body, current_user, db)
@@ -80,7 +128,7 @@ async def update_status_note(
 @router.delete("/{note_id}", response_model=NoteResponse)
 async def remove_note(
     note_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
     note = await repository_notes.remove_note(note_id, current_user, db)
@@ -89,11 +137,3 @@ async def remove_note(
             status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
         )
     return note
-
-
-@router.get("/", response_model=List[NoteResponse], description='No more than 10 requests per minute',
-            dependencies=[Depends(RateLimiter(times=10, seconds=60))])
-async def read_notes(skip: int = 0, limit: int = 100, db: Session = Depends(get_db),
-                     current_user: User = Depends(auth_service.get_current_user)):
-    notes = await repository_notes.get_notes(skip, limit, current_user, db)
-    return notes
\ No newline at end of file
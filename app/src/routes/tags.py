@@ -1,90 +1,85 @@
-from typing import List
+from typing import List, Union
 
-from fastapi import APIRouter, HTTPException, Depends, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Depends, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.database.models import User
-from src.schemas import NoteModel, NoteUpdate, NoteStatusUpdate, NoteResponse
-from src.repository import notes as repository_notes
+from src.schemas import TagModel, TagResponse, TagPage
+from src.repository import tags as repository_tags
 from src.services.auth import auth_service
+from src.services.pagination import encode_cursor, decode_cursor
 
-router = APIRouter(prefix="/notes", tags=["notes"])
+router = APIRouter(prefix="/tags", tags=["tags"])
 
 
-@router.get("/", response_model=List[NoteResponse])
-async def read_notes(
+@router.get("/", response_model=Union[TagPage, List[TagResponse]])
+async def read_tags(
     skip: int = 0,
-    limit: int = 100,
-    db: Session = Depends(get_db),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="Keyset pagination: empty for the first page, "
+                                                 "then next_cursor from the previous response"),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
-    notes = await repository_notes.get_notes(skip, limit, current_user, db)
-    return notes
+    if cursor is None:
+        tags = await repository_tags.get_tags(skip, limit, current_user, db)
+        return tags
+    after = decode_cursor(cursor, str, int)
+    tags = await repository_tags.get_tags_after(after, limit, current_user, db)
+    next_cursor = None
+    if len(tags) == limit:
+        next_cursor = encode_cursor(tags[-1].name, tags[-1].id)
+    return {"items": tags, "next_cursor": next_cursor}
 
 
-@router.get("/{note_id}", response_model=NoteResponse)
-async def read_note(
-    note_id: int,
-    db: Session = Depends(get_db),
+@router.get("/{tag_id}", response_model=TagResponse)
+async def read_tag(
+    tag_id: int,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
-    note = await repository_notes.get_note(note_id, current_user, db)
-    if note is None:
+    tag = await repository_tags.get_tag(tag_id, current_user, db)
+    if tag is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tag not found"
         )
-    return note
+    return tag
 
 
-@router.post("/", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
-async def create_note(
-    body: NoteModel,
-    db: Session = Depends(get_db),
+@router.post("/", response_model=TagResponse, status_code=status.HTTP_201_CREATED)
+async def create_tag(
+    body: TagModel,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
-    return await repository_notes.create_note(body, current_user, db)
+    return await repository_tags.create_tag(body, current_user, db)
 
 
-@router.put("/{note_id}", response_model=NoteResponse)
-async def update_note(
-    body: NoteUpdate,
-    note_id: int,
-    db: Session = Depends(get_db),
+@router.put("/{tag_id}", response_model=TagResponse)
+async def update_tag(
+    body: TagModel,
+    tag_id: int,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
-    note = await repository_notes.update_note(note_id, body, current_user, db)
-    if note is None:
+    tag = await repository_tags.update_tag(tag_id, body, current_user, db)
+    if tag is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tag not found"
         )
-    return note
+    return tag
 
 
-@router.patch("/{note_id}", response_model=NoteResponse)
-async def update_status_note(
-    body: NoteStatusUpdate,
-    note_id: int,
-    db: Session = Depends(get_db),
+@router.delete("/{tag_id}", response_model=TagResponse)
+async def remove_tag(
+    tag_id: int,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(auth_service.get_current_user),
 ):
-    note = await repository_notes.update_status_note(note_id, body, current_user, db)
-    if note is None:
+    tag = await repository_tags.remove_tag(tag_id, current_user, db)
+    if tag is None:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
+            status_code=status.HTTP_404_NOT_FOUND, detail="Tag not found"
         )
-    return note
-
-
-@router.delete("/{note_id}", response_model=NoteResponse)
-async def remove_note(
-    note_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(auth_service.get_current_user),
-):
-    note = await repository_notes.remove_note(note_id, current_user, db)
-    if note is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
-        )
-    return note
\ No newline at end of file
+    return tag
@@ -14,6 +14,11 @@ class TagResponse(TagModel):
         orm_mode = True
 
 
+class TagPage(BaseModel):
+    items: List[TagResponse]
+    next_cursor: Optional[str] = None
+
+
 class NoteBase(BaseModel):
     title: str = Field(max_length=50)
     description: str = Field(max_length=150)
@@ -41,6 +46,21 @@ class NoteResponse(NoteBase):
         orm_mode = True
 
 
+class NoteTagsAssignment(BaseModel):
+    note_id: int
+    tags: List[int]
+
+
+class BulkNoteResult(BaseModel):
+    note: Optional[NoteResponse] = None
+    error: Optional[str] = None
+
+
+class NotePage(BaseModel):
+    items: List[NoteResponse]
+    next_cursor: Optional[str] = None
+
+
 class UserModel(BaseModel):
     username: str = Field(min_length=5, max_length=16)
     email: str
@@ -1,23 +1,29 @@
 from typing import Optional
 
-from jose import JWTError, jwt
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
-from passlib.context import CryptContext
 from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.db import get_db
 from src.repository import users as repository_users
+from src.services.cache import user_cache
+from src.services.passwords import PasswordHasher
+from src.services.tokens import InvalidToken, TokenCodec, read_key
 from src.conf.config import settings
 
 
 
 class Auth:
      
-    pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    password_hasher = PasswordHasher(rounds=settings.bcrypt_rounds,
+                                     concurrency=settings.password_hash_concurrency,
+                                     pool=settings.password_hash_pool)
     SECRET_KEY = settings.secret_key
     ALGORITHM = settings.algorithm
+    tokens = TokenCodec(ALGORITHM, secret_key=SECRET_KEY, private_key=read_key(settings.jwt_private_key),
+                        public_key=read_key(settings.jwt_public_key), backend=settings.jwt_backend,
+                        cache_size=settings.jwt_cache_size, cache_ttl=settings.jwt_cache_ttl)
     oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
     """
     Клас для автентифікації та генерації токенів.
@@ -25,8 +31,9 @@ class Auth:
     Використовується для перевірки паролів, створення та перевірки JWT токенів.
     """
 
-    def verify_password(self, plain_password, hashed_password):
-        return self.pwd_context.verify(plain_password, hashed_password)
+    async def verify_password(self, plain_password, hashed_password):
+        valid, _ = await self.password_hasher.verify_and_update(plain_password, hashed_password)
+        return valid
         """
         Перевірка пароля.
 
@@ -38,8 +45,21 @@ class Auth:
         :rtype: bool
         """
 
-    def get_password_hash(self, password: str):
-        return self.pwd_context.hash(password)
+    async def verify_and_update_password(self, plain_password: str, hashed_password: str):
+        """
+        Перевірка пароля з повторним хешуванням, якщо змінилася налаштована вартість bcrypt.
+
+        :param plain_password: Пароль від користувача.
+        :type plain_password: str
+        :param hashed_password: Хеш пароля.
+        :type hashed_password: str
+        :return: (True, новий хеш або None), якщо пароль співпадає, інакше (False, None).
+        :rtype: tuple[bool, str | None]
+        """
+        return await self.password_hasher.verify_and_update(plain_password, hashed_password)
+
+    async def get_password_hash(self, password: str):
+        return await self.password_hasher.hash(password)
         """
         Отримання хешу пароля.
 
@@ -57,7 +77,7 @@ class Auth:
         else:
             expire = datetime.utcnow() + timedelta(minutes=150)
         to_encode.update({"iat": datetime.utcnow(), "exp": expire, "scope": "access_token"})
-        encoded_access_token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        encoded_access_token = self.tokens.encode(to_encode)
         return encoded_access_token
         """
         Створення токену доступу.
@@ -77,7 +97,7 @@ class Auth:
         else:
             expire = datetime.utcnow() + timedelta(days=7)
         to_encode.update({"iat": datetime.utcnow(), "exp": expire, "scope": "refresh_token"})
-        encoded_refresh_token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        encoded_refresh_token = self.tokens.encode(to_encode)
         return encoded_refresh_token
         """
         Створення токену доступу.
@@ -90,16 +110,26 @@ class Auth:
         :rtype: str
         """
 
-    async def decode_refresh_token(self, refresh_token: str):
-        
+    async def decode_refresh_payload(self, refresh_token: str) -> dict:
+        """
+        Перевірка токену оновлення.
+
+        :param refresh_token: Токен оновлення.
+        :type refresh_token: str
+        :return: Дані токену: email (sub), сім'я (fid) та ідентифікатор (jti).
+        :rtype: dict
+        """
         try:
-            payload = jwt.decode(refresh_token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            if payload['scope'] == 'refresh_token':
-                email = payload['sub']
-                return email
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid scope for token')
-        except JWTError:
+            payload = self.tokens.decode(refresh_token)
+        except InvalidToken:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Could not validate credentials')
+        if payload.get('scope') != 'refresh_token':
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail='Invalid scope for token')
+        return payload
+
+    async def decode_refresh_token(self, refresh_token: str):
+        payload = await self.decode_refresh_payload(refresh_token)
+        return payload['sub']
         """
         Розкодування токену оновлення.
 
@@ -108,7 +138,8 @@ class Auth:
         :return: Email з токену оновлення.
         :rtype: str
         """
-    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+
+    async def get_current_user(self, token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)):
         credentials_exception = HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not validate credentials",
@@ -116,20 +147,23 @@ class Auth:
         )
 
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self.tokens.decode(token)
             if payload['scope'] == 'access_token':
                 email = payload["sub"]
                 if email is None:
                     raise credentials_exception
             else:
                 raise credentials_exception
-        except JWTError as e:
+        except InvalidToken as e:
             raise credentials_exception
         
 
-        user = await repository_users.get_user_by_email(email, db)
+        user = await user_cache.get(email)
         if user is None:
-            raise credentials_exception
+            user = await repository_users.get_user_by_email(email, db)
+            if user is None:
+                raise credentials_exception
+            await user_cache.set(user)
         return user
         """
         Отримання поточного користувача на основі токену.
@@ -137,7 +171,7 @@ class Auth:
         :param token: Токен доступу.
         :type token: str
         :param db: Сесія бази даних.
-        :type db: Session
+        :type db: AsyncSession
         :return: Об'єкт користувача.
         :rtype: User
         """
@@ -146,7 +180,7 @@ class Auth:
         to_encode = data.copy()
         expire = datetime.utcnow() + timedelta(days=7)
         to_encode.update({"iat": datetime.utcnow(), "exp": expire})
-        token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
+        token = self.tokens.encode(to_encode)
         return token
         """
         Створення токену для підтвердження електронної пошти.
@@ -159,10 +193,10 @@ class Auth:
 
     async def get_email_from_token(self, token: str):
         try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            payload = self.tokens.decode(token)
             email = payload["sub"]
             return email
-        except JWTError as e:
+        except InvalidToken as e:
             print(e)
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
                                 detail="Invalid token for email verification")
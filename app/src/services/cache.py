@@ -0,0 +1,141 @@
+import json
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from src.database.models import Role, User
+
+logger = logging.getLogger(__name__)
+
+# лише те, що потрібно шляху автентифікації; хеш пароля та refresh-токен у кеш не потрапляють
+CACHED_FIELDS = ("id", "username", "email", "avatar", "confirmed", "created_at", "role")
+
+
+def _dump(user: User) -> dict:
+    data = {field: getattr(user, field) for field in CACHED_FIELDS}
+    if isinstance(data["created_at"], datetime):
+        data["created_at"] = data["created_at"].isoformat()
+    if isinstance(data["role"], Role):
+        data["role"] = data["role"].value
+    return data
+
+
+def _load(data: dict) -> User:
+    data = dict(data)
+    if data.get("created_at"):
+        data["created_at"] = datetime.fromisoformat(data["created_at"])
+    if data.get("role"):
+        data["role"] = Role(data["role"])
+    return User(**data)
+
+
+class UserCache:
+    """
+    Кеш користувачів за email (суб'єктом токена).
+
+    Перший рівень - LRU у пам'яті процесу з коротким TTL, другий - Redis,
+    спільний для всіх воркерів. Без Redis працює лише локальний рівень.
+    Обидва рівні зберігають JSON з полями CACHED_FIELDS, і кожне читання
+    повертає новий від'єднаний об'єкт User.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: int = 900, local_ttl: int = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.local_ttl = local_ttl
+        self._local: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._redis: Redis | None = None
+
+    def init(self, redis: Redis | None, maxsize: int | None = None, ttl: int | None = None,
+             local_ttl: int | None = None):
+        """
+        Підключення Redis та налаштування розмірів кешу під час старту застосунку.
+
+        :param redis: Клієнт Redis без decode_responses.
+        :type redis: Redis | None
+        """
+        self._redis = redis
+        if maxsize is not None:
+            self.maxsize = maxsize
+        if ttl is not None:
+            self.ttl = ttl
+        if local_ttl is not None:
+            self.local_ttl = local_ttl
+        self._local.clear()
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return f"user:{email}"
+
+    def _remember(self, email: str, data: dict):
+        self._local[email] = (time.monotonic() + self.local_ttl, data)
+        self._local.move_to_end(email)
+        while len(self._local) > self.maxsize:
+            self._local.popitem(last=False)
+
+    async def get(self, email: str) -> User | None:
+        """
+        Пошук користувача спочатку в пам'яті процесу, потім у Redis.
+
+        :param email: Email користувача.
+        :type email: str
+        :return: Новий від'єднаний від сесії об'єкт користувача або None.
+        :rtype: User | None
+        """
+        entry = self._local.get(email)
+        if entry is not None:
+            expires, data = entry
+            if expires > time.monotonic():
+                self._local.move_to_end(email)
+                return _load(data)
+            del self._local[email]
+
+        if self._redis is None:
+            return None
+        try:
+            raw = await self._redis.get(self._key(email))
+        except RedisError as err:
+            logger.warning("user cache get failed: %s", err)
+            return None
+        if raw is None:
+            return None
+        try:
+            data = json.loads(raw)
+            user = _load(data)
+        except (ValueError, TypeError) as err:
+            logger.warning("invalid user cache entry for %s: %s", email, err)
+            return None
+        self._remember(email, data)
+        return user
+
+    async def set(self, user: User):
+        data = _dump(user)
+        self._remember(user.email, data)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.set(self._key(user.email), json.dumps(data), ex=self.ttl)
+        except RedisError as err:
+            logger.warning("user cache set failed: %s", err)
+
+    async def invalidate(self, email: str):
+        """
+        Видалення користувача з обох рівнів кешу.
+
+        :param email: Email користувача.
+        :type email: str
+        """
+        self._local.pop(email, None)
+        if self._redis is None:
+            return
+        try:
+            await self._redis.delete(self._key(email))
+        except RedisError as err:
+            logger.warning("user cache invalidate failed: %s", err)
+
+
+user_cache = UserCache()
@@ -1,56 +1,42 @@
-from pathlib import Path
+import logging
 
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
-from fastapi_mail.errors import ConnectionErrors
+from fastapi import HTTPException, status
 from pydantic import EmailStr
-from src.conf.config import settings
+from redis.exceptions import RedisError
 
 from src.services.auth import auth_service
+from src.services.email_queue import email_queue
 
-conf = ConnectionConfig(
-    MAIL_USERNAME="example@meta.ua",
-    MAIL_PASSWORD="secretPassword",
-    MAIL_FROM=EmailStr("example@meta.ua"),
-    MAIL_PORT=465,
-    MAIL_SERVER="smtp.meta.ua",
-    MAIL_FROM_NAME="Desired Name",
-    MAIL_STARTTLS=False,
-    MAIL_SSL_TLS=True,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True,
-    TEMPLATE_FOLDER=Path(__file__).parent / 'templates',
-)
+logger = logging.getLogger(__name__)
+
+CONFIRMATION_TEMPLATE = "email_template.html"
+
+
+def confirmation_context(email: EmailStr, username: str, host: str) -> dict:
+    return {"host": str(host), "username": username, "token": auth_service.create_email_token({"sub": email})}
 
 
 async def send_email(email: EmailStr, username: str, host: str):
+    """
+    Постановка листа підтвердження email у чергу; відправляє його окремий воркер
+    (python -m src.services.email_worker).
+
+    :param email: Email користувача.
+    :type email: EmailStr
+    :param username: Ім'я користувача.
+    :type username: str
+    :param host: Базова адреса застосунку для посилання підтвердження.
+    :type host: str
+    :raises HTTPException: 503, якщо черга недоступна і лист не поставлено.
+    """
     try:
-        token_verification = auth_service.create_email_token({"sub": email})
-        message = MessageSchema(
+        await email_queue.enqueue(
             subject="Confirm your email ",
             recipients=[email],
-            template_body={"host": host, "username": username, "token": token_verification},
-            subtype=MessageType.html
+            template=CONFIRMATION_TEMPLATE,
+            body=confirmation_context(email, username, host),
         )
-
-        fm = FastMail(conf)
-        await fm.send_message(message, template_name="email_template.html")
-    except ConnectionErrors as err:
-        print(err)
-
-
-
-
-
-conf = ConnectionConfig(
-    MAIL_USERNAME=settings.mail_username,
-    MAIL_PASSWORD=settings.mail_password,
-    MAIL_FROM=EmailStr(settings.mail_from),
-    MAIL_PORT=settings.mail_port,
-    MAIL_SERVER=settings.mail_server,
-    MAIL_FROM_NAME="Desired Name",
-    MAIL_STARTTLS=False,
-    MAIL_SSL_TLS=True,
-    USE_CREDENTIALS=True,
-    VALIDATE_CERTS=True,
-    TEMPLATE_FOLDER=Path(__file__).parent / 'templates',
-)
\ No newline at end of file
+    except RedisError as err:
+        logger.error("failed to enqueue confirmation email for %s: %s", email, err)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                            detail="Email service is temporarily unavailable, request the email again later")
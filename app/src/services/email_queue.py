@@ -0,0 +1,175 @@
+import json
+import time
+import uuid
+
+from redis.asyncio import Redis
+
+
+class EmailQueue:
+    """
+    Черга вихідних листів у Redis.
+
+    Нові листи потрапляють у список queue, воркер атомарно переносить їх у свій
+    список processing і видаляє звідти лише після відправки. Невдалі спроби
+    чекають у відсортованій множині delayed до часу повтору, а листи, що вичерпали
+    спроби, складаються в dead для ручного розбору.
+    """
+
+    def __init__(self, prefix: str = "email"):
+        self.prefix = prefix
+        self.queue_key = f"{prefix}:queue"
+        self.delayed_key = f"{prefix}:delayed"
+        self.dead_key = f"{prefix}:dead"
+        self._redis: Redis | None = None
+
+    def init(self, redis: Redis | None):
+        """
+        Підключення Redis під час старту застосунку або воркера.
+
+        :param redis: Клієнт Redis з decode_responses=True.
+        :type redis: Redis | None
+        """
+        self._redis = redis
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            raise RuntimeError("EmailQueue is not initialized")
+        return self._redis
+
+    def processing_key(self, worker: str) -> str:
+        return f"{self.prefix}:processing:{worker}"
+
+    async def enqueue(self, subject: str, recipients: list[str], template: str, body: dict) -> str:
+        """
+        Додавання листа в чергу.
+
+        :param subject: Тема листа.
+        :type subject: str
+        :param recipients: Адреси отримувачів.
+        :type recipients: list[str]
+        :param template: Назва шаблону в src/services/templates.
+        :type template: str
+        :param body: Контекст шаблону.
+        :type body: dict
+        :return: Ідентифікатор завдання.
+        :rtype: str
+        """
+        job = {
+            "id": uuid.uuid4().hex,
+            "subject": subject,
+            "recipients": [str(recipient) for recipient in recipients],
+            "template": template,
+            "body": body,
+            "attempts": 0,
+            "enqueued_at": time.time(),
+        }
+        await self.redis.lpush(self.queue_key, json.dumps(job))
+        return job["id"]
+
+    async def reserve(self, worker: str, count: int, timeout: float = 0) -> list[tuple[str, dict]]:
+        """
+        Забирання до count листів у список processing воркера.
+
+        Перший лист очікується не довше timeout секунд, решта партії береться
+        одним конвеєром без очікування.
+
+        :return: Пари (сирий запис, розібране завдання).
+        :rtype: list[tuple[str, dict]]
+        """
+        processing = self.processing_key(worker)
+        if timeout:
+            first = await self.redis.blmove(self.queue_key, processing, timeout, "RIGHT", "LEFT")
+        else:
+            first = await self.redis.lmove(self.queue_key, processing, "RIGHT", "LEFT")
+        if first is None:
+            return []
+        raws = [first]
+        if count > 1:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for _ in range(count - 1):
+                    pipe.lmove(self.queue_key, processing, "RIGHT", "LEFT")
+                raws.extend(raw for raw in await pipe.execute() if raw is not None)
+        return [(raw, json.loads(raw)) for raw in raws]
+
+    async def ack(self, worker: str, raw: str):
+        await self.redis.lrem(self.processing_key(worker), 1, raw)
+
+    async def retry(self, worker: str, raw: str, job: dict, error: str, delay: float):
+        """
+        Відкладення листа до наступної спроби через delay секунд.
+        """
+        job = {**job, "attempts": job["attempts"] + 1, "error": error}
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.processing_key(worker), 1, raw)
+            pipe.zadd(self.delayed_key, {json.dumps(job): time.time() + delay})
+            await pipe.execute()
+
+    async def dead_letter(self, worker: str, raw: str, job: dict, error: str):
+        job = {**job, "attempts": job["attempts"] + 1, "error": error, "failed_at": time.time()}
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.processing_key(worker), 1, raw)
+            pipe.lpush(self.dead_key, json.dumps(job))
+            await pipe.execute()
+
+    async def promote_due(self, now: float | None = None, limit: int = 1000) -> int:
+        """
+        Повернення в чергу відкладених листів, час повтору яких настав.
+
+        Лист переносить той воркер, чий ZREM його видалив, тож кілька воркерів
+        не продублюють один повтор.
+
+        :return: Кількість повернених листів.
+        :rtype: int
+        """
+        now = time.time() if now is None else now
+        due = await self.redis.zrangebyscore(self.delayed_key, "-inf", now, start=0, num=limit)
+        if not due:
+            return 0
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for raw in due:
+                pipe.zrem(self.delayed_key, raw)
+            removed = [raw for raw, ok in zip(due, await pipe.execute()) if ok]
+        if removed:
+            await self.redis.lpush(self.queue_key, *removed)
+        return len(removed)
+
+    async def recover(self, worker: str) -> int:
+        """
+        Повернення в чергу листів, які воркер забрав, але не встиг обробити до зупинки.
+
+        :return: Кількість повернених листів.
+        :rtype: int
+        """
+        processing = self.processing_key(worker)
+        count = 0
+        while await self.redis.lmove(processing, self.queue_key, "LEFT", "RIGHT") is not None:
+            count += 1
+        return count
+
+    async def depth(self) -> dict:
+        """
+        Розміри черги для метрик.
+
+        :return: Кількість листів у черзі, в обробці, відкладених і мертвих, а також вік найстарішого листа в черзі.
+        :rtype: dict
+        """
+        processing_keys = [key async for key in self.redis.scan_iter(match=self.processing_key("*"))]
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.llen(self.queue_key)
+            pipe.lindex(self.queue_key, -1)
+            pipe.zcard(self.delayed_key)
+            pipe.llen(self.dead_key)
+            for key in processing_keys:
+                pipe.llen(key)
+            queued, oldest, delayed, dead, *processing = await pipe.execute()
+        return {
+            "queued": queued,
+            "processing": sum(processing),
+            "delayed": delayed,
+            "dead": dead,
+            "oldest_queued_age": time.time() - json.loads(oldest)["enqueued_at"] if oldest else 0.0,
+        }
+
+
+email_queue = EmailQueue()
@@ -0,0 +1,242 @@
+"""
+Окремий процес, що відправляє листи з черги Redis:
+
+    python -m src.services.email_worker
+"""
+import asyncio
+import logging
+import signal
+from collections import defaultdict
+from email.message import EmailMessage
+from email.utils import formataddr
+
+import aiosmtplib
+import redis.asyncio as redis
+from jinja2 import Environment
+from redis.exceptions import RedisError
+
+from src.services.email_queue import EmailQueue, email_queue
+from src.services.rendering import precompile, render_many, template_env
+
+logger = logging.getLogger(__name__)
+
+
+class SMTPSender:
+    """
+    Відправка листів через одне постійне SMTP-з'єднання.
+
+    З'єднання відкривається при першій відправці й використовується для всіх
+    наступних партій; якщо сервер його закрив, воно відкривається знову.
+    """
+
+    def __init__(self, hostname: str, port: int, username: str | None = None, password: str | None = None,
+                 use_tls: bool = False, start_tls: bool | None = False, validate_certs: bool = True,
+                 timeout: float = 30):
+        self._smtp = aiosmtplib.SMTP(hostname=hostname, port=port, username=username, password=password,
+                                     use_tls=use_tls, start_tls=start_tls, validate_certs=validate_certs,
+                                     timeout=timeout)
+        self.connections = 0
+
+    async def _connect(self):
+        await self._smtp.connect()
+        self.connections += 1
+
+    async def _check_connection(self):
+        # простоюче з'єднання сервер міг закрити без повідомлення
+        if self._smtp.is_connected:
+            try:
+                await self._smtp.noop()
+            except aiosmtplib.SMTPException:
+                self._smtp.close()
+
+    async def send(self, messages: list[EmailMessage]) -> list[Exception | None]:
+        """
+        Відправка партії листів одним з'єднанням.
+
+        :param messages: Листи для відправки.
+        :type messages: list[EmailMessage]
+        :return: Для кожного листа None або помилка відправки.
+        :rtype: list[Exception | None]
+        """
+        await self._check_connection()
+        results = []
+        for message in messages:
+            try:
+                if not self._smtp.is_connected:
+                    await self._connect()
+                await self._smtp.send_message(message)
+                results.append(None)
+            except aiosmtplib.SMTPServerDisconnected as err:
+                self._smtp.close()
+                results.append(err)
+            except aiosmtplib.SMTPException as err:
+                results.append(err)
+        return results
+
+    async def close(self):
+        if self._smtp.is_connected:
+            try:
+                await self._smtp.quit()
+            except aiosmtplib.SMTPException:
+                self._smtp.close()
+
+
+def is_permanent(error: Exception) -> bool:
+    """
+    Відмови з кодом 5xx повторювати немає сенсу.
+    """
+    if isinstance(error, aiosmtplib.SMTPRecipientsRefused):
+        return all(500 <= recipient.code < 600 for recipient in error.recipients)
+    if isinstance(error, aiosmtplib.SMTPResponseException):
+        return 500 <= error.code < 600
+    return False
+
+
+class EmailWorker:
+    """
+    Цикл обробки черги: партія листів рендериться з шаблонів і відправляється через
+    SMTPSender. Тимчасові помилки повторюються з експоненційною затримкою, після
+    max_attempts спроб або постійної відмови лист переходить у dead.
+    """
+
+    def __init__(self, queue: EmailQueue, sender: SMTPSender, mail_from: str, from_name: str | None = None,
+                 name: str = "default", batch_size: int = 50, max_attempts: int = 5, backoff: float = 5.0,
+                 max_delay: float = 600.0, poll_timeout: float = 5.0, env: Environment = template_env):
+        self.queue = queue
+        self.sender = sender
+        self.mail_from = formataddr((from_name, mail_from)) if from_name else mail_from
+        self.name = name
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_delay = max_delay
+        self.poll_timeout = poll_timeout
+        self.env = env
+        self._stopping = asyncio.Event()
+
+    def build_message(self, job: dict, html: str) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = self.mail_from
+        message["To"] = ", ".join(job["recipients"])
+        message["Subject"] = job["subject"]
+        message.set_content(html, subtype="html")
+        return message
+
+    def render_batch(self, batch: list[tuple[str, dict]]) -> tuple[list, list]:
+        """
+        Рендер партії: завдання групуються за шаблоном, і кожна група рендериться
+        через render_many спільного оточення.
+
+        :return: Трійки (запис, завдання, лист) та (запис, завдання, помилка рендеру).
+        :rtype: tuple[list, list]
+        """
+        groups = defaultdict(list)
+        for raw, job in batch:
+            groups[job["template"]].append((raw, job))
+
+        rendered, failed = [], []
+        for name, jobs in groups.items():
+            try:
+                htmls = render_many(name, [job["body"] for _, job in jobs], self.env)
+            except Exception:
+                # шукаємо, який саме лист не рендериться, решта групи відправляється
+                htmls = []
+                for raw, job in jobs:
+                    try:
+                        htmls.append(render_many(name, [job["body"]], self.env)[0])
+                    except Exception as err:
+                        htmls.append(None)
+                        failed.append((raw, job, err))
+            rendered.extend(
+                (raw, job, self.build_message(job, html)) for (raw, job), html in zip(jobs, htmls) if html is not None
+            )
+        return rendered, failed
+
+    def retry_delay(self, attempts: int) -> float:
+        return min(self.backoff * 2 ** attempts, self.max_delay)
+
+    async def run_once(self, timeout: float = 0) -> int:
+        """
+        Обробка однієї партії.
+
+        :param timeout: Скільки секунд чекати на перший лист.
+        :type timeout: float
+        :return: Кількість оброблених листів.
+        :rtype: int
+        """
+        await self.queue.promote_due()
+        batch = await self.queue.reserve(self.name, self.batch_size, timeout)
+        if not batch:
+            return 0
+
+        rendered, failed = self.render_batch(batch)
+        for raw, job, err in failed:
+            await self.queue.dead_letter(self.name, raw, job, repr(err))
+
+        results = await self.sender.send([message for _, _, message in rendered])
+        for (raw, job, _), error in zip(rendered, results):
+            if error is None:
+                await self.queue.ack(self.name, raw)
+            elif is_permanent(error) or job["attempts"] + 1 >= self.max_attempts:
+                await self.queue.dead_letter(self.name, raw, job, str(error))
+            else:
+                await self.queue.retry(self.name, raw, job, str(error), self.retry_delay(job["attempts"]))
+        return len(batch)
+
+    async def run(self):
+        """
+        Обробка черги до виклику stop; незавершені листи попереднього запуску повертаються в чергу.
+
+        Поки Redis недоступний, спроби повторюються з тією ж експоненційною затримкою, що й листи.
+        """
+        recovered = False
+        failures = 0
+        try:
+            while not self._stopping.is_set():
+                try:
+                    if not recovered:
+                        await self.queue.recover(self.name)
+                        recovered = True
+                    await self.run_once(self.poll_timeout)
+                    failures = 0
+                except (RedisError, OSError) as err:
+                    delay = self.retry_delay(failures)
+                    failures += 1
+                    logger.warning("email queue unavailable, retrying in %.1f s: %s", delay, err)
+                    await self._sleep(delay)
+        finally:
+            await self.sender.close()
+
+    async def _sleep(self, delay: float):
+        # stop перериває очікування, щоб воркер не затримував завершення процесу
+        try:
+            await asyncio.wait_for(self._stopping.wait(), delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def stop(self):
+        self._stopping.set()
+
+
+async def main():
+    # налаштування потрібні лише процесу воркера, класи вище імпортуються й без .env
+    from src.conf.config import settings
+
+    email_queue.init(redis.Redis(host=settings.redis_host, port=settings.redis_port, db=0, decode_responses=True))
+    sender = SMTPSender(settings.mail_server, settings.mail_port, settings.mail_username, settings.mail_password,
+                        use_tls=settings.mail_ssl_tls, start_tls=settings.mail_starttls,
+                        validate_certs=settings.mail_validate_certs)
+    worker = EmailWorker(email_queue, sender, settings.mail_from, settings.mail_from_name,
+                         name=settings.email_worker_name, batch_size=settings.email_batch_size,
+                         max_attempts=settings.email_max_attempts, backoff=settings.email_retry_backoff,
+                         max_delay=settings.email_retry_max_delay, poll_timeout=settings.email_poll_timeout)
+    precompile()
+    logging.basicConfig(level=logging.INFO)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, status
+
+
+def encode_cursor(*values) -> str:
+    """
+    Кодування ключа останнього рядка сторінки у непрозорий курсор.
+
+    :param values: Значення ключа сортування, наприклад (created_at, id).
+    :return: Курсор у форматі base64url.
+    :rtype: str
+    """
+    raw = json.dumps([v.isoformat() if isinstance(v, datetime) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, *types) -> tuple | None:
+    """
+    Розкодування курсора, отриманого від клієнта.
+
+    :param cursor: Курсор; порожній рядок означає першу сторінку.
+    :type cursor: str
+    :param types: Очікувані типи значень ключа (datetime, int, str).
+    :return: Кортеж значень ключа або None для першої сторінки.
+    :rtype: tuple | None
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if len(values) != len(types):
+            raise ValueError(cursor)
+        return tuple(datetime.fromisoformat(v) if t is datetime else t(v) for v, t in zip(values, types))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
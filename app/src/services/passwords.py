@@ -0,0 +1,85 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+
+from passlib.context import CryptContext
+
+
+@lru_cache
+def _context(rounds: int) -> CryptContext:
+    # min_rounds == max_rounds: хеш з будь-якою іншою вартістю вважається застарілим
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__default_rounds=rounds,
+                        bcrypt__min_rounds=rounds, bcrypt__max_rounds=rounds)
+
+
+def _hash(password: str, rounds: int) -> str:
+    return _context(rounds).hash(password)
+
+
+def _verify_and_update(password: str, hashed_password: str, rounds: int) -> tuple[bool, str | None]:
+    return _context(rounds).verify_and_update(password, hashed_password)
+
+
+class PasswordHasher:
+    """
+    Хешування та перевірка паролів bcrypt в окремому пулі потоків або процесів,
+    щоб не блокувати цикл подій. Кількість одночасних операцій обмежена.
+    """
+
+    def __init__(self, rounds: int = 12, concurrency: int = 4, pool: str = "thread"):
+        self.rounds = rounds
+        self.concurrency = concurrency
+        self.pool = pool
+        self._executor: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.pool == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.concurrency)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                    thread_name_prefix="password-hasher")
+        return self._executor
+
+    def _get_semaphore(self, loop: asyncio.AbstractEventLoop) -> asyncio.Semaphore:
+        # екземпляр створюється під час імпорту, а семафор прив'язується до циклу подій першого виклику
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+        return self._semaphore
+
+    async def _run(self, func, *args):
+        loop = asyncio.get_running_loop()
+        async with self._get_semaphore(loop):
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+
+    async def hash(self, password: str) -> str:
+        """
+        Отримання хешу пароля з налаштованою вартістю.
+
+        :param password: Пароль користувача.
+        :type password: str
+        :return: Хеш пароля.
+        :rtype: str
+        """
+        return await self._run(_hash, password, self.rounds)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> tuple[bool, str | None]:
+        """
+        Перевірка пароля та, за потреби, новий хеш з поточною вартістю.
+
+        :param password: Пароль від користувача.
+        :type password: str
+        :param hashed_password: Збережений хеш пароля.
+        :type hashed_password: str
+        :return: (True, новий хеш або None), якщо пароль співпадає, інакше (False, None).
+        :rtype: tuple[bool, str | None]
+        """
+        return await self._run(_verify_and_update, password, hashed_password, self.rounds)
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
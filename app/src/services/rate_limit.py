@@ -0,0 +1,284 @@
+import json
+import logging
+import math
+import re
+import time
+from collections import OrderedDict
+from fnmatch import translate
+from pathlib import Path
+from typing import Callable
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+SLIDING_WINDOW = "sliding_window"
+TOKEN_BUCKET = "token_bucket"
+
+logger = logging.getLogger(__name__)
+
+# Лічильник ковзного вікна: поточне вікно плюс зважений залишок попереднього.
+# KEYS: поточне вікно, попереднє; ARGV: ліміт, вікно (с), вага попереднього вікна, мс до кінця вікна.
+SLIDING_WINDOW_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local limit = tonumber(ARGV[1])
+local used = math.floor(previous * tonumber(ARGV[3])) + current
+if used >= limit then
+    return {0, 0, tonumber(ARGV[4])}
+end
+redis.call('INCR', KEYS[1])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[2]) * 2)
+return {1, limit - used - 1, 0}
+"""
+
+# KEYS: відро; ARGV: токенів за секунду, місткість, поточний час (с).
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+local retry_after = 0
+if allowed == 0 then
+    retry_after = math.ceil((1 - tokens) / rate * 1000)
+end
+return {allowed, math.floor(tokens), retry_after}
+"""
+
+
+class Policy:
+    """
+    Рядок таблиці лімітів: які запити він охоплює, чим ключуються лічильники і алгоритм.
+
+    sliding_window пропускає limit запитів за window секунд, token_bucket - у середньому
+    rate запитів за секунду з короткими сплесками до burst.
+    """
+
+    def __init__(self, name: str, path: str, algorithm: str = TOKEN_BUCKET, methods: list[str] | None = None,
+                 key: str = "user", limit: int | None = None, window: int | None = None,
+                 rate: float | None = None, burst: int | None = None):
+        if algorithm == SLIDING_WINDOW and not (limit and window):
+            raise ValueError(f"policy {name}: sliding_window requires limit and window")
+        if algorithm == TOKEN_BUCKET and not (rate and burst):
+            raise ValueError(f"policy {name}: token_bucket requires rate and burst")
+        if algorithm not in (SLIDING_WINDOW, TOKEN_BUCKET):
+            raise ValueError(f"policy {name}: unknown algorithm {algorithm}")
+        self.name = name
+        self.path = path
+        self.algorithm = algorithm
+        self.methods = {method.upper() for method in methods} if methods else None
+        self.key = key
+        self.limit = limit
+        self.window = window
+        self.rate = rate
+        self.burst = burst
+        self._pattern = re.compile(translate(path))
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.methods is None or method in self.methods) and self._pattern.match(path) is not None
+
+    @property
+    def capacity(self) -> int:
+        return self.limit if self.algorithm == SLIDING_WINDOW else self.burst
+
+    @property
+    def refill_rate(self) -> float:
+        return self.limit / self.window if self.algorithm == SLIDING_WINDOW else self.rate
+
+
+def load_policies(path: str | Path) -> list[Policy]:
+    """
+    Читання таблиці лімітів з JSON-файлу; спрацьовує перша політика, що підходить до запиту.
+
+    :param path: Шлях до JSON-файлу зі списком політик.
+    :type path: str | Path
+    :return: Політики в порядку файлу.
+    :rtype: list[Policy]
+    """
+    return [Policy(**row) for row in json.loads(Path(path).read_text())]
+
+
+class Decision:
+    def __init__(self, allowed: bool, remaining: int, retry_after: float, policy: Policy):
+        self.allowed = allowed
+        self.remaining = remaining
+        self.retry_after = retry_after
+        self.policy = policy
+
+
+class LocalBuckets:
+    """
+    Відра токенів у пам'яті процесу на час недоступності Redis; кожна політика
+    зводиться до відра з тією ж місткістю та середньою швидкістю.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def hit(self, key: str, policy: Policy, now: float) -> Decision:
+        rate, burst = policy.refill_rate, policy.capacity
+        tokens, ts = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + max(0.0, now - ts) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.maxsize:
+            self._buckets.popitem(last=False)
+        return Decision(allowed, int(tokens), 0 if allowed else (1 - tokens) / rate, policy)
+
+
+class RateLimiter:
+    """
+    Рішення за таблицею політик: один виклик Lua-скрипту в Redis на запит.
+
+    Якщо Redis недоступний, рішення ухвалюють локальні відра, а нова спроба
+    звернутися до Redis робиться не раніше ніж через redis_retry секунд.
+    """
+
+    def __init__(self, policies: list[Policy], prefix: str = "rl", redis_retry: float = 5.0,
+                 local_maxsize: int = 10000):
+        self.policies = policies
+        self.prefix = prefix
+        self.redis_retry = redis_retry
+        self.local = LocalBuckets(local_maxsize)
+        self._redis: Redis | None = None
+        self._scripts = {}
+        self._redis_down_until = 0.0
+
+    def init(self, redis: Redis | None):
+        """
+        Підключення Redis під час старту застосунку.
+
+        :param redis: Клієнт Redis.
+        :type redis: Redis | None
+        """
+        self._redis = redis
+        self._scripts = {}
+        if redis is not None:
+            self._scripts = {
+                SLIDING_WINDOW: redis.register_script(SLIDING_WINDOW_SCRIPT),
+                TOKEN_BUCKET: redis.register_script(TOKEN_BUCKET_SCRIPT),
+            }
+
+    def match(self, method: str, path: str) -> Policy | None:
+        for policy in self.policies:
+            if policy.matches(method, path):
+                return policy
+        return None
+
+    async def _redis_hit(self, key: str, policy: Policy, now: float) -> Decision:
+        if policy.algorithm == SLIDING_WINDOW:
+            window_index, offset = divmod(now, policy.window)
+            keys = [f"{key}:{int(window_index)}", f"{key}:{int(window_index) - 1}"]
+            args = [policy.limit, policy.window, 1 - offset / policy.window,
+                    math.ceil((policy.window - offset) * 1000)]
+        else:
+            keys = [key]
+            args = [policy.rate, policy.burst, now]
+        allowed, remaining, retry_after_ms = await self._scripts[policy.algorithm](keys=keys, args=args)
+        return Decision(bool(allowed), int(remaining), int(retry_after_ms) / 1000, policy)
+
+    async def hit(self, policy: Policy, identity: str) -> Decision:
+        """
+        Облік запиту за політикою.
+
+        :param policy: Політика, що підходить до запиту.
+        :type policy: Policy
+        :param identity: Ключ клієнта, наприклад user:<email> або ip:<адреса>.
+        :type identity: str
+        :return: Рішення: чи пропустити запит, скільки лишилось і коли повторити.
+        :rtype: Decision
+        """
+        key = f"{self.prefix}:{policy.name}:{identity}"
+        now = time.time()
+        if self._redis is not None and now >= self._redis_down_until:
+            try:
+                return await self._redis_hit(key, policy, now)
+            except (RedisError, OSError) as err:
+                logger.warning("rate limiter falling back to local store: %s", err)
+                self._redis_down_until = now + self.redis_retry
+        return self.local.hit(key, policy, time.monotonic())
+
+
+class RateLimitMiddleware:
+    """
+    ASGI-middleware, що застосовує RateLimiter до всіх маршрутів застосунку.
+
+    Ліміти ключуються користувачем із bearer-токена (той самий sub, за яким
+    get_current_user шукає користувача), а для анонімних запитів - IP-адресою.
+    """
+
+    def __init__(self, app, limiter: RateLimiter, identify: Callable[[str], str | None] | None = None):
+        self.app = app
+        self.limiter = limiter
+        self.identify = identify
+
+    def identity(self, scope, policy: Policy) -> str:
+        if policy.key == "user" and self.identify is not None:
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    scheme, _, token = value.decode("latin-1").partition(" ")
+                    subject = self.identify(token) if scheme.lower() == "bearer" and token else None
+                    if subject:
+                        return f"user:{subject}"
+                    break
+        client = scope.get("client")
+        return f"ip:{client[0] if client else 'unknown'}"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        policy = self.limiter.match(scope["method"], scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        decision = await self.limiter.hit(policy, self.identity(scope, policy))
+        if decision.allowed:
+            await self.app(scope, receive, send)
+            return
+
+        body = json.dumps({"detail": "Too Many Requests"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(decision.retry_after))).encode()),
+                (b"x-ratelimit-policy", policy.name.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def token_subject(decode: Callable[[str], dict], errors: tuple = (Exception,)) -> Callable[[str], str | None]:
+    """
+    Функція для RateLimitMiddleware, що дістає sub із підписаного токена.
+
+    :param decode: Перевірка токена, наприклад auth_service.tokens.decode (з кешем).
+    :type decode: Callable[[str], dict]
+    :param errors: Винятки недійсного токена; такий запит ключується IP-адресою.
+    :type errors: tuple
+    :return: Функція token -> sub або None.
+    :rtype: Callable[[str], str | None]
+    """
+    def identify(token: str) -> str | None:
+        try:
+            return decode(token).get("sub")
+        except errors:
+            return None
+    return identify
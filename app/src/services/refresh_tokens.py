@@ -0,0 +1,169 @@
+import time
+import uuid
+from enum import Enum
+
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+# KEYS: сім'я, сесії користувача; ARGV: пред'явлений jti, новий jti, ttl, поточний час, id сім'ї.
+# Пред'явлення вже заміненого токена означає, що його скопіювали: сім'я відкликається.
+ROTATE_SCRIPT = """
+local current = redis.call('HGET', KEYS[1], 'current')
+if not current then
+    return 0
+end
+if current ~= ARGV[1] then
+    local device = redis.call('HGET', KEYS[1], 'device')
+    redis.call('DEL', KEYS[1])
+    if device and redis.call('HGET', KEYS[2], device) == ARGV[5] then
+        redis.call('HDEL', KEYS[2], device)
+    end
+    return -1
+end
+redis.call('HSET', KEYS[1], 'current', ARGV[2], 'last_used', ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[3])
+return 1
+"""
+
+
+class Rotation(Enum):
+    ROTATED = 1
+    UNKNOWN = 0
+    REUSED = -1
+
+
+class RefreshTokenStore:
+    """
+    Сесії refresh-токенів у Redis.
+
+    Кожен вхід з пристрою відкриває сім'ю токенів; у сім'ї дійсний лише останній
+    виданий jti. Ротація виконується Lua-скриптом за один виклик, а повторне
+    пред'явлення старого токена відкликає всю сім'ю. Сім'ї та список сесій
+    користувача зникають самі через ttl після останнього оновлення.
+    """
+
+    def __init__(self, ttl: int = 7 * 24 * 3600, prefix: str = "rt"):
+        self.ttl = ttl
+        self.prefix = prefix
+        self._redis: Redis | None = None
+        self._rotate = None
+
+    def init(self, redis: Redis | None, ttl: int | None = None):
+        """
+        Підключення Redis під час старту застосунку.
+
+        :param redis: Клієнт Redis з decode_responses=True.
+        :type redis: Redis | None
+        """
+        self._redis = redis
+        self._rotate = redis.register_script(ROTATE_SCRIPT) if redis is not None else None
+        if ttl is not None:
+            self.ttl = ttl
+
+    @property
+    def redis(self) -> Redis:
+        if self._redis is None:
+            raise RuntimeError("RefreshTokenStore is not initialized")
+        return self._redis
+
+    def family_key(self, family: str) -> str:
+        return f"{self.prefix}:family:{family}"
+
+    def sessions_key(self, email: str) -> str:
+        return f"{self.prefix}:sessions:{email}"
+
+    async def start(self, email: str, device: str) -> tuple[str, str]:
+        """
+        Нова сім'я токенів для пристрою; попередня сесія цього пристрою відкликається.
+
+        :param email: Email користувача.
+        :type email: str
+        :param device: Ідентифікатор пристрою.
+        :type device: str
+        :return: Ідентифікатор сім'ї та jti першого токена.
+        :rtype: tuple[str, str]
+        """
+        family, jti = uuid.uuid4().hex, uuid.uuid4().hex
+        now = int(time.time())
+        sessions = self.sessions_key(email)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    # одночасний вхід з того самого пристрою не залишить двох сімей
+                    await pipe.watch(sessions)
+                    previous = await pipe.hget(sessions, device)
+                    pipe.multi()
+                    if previous:
+                        pipe.delete(self.family_key(previous))
+                    pipe.hset(self.family_key(family), mapping={
+                        "email": email, "device": device, "current": jti, "created_at": now, "last_used": now,
+                    })
+                    pipe.expire(self.family_key(family), self.ttl)
+                    pipe.hset(sessions, device, family)
+                    pipe.expire(sessions, self.ttl)
+                    await pipe.execute()
+                    break
+                except WatchError:
+                    continue
+        return family, jti
+
+    async def rotate(self, email: str, family: str, jti: str) -> tuple[Rotation, str | None]:
+        """
+        Заміна пред'явленого токена новим.
+
+        :param email: Email з токена.
+        :type email: str
+        :param family: Ідентифікатор сім'ї з токена.
+        :type family: str
+        :param jti: Ідентифікатор пред'явленого токена.
+        :type jti: str
+        :return: Результат ротації та jti нового токена, якщо ротація вдалась.
+        :rtype: tuple[Rotation, str | None]
+        """
+        new_jti = uuid.uuid4().hex
+        result = await self._rotate(keys=[self.family_key(family), self.sessions_key(email)],
+                                    args=[jti, new_jti, self.ttl, int(time.time()), family])
+        rotation = Rotation(int(result))
+        return rotation, new_jti if rotation is Rotation.ROTATED else None
+
+    async def sessions(self, email: str) -> list[dict]:
+        """
+        Активні сесії користувача за пристроями.
+
+        :return: Пристрій, час входу та останнього оновлення для кожної сесії.
+        :rtype: list[dict]
+        """
+        devices = await self.redis.hgetall(self.sessions_key(email))
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for family in devices.values():
+                pipe.hmget(self.family_key(family), "created_at", "last_used")
+            rows = await pipe.execute()
+        return [
+            {"device": device, "created_at": int(created_at), "last_used": int(last_used)}
+            for device, (created_at, last_used) in zip(devices, rows)
+            if created_at is not None
+        ]
+
+    async def revoke(self, email: str, device: str) -> bool:
+        """
+        Вихід з одного пристрою.
+
+        :return: True, якщо сесія існувала.
+        :rtype: bool
+        """
+        family = await self.redis.hget(self.sessions_key(email), device)
+        if family is None:
+            return False
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(self.family_key(family))
+            pipe.hdel(self.sessions_key(email), device)
+            await pipe.execute()
+        return True
+
+    async def revoke_all(self, email: str):
+        families = await self.redis.hvals(self.sessions_key(email))
+        await self.redis.delete(self.sessions_key(email), *(self.family_key(family) for family in families))
+
+
+refresh_token_store = RefreshTokenStore()
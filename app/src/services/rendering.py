@@ -0,0 +1,74 @@
+from pathlib import Path
+from typing import Iterable
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+
+TEMPLATE_FOLDER = Path(__file__).parent / "templates"
+
+
+def create_environment(template_folder: Path = TEMPLATE_FOLDER, bytecode_cache_dir: str | None = None) -> Environment:
+    """
+    Оточення Jinja для шаблонів листів.
+
+    Скомпільований байткод зберігається на диску, тож новий процес не парсить шаблони
+    заново; auto_reload вимкнено, щоб get_template не перевіряв файл при кожному виклику.
+
+    :param template_folder: Каталог із шаблонами.
+    :type template_folder: Path
+    :param bytecode_cache_dir: Каталог кешу байткоду; за замовчуванням тимчасовий каталог системи.
+    :type bytecode_cache_dir: str | None
+    :return: Оточення Jinja.
+    :rtype: Environment
+    """
+    return Environment(
+        loader=FileSystemLoader(template_folder),
+        autoescape=select_autoescape(),
+        bytecode_cache=FileSystemBytecodeCache(bytecode_cache_dir),
+        auto_reload=False,
+    )
+
+
+template_env = create_environment()
+
+
+def precompile(env: Environment = template_env) -> list[str]:
+    """
+    Завантаження всіх шаблонів каталогу під час старту, щоб перший лист не чекав на компіляцію.
+
+    :return: Назви завантажених шаблонів.
+    :rtype: list[str]
+    """
+    names = env.list_templates()
+    for name in names:
+        env.get_template(name)
+    return names
+
+
+def render(name: str, context: dict, env: Environment = template_env) -> str:
+    """
+    Рендер одного шаблону зі спільного оточення.
+
+    :param name: Назва шаблону.
+    :type name: str
+    :param context: Контекст шаблону.
+    :type context: dict
+    :return: HTML листа.
+    :rtype: str
+    """
+    return env.get_template(name).render(context)
+
+
+def render_many(name: str, contexts: Iterable[dict], env: Environment = template_env) -> list[str]:
+    """
+    Рендер одного шаблону для багатьох отримувачів за один прохід: шаблон береться
+    з оточення один раз, далі для кожного контексту виконується лише його код.
+
+    :param name: Назва шаблону.
+    :type name: str
+    :param contexts: Контексти отримувачів.
+    :type contexts: Iterable[dict]
+    :return: HTML листів у порядку контекстів.
+    :rtype: list[str]
+    """
+    template = env.get_template(name)
+    return [template.render(context) for context in contexts]
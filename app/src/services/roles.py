@@ -11,7 +11,5 @@ class RoleAccess:
         self.allowed_roles = allowed_roles
 
     async def __call__(self, request: Request, user: User = Depends(auth_service.get_current_user)):
-        print(user.role)
-        print(self.allowed_roles)
         if user.role not in self.allowed_roles:
-            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operation forbidden")
\ No newline at end of file
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operation forbidden")
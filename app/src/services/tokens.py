@@ -0,0 +1,192 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+SYMMETRIC_ALGORITHMS = {"HS256", "HS384", "HS512"}
+
+
+class InvalidToken(Exception):
+    """
+    Підпис, формат або термін дії токена не пройшли перевірку.
+    """
+
+
+class JoseBackend:
+    """
+    Перевірка та підпис токенів через python-jose (без підтримки EdDSA).
+    """
+
+    name = "jose"
+
+    def __init__(self):
+        from jose import JWTError, jwk, jwt
+        self._jwk = jwk
+        self._jwt = jwt
+        self._error = JWTError
+
+    def load_key(self, material: str | bytes, algorithm: str):
+        if algorithm == "EdDSA":
+            raise ValueError("python-jose does not support EdDSA, use the pyjwt backend")
+        return self._jwk.construct(material, algorithm)
+
+    def encode(self, claims: dict, key, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key, algorithm: str) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm])
+        except self._error as err:
+            raise InvalidToken(str(err)) from err
+
+
+class PyJWTBackend:
+    """
+    Перевірка та підпис токенів через PyJWT; асиметричні ключі обробляє cryptography.
+    """
+
+    name = "pyjwt"
+
+    def __init__(self):
+        import jwt
+        from cryptography.hazmat.primitives import serialization
+        self._jwt = jwt.PyJWT()
+        self._error = jwt.PyJWTError
+        self._serialization = serialization
+
+    def load_key(self, material: str | bytes, algorithm: str):
+        if isinstance(material, str):
+            material = material.encode()
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            return material
+        if b"PRIVATE KEY" in material:
+            return self._serialization.load_pem_private_key(material, password=None)
+        return self._serialization.load_pem_public_key(material)
+
+    def encode(self, claims: dict, key, algorithm: str) -> str:
+        return self._jwt.encode(claims, key, algorithm=algorithm)
+
+    def decode(self, token: str, key, algorithm: str) -> dict:
+        try:
+            return self._jwt.decode(token, key, algorithms=[algorithm])
+        except self._error as err:
+            raise InvalidToken(str(err)) from err
+
+
+BACKENDS = {
+    JoseBackend.name: JoseBackend,
+    PyJWTBackend.name: PyJWTBackend,
+}
+
+
+class VerifiedTokenCache:
+    """
+    LRU уже перевірених токенів: sha256 токена -> claims.
+
+    Запис живе до exp токена, але не довше ttl секунд, тож заміна ключа
+    перестає діяти на закешовані токени не пізніше ніж через ttl.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                return None
+            expires, claims = entry
+            if expires <= time.time():
+                del self._entries[digest]
+                return None
+            self._entries.move_to_end(digest)
+        return dict(claims)
+
+    def set(self, token: str, claims: dict):
+        if self.maxsize <= 0:
+            return
+        expires = time.time() + self.ttl
+        if "exp" in claims:
+            expires = min(expires, float(claims["exp"]))
+        digest = self._digest(token)
+        with self._lock:
+            self._entries[digest] = (expires, dict(claims))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class TokenCodec:
+    """
+    Підпис і перевірка JWT з ключами, розібраними один раз при створенні.
+
+    Для HS* використовується спільний секрет; для RS256/ES256/EdDSA достатньо
+    публічного ключа, щоб лише перевіряти токени, а приватний потрібен для підпису.
+    """
+
+    def __init__(self, algorithm: str, secret_key: str | None = None, private_key: str | bytes | None = None,
+                 public_key: str | bytes | None = None, backend: str = "jose", cache_size: int = 4096,
+                 cache_ttl: float = 300):
+        self.algorithm = algorithm
+        self.backend = BACKENDS[backend]()
+        if algorithm in SYMMETRIC_ALGORITHMS:
+            if secret_key is None:
+                raise ValueError(f"{algorithm} requires secret_key")
+            self._signing_key = self._verifying_key = self.backend.load_key(secret_key, algorithm)
+        else:
+            if public_key is None:
+                raise ValueError(f"{algorithm} requires public_key")
+            self._verifying_key = self.backend.load_key(public_key, algorithm)
+            self._signing_key = self.backend.load_key(private_key, algorithm) if private_key else None
+        self.cache = VerifiedTokenCache(cache_size, cache_ttl)
+
+    def encode(self, claims: dict) -> str:
+        """
+        Підпис claims.
+
+        :param claims: Дані токена.
+        :type claims: dict
+        :return: Токен.
+        :rtype: str
+        """
+        if self._signing_key is None:
+            raise RuntimeError("TokenCodec has no private key and can only verify tokens")
+        return self.backend.encode(claims, self._signing_key, self.algorithm)
+
+    def decode(self, token: str) -> dict:
+        """
+        Перевірка токена; повторна перевірка того самого токена береться з кешу.
+
+        :param token: Токен.
+        :type token: str
+        :return: Claims токена.
+        :rtype: dict
+        :raises InvalidToken: Якщо токен недійсний або прострочений.
+        """
+        claims = self.cache.get(token)
+        if claims is None:
+            claims = self.backend.decode(token, self._verifying_key, self.algorithm)
+            self.cache.set(token, claims)
+        return claims
+
+
+def read_key(value: str | None) -> str | None:
+    """
+    PEM-ключ з налаштувань: сам ключ або шлях до файлу з ним.
+    """
+    if value is None or "-----BEGIN" in value:
+        return value
+    return Path(value).read_text()
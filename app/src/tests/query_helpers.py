@@ -0,0 +1,48 @@
+import contextlib
+from typing import Iterator, List
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import ORMExecuteState, raiseload
+
+
+@contextlib.contextmanager
+def count_queries(engine: AsyncEngine) -> Iterator[List[str]]:
+    """
+    Збирає SQL-запити, виконані двигуном у межах блоку.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@contextlib.contextmanager
+def assert_num_queries(engine: AsyncEngine, expected: int) -> Iterator[List[str]]:
+    """
+    Перевіряє, що блок виконав рівно ``expected`` SQL-запитів.
+    """
+    with count_queries(engine) as statements:
+        yield statements
+    assert len(statements) == expected, (
+        f"Expected {expected} queries, got {len(statements)}:\n" + "\n".join(statements)
+    )
+
+
+def _raiseload_all(state: ORMExecuteState):
+    if state.is_select:
+        state.statement = state.statement.options(raiseload("*"))
+
+
+def forbid_lazy_loads(session: AsyncSession):
+    """
+    Будь-яке звернення до незавантаженого зв'язку в цій сесії піднімає помилку
+    замість лінивого запиту. Явні опції завантаження (selectinload тощо) мають пріоритет.
+    """
+    event.listen(session.sync_session, "do_orm_execute", _raiseload_all)
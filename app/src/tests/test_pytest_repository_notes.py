@@ -0,0 +1,123 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from src.database.models import Note, Tag, User, Base
+from src.schemas import NoteResponse, NoteModel, NoteTagsAssignment, BulkNoteResult
+from src.repository.notes import get_notes, get_notes_after, get_note, create_notes, assign_tags
+from src.tests.query_helpers import assert_num_queries, count_queries, forbid_lazy_loads
+TEST_DATABASE_URL = "sqlite+aiosqlite:///./test_db.sqlite"
+
+engine = create_async_engine(TEST_DATABASE_URL)
+TestingSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+
+@pytest.fixture
+def run():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+@pytest.fixture
+def db(run):
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def drop_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    run(create_tables())
+    session = TestingSessionLocal()
+
+    yield session
+
+    run(session.close())
+    run(drop_tables())
+
+
+@pytest.fixture
+def user(db, run):
+    user = User(email="test@example.com", password="secret")
+    db.add(user)
+    run(db.commit())
+    tags = [Tag(name=f"tag{i}", user_id=user.id) for i in range(3)]
+    db.add_all(tags)
+    db.add_all([Note(title=f"note{i}", description="test note", tags=tags, user_id=user.id) for i in range(100)])
+    run(db.commit())
+    db.expunge_all()
+    forbid_lazy_loads(db)
+    return user
+
+
+def test_get_notes_constant_queries(db, run, user):
+    with assert_num_queries(engine, 2):
+        notes = run(get_notes(0, 100, user, db))
+        response = [NoteResponse.model_validate(note, from_attributes=True) for note in notes]
+    assert len(response) == 100
+    assert all(len(note.tags) == 3 for note in response)
+
+
+def test_get_notes_after_constant_queries(db, run, user):
+    with assert_num_queries(engine, 2):
+        notes = run(get_notes_after(None, 50, user, db))
+        response = [NoteResponse.model_validate(note, from_attributes=True) for note in notes]
+    assert len(response) == 50
+    assert all(len(note.tags) == 3 for note in response)
+
+
+def test_get_note_constant_queries(db, run, user):
+    with assert_num_queries(engine, 2):
+        note = run(get_note(1, user, db))
+        response = NoteResponse.model_validate(note, from_attributes=True)
+    assert len(response.tags) == 3
+
+
+def test_lazy_load_raises(db, run, user):
+    result = run(db.execute(select(Note).filter(Note.id == 1)))
+    note = result.scalar_one()
+    with pytest.raises(InvalidRequestError):
+        note.tags
+
+
+def test_create_notes_bulk(db, run, user):
+    bodies = [NoteModel(title=f"bulk{i}", description="bulk note", tags=[1, 2]) for i in range(50)]
+    bodies.insert(10, NoteModel(title="bad", description="bulk note", tags=[1, 99]))
+    with count_queries(engine) as statements:
+        results = run(create_notes(bodies, user, db))
+        response = [BulkNoteResult.model_validate(result, from_attributes=True) for result in results]
+    # SQLite не гарантує порядок RETURNING, тому вставка нотаток тут іде по рядку;
+    # на Postgres це один INSERT ... RETURNING
+    assert len([sql for sql in statements if sql.startswith("SELECT")]) == 1
+    assert len([sql for sql in statements if sql.startswith("INSERT INTO note_m2m_tag")]) == 1
+    assert len(response) == 51
+    assert response[10].note is None
+    assert response[10].error == "Tags not found: [99]"
+    created = [item.note for item in response if item.error is None]
+    assert [note.title for note in created] == [f"bulk{i}" for i in range(50)]
+    assert all([tag.id for tag in note.tags] == [1, 2] for note in created)
+    assert len({note.id for note in created}) == 50
+
+
+def test_assign_tags_bulk(db, run, user):
+    run(create_notes([NoteModel(title="untagged", description="bulk note", tags=[])], user, db))
+    assignments = [
+        NoteTagsAssignment(note_id=101, tags=[1, 2]),
+        NoteTagsAssignment(note_id=1, tags=[1, 2]),
+        NoteTagsAssignment(note_id=500, tags=[1]),
+        NoteTagsAssignment(note_id=101, tags=[2, 3]),
+    ]
+    with assert_num_queries(engine, 4):
+        results = run(assign_tags(assignments, user, db))
+        response = [BulkNoteResult.model_validate(result, from_attributes=True) for result in results]
+    assert [sorted(tag.id for tag in response[0].note.tags)] == [[1, 2, 3]]
+    assert len(response[1].note.tags) == 3
+    assert response[2].error == "Note not found"
+    db.expunge_all()
+    note = run(get_note(101, user, db))
+    assert sorted(tag.id for tag in note.tags) == [1, 2, 3]
@@ -1,68 +1,81 @@
+import asyncio
+
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, clear_mappers
-from sqlalchemy.exc import OperationalError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from src.database.models import User, Base
 from src.schemas import UserModel
 from src.repository.users import get_user_by_email,create_user,update_token,confirmed_email
-TEST_DATABASE_URL = "sqlite:///./test_db.sqlite"
+TEST_DATABASE_URL = "sqlite+aiosqlite:///./test_db.sqlite"
+
+engine = create_async_engine(TEST_DATABASE_URL)
+TestingSessionLocal = async_sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
 
-engine = create_engine(TEST_DATABASE_URL)
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@pytest.fixture
+def run():
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(engine.dispose())
+    loop.close()
 
 
 @pytest.fixture
-def db():
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+def db(run):
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def drop_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+
+    run(create_tables())
+    session = TestingSessionLocal()
 
     yield session
 
-    session.close()
-    transaction.rollback()
-    connection.close()
+    run(session.close())
+    run(drop_tables())
 
-def test_get_user_by_email(db):
-    user_data = {"email": "test@example.com"}
+def test_get_user_by_email(db, run):
+    user_data = {"email": "test@example.com", "password": "secret"}
     new_user = User(**user_data)
     db.add(new_user)
-    db.commit()
+    run(db.commit())
 
-    retrieved_user = get_user_by_email("test@example.com", db)
+    retrieved_user = run(get_user_by_email("test@example.com", db))
     assert retrieved_user is not None
     assert retrieved_user.email == user_data["email"]
 
-def test_create_user(db):
-    user_data = UserModel(email="test@example.com")
-    new_user = create_user(user_data, db)
-    db.commit()
+def test_create_user(db, run):
+    user_data = UserModel(username="tester", email="test@example.com", password="secret")
+    new_user = run(create_user(user_data, db))
 
-    retrieved_user = db.query(User).filter(User.email == "test@example.com").first()
+    result = run(db.execute(select(User).filter(User.email == "test@example.com")))
+    retrieved_user = result.scalar_one_or_none()
     assert retrieved_user is not None
     assert retrieved_user.email == user_data.email
 
-def test_update_token(db):
-    user_data = {"email": "test@example.com"}
+def test_update_token(db, run):
+    user_data = {"email": "test@example.com", "password": "secret"}
     new_user = User(**user_data)
     db.add(new_user)
-    db.commit()
+    run(db.commit())
 
-    user = get_user_by_email("test@example.com", db)
-    update_token(user, "new_token", db)
-    db.commit()
+    user = run(get_user_by_email("test@example.com", db))
+    run(update_token(user, "new_token", db))
 
-    updated_user = get_user_by_email("test@example.com", db)
+    updated_user = run(get_user_by_email("test@example.com", db))
     assert updated_user.refresh_token == "new_token"
 
-def test_confirmed_email(db):
-    user_data = {"email": "test@example.com", "confirmed": False}
+def test_confirmed_email(db, run):
+    user_data = {"email": "test@example.com", "password": "secret", "confirmed": False}
     new_user = User(**user_data)
     db.add(new_user)
-    db.commit()
+    run(db.commit())
 
-    confirmed_email("test@example.com", db)
-    db.commit()
+    run(confirmed_email("test@example.com", db))
 
-    confirmed_user = get_user_by_email("test@example.com", db)
+    confirmed_user = run(get_user_by_email("test@example.com", db))
     assert confirmed_user.confirmed is True
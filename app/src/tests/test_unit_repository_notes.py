@@ -1,12 +1,15 @@
 import unittest
+from datetime import datetime
 from unittest.mock import MagicMock
 
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.database.models import Note, Tag, User
 from src.schemas import NoteModel, NoteUpdate, NoteStatusUpdate
 from src.repository.notes import (
     get_notes,
+    get_notes_after,
+    search_notes,
     get_note,
     create_note,
     remove_note,
@@ -18,30 +21,50 @@ from src.repository.notes import (
 class TestNotes(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
-        self.session = MagicMock(spec=Session)
+        self.session = MagicMock(spec=AsyncSession)
+        self.session.execute.return_value = MagicMock()
         self.user = User(id=1)
 
     async def test_get_notes(self):
         notes = [Note(), Note(), Note()]
-        self.session.query().filter().offset().limit().all.return_value = notes
+        self.session.execute.return_value.scalars.return_value.all.return_value = notes
         result = await get_notes(skip=0, limit=10, user=self.user, db=self.session)
         self.assertEqual(result, notes)
 
+    async def test_get_notes_after(self):
+        notes = [Note(), Note()]
+        self.session.execute.return_value.scalars.return_value.all.return_value = notes
+        result = await get_notes_after(after=(datetime(2023, 8, 10), 5), limit=2, user=self.user, db=self.session)
+        self.assertEqual(result, notes)
+
+    async def test_get_notes_after_first_page(self):
+        notes = [Note()]
+        self.session.execute.return_value.scalars.return_value.all.return_value = notes
+        result = await get_notes_after(after=None, limit=10, user=self.user, db=self.session)
+        self.assertEqual(result, notes)
+
+    async def test_search_notes(self):
+        rows = [(Note(id=2), 0.5), (Note(id=1), 0.1)]
+        self.session.execute.return_value.all.return_value = rows
+        result = await search_notes(q="milk", tags=[1, 2], done=False, after=(0.9, 10), limit=2,
+                                    user=self.user, db=self.session)
+        self.assertEqual(result, rows)
+
     async def test_get_note_found(self):
         note = Note()
-        self.session.query().filter().first.return_value = note
+        self.session.execute.return_value.scalar_one_or_none.return_value = note
         result = await get_note(note_id=1, user=self.user, db=self.session)
         self.assertEqual(result, note)
 
     async def test_get_note_not_found(self):
-        self.session.query().filter().first.return_value = None
+        self.session.execute.return_value.scalar_one_or_none.return_value = None
         result = await get_note(note_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
 
     async def test_create_note(self):
         body = NoteModel(title="test", description="test note", tags=[1, 2])
         tags = [Tag(id=1, user_id=1), Tag(id=2, user_id=1)]
-        self.session.query().filter().all.return_value = tags
+        self.session.execute.return_value.scalars.return_value.all.return_value = tags
         result = await create_note(body=body, user=self.user, db=self.session)
         self.assertEqual(result.title, body.title)
         self.assertEqual(result.description, body.description)
@@ -50,12 +73,12 @@ class TestNotes(unittest.IsolatedAsyncioTestCase):
 
     async def test_remove_note_found(self):
         note = Note()
-        self.session.query().filter().first.return_value = note
+        self.session.execute.return_value.scalar_one_or_none.return_value = note
         result = await remove_note(note_id=1, user=self.user, db=self.session)
         self.assertEqual(result, note)
 
     async def test_remove_note_not_found(self):
-        self.session.query().filter().first.return_value = None
+        self.session.execute.return_value.scalar_one_or_none.return_value = None
         result = await remove_note(note_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
 
@@ -63,15 +86,15 @@ class TestNotes(unittest.IsolatedAsyncioTestCase):
         body = NoteUpdate(title="test", description="test note", tags=[1, 2], done=True)
         tags = [Tag(id=1, user_id=1), Tag(id=2, user_id=1)]
         note = Note(tags=tags)
-        self.session.query().filter().first.return_value = note
-        self.session.query().filter().all.return_value = tags
+        self.session.execute.return_value.scalar_one_or_none.return_value = note
+        self.session.execute.return_value.scalars.return_value.all.return_value = tags
         self.session.commit.return_value = None
         result = await update_note(note_id=1, body=body, user=self.user, db=self.session)
         self.assertEqual(result, note)
 
     async def test_update_note_not_found(self):
         body = NoteUpdate(title="test", description="test note", tags=[1, 2], done=True)
-        self.session.query().filter().first.return_value = None
+        self.session.execute.return_value.scalar_one_or_none.return_value = None
         self.session.commit.return_value = None
         result = await update_note(note_id=1, body=body, user=self.user, db=self.session)
         self.assertIsNone(result)
@@ -79,14 +102,14 @@ class TestNotes(unittest.IsolatedAsyncioTestCase):
     async def test_update_status_note_found(self):
         body = NoteStatusUpdate(done=True)
         note = Note()
-        self.session.query().filter().first.return_value = note
+        self.session.execute.return_value.scalar_one_or_none.return_value = note
         self.session.commit.return_value = None
         result = await update_status_note(note_id=1, body=body, user=self.user, db=self.session)
         self.assertEqual(result, note)
 
     async def test_update_status_note_not_found(self):
         body = NoteStatusUpdate(done=True)
-        self.session.query().filter().first.return_value = None
+        self.session.execute.return_value.scalar_one_or_none.return_value = None
         self.session.commit.return_value = None
         result = await update_status_note(note_id=1, body=body, user=self.user, db=self.session)
         self.assertIsNone(result)
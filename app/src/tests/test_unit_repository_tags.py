@@ -1,11 +1,12 @@
 import unittest
 from unittest.mock import MagicMock
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import Note, Tag, User
 from src.schemas import NoteModel, NoteUpdate, NoteStatusUpdate, TagModel
 
 from src.repository.tags import (
     get_tags,
+    get_tags_after,
     get_tag,
     create_tag,
     update_tag,
@@ -15,25 +16,32 @@ from src.repository.tags import (
 class TestTags(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
-        self.session = MagicMock(spec=Session)
+        self.session = MagicMock(spec=AsyncSession)
+        self.session.execute.return_value = MagicMock()
         self.user = User(id=1)
 
 
         
     async def test_get_tags(self):
         tags = [Tag(), Tag(), Tag()]
-        self.session.query().filter().offset().limit().all.return_value = tags
+        self.session.execute.return_value.scalars.return_value.all.return_value = tags
         result = await get_tags(skip=0, limit=10, user=self.user, db=self.session)
         self.assertEqual(result, tags)
 
+    async def test_get_tags_after(self):
+        tags = [Tag(), Tag()]
+        self.session.execute.return_value.scalars.return_value.all.return_value = tags
+        result = await get_tags_after(after=("news", 3), limit=2, user=self.user, db=self.session)
+        self.assertEqual(result, tags)
+
     async def test_get_tag_found(self):
         tag = Tag()
-        self.session.query().filter().first.return_value = tag
+        self.session.execute.return_value.scalar_one_or_none.return_value = tag
         result = await get_tag(tag_id=1, user=self.user, db=self.session)
         self.assertEqual(result, tag)
 
     async def test_get_tag_not_found(self):
-        self.session.query().filter().first.return_value = None
+        self.session.execute.return_value.scalar_one_or_none.return_value = None
         result = await get_tag(tag_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
 
@@ -51,7 +59,7 @@ class TestTags(unittest.IsolatedAsyncioTestCase):
     async def test_update_tag_found(self):
         body = TagModel(name="updated")
         tag = Tag(id=1, user_id=1)
-        self.session.query().filter().first.return_value = tag
+        self.session.execute.return_value.scalar_one_or_none.return_value = tag
         self.session.commit.return_value = None
         result = await update_tag(tag_id=1, body=body, user=self.user, db=self.session)
         self.assertEqual(result, tag)
@@ -59,20 +67,20 @@ class TestTags(unittest.IsolatedAsyncioTestCase):
 
     async def test_update_tag_not_found(self):
         body = TagModel(name="updated")
-        self.session.query().filter().first.return_value = None
+        self.session.execute.return_value.scalar_one_or_none.return_value = None
         self.session.commit.return_value = None
         result = await update_tag(tag_id=1, body=body, user=self.user, db=self.session)
         self.assertIsNone(result)
 
     async def test_remove_tag_found(self):
         tag = Tag(id=1, user_id=1)
-        self.session.query().filter().first.return_value = tag
+        self.session.execute.return_value.scalar_one_or_none.return_value = tag
         self.session.commit.return_value = None
         result = await remove_tag(tag_id=1, user=self.user, db=self.session)
         self.assertEqual(result, tag)
 
     async def test_remove_tag_not_found(self):
-        self.session.query().filter().first.return_value = None
+        self.session.execute.return_value.scalar_one_or_none.return_value = None
         self.session.commit.return_value = None
         result = await remove_tag(tag_id=1, user=self.user, db=self.session)
         self.assertIsNone(result)
@@ -1,6 +1,6 @@
 import unittest
 from unittest.mock import MagicMock
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.database.models import Note, Tag, User
 from src.schemas import NoteModel, NoteUpdate, NoteStatusUpdate, TagModel, UserModel
 from src.repository.users import (
@@ -15,14 +15,15 @@ from libgravatar import Gravatar
 class TestUsers(unittest.IsolatedAsyncioTestCase):
 
     def setUp(self):
-        self.session = MagicMock(spec=Session)
+        self.session = MagicMock(spec=AsyncSession)
+        self.session.execute.return_value = MagicMock()
         self.user = User(id=1)
 
 
 
     async def test_get_user_by_email(self):
         user = User()
-        self.session.query().filter().first.return_value = user
+        self.session.execute.return_value.scalar_one_or_none.return_value = user
         result = await get_user_by_email(email="test@example.com", db=self.session)
         self.assertEqual(result, user)
 
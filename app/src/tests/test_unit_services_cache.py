@@ -0,0 +1,94 @@
+import json
+import unittest
+from datetime import datetime
+from unittest.mock import AsyncMock, patch
+
+from src.database.models import Role, User
+from src.services.cache import UserCache
+
+
+class TestUserCache(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.cache = UserCache(maxsize=2, ttl=900, local_ttl=30)
+        self.user = User(id=1, username="test", email="test@example.com", password="hash",
+                         refresh_token="token", confirmed=True, created_at=datetime(2024, 1, 1, 12, 0),
+                         role=Role.admin)
+
+    async def test_get_missing(self):
+        result = await self.cache.get("test@example.com")
+        self.assertIsNone(result)
+
+    async def test_set_and_get(self):
+        await self.cache.set(self.user)
+        result = await self.cache.get("test@example.com")
+        self.assertEqual((result.id, result.username, result.email, result.confirmed, result.created_at),
+                         (1, "test", "test@example.com", True, datetime(2024, 1, 1, 12, 0)))
+        self.assertIsNone(result.password)
+        self.assertIsNone(result.refresh_token)
+
+    async def test_get_returns_fresh_instance(self):
+        await self.cache.set(self.user)
+        first = await self.cache.get("test@example.com")
+        second = await self.cache.get("test@example.com")
+        self.assertIsNot(first, second)
+        self.assertIsNot(first, self.user)
+
+    async def test_redis_stores_json_without_credentials(self):
+        redis = AsyncMock()
+        self.cache.init(redis)
+        await self.cache.set(self.user)
+        key, value = redis.set.await_args.args
+        data = json.loads(value)
+        self.assertEqual(key, "user:test@example.com")
+        self.assertEqual(data["created_at"], "2024-01-01T12:00:00")
+        self.assertEqual(data["role"], "admin")
+        self.assertNotIn("password", data)
+        self.assertNotIn("refresh_token", data)
+
+    async def test_lru_eviction(self):
+        await self.cache.set(User(id=1, email="a@example.com"))
+        await self.cache.set(User(id=2, email="b@example.com"))
+        await self.cache.get("a@example.com")
+        await self.cache.set(User(id=3, email="c@example.com"))
+        self.assertIsNotNone(await self.cache.get("a@example.com"))
+        self.assertIsNone(await self.cache.get("b@example.com"))
+
+    async def test_local_ttl_expired(self):
+        await self.cache.set(self.user)
+        with patch("src.services.cache.time.monotonic", return_value=10 ** 9):
+            result = await self.cache.get("test@example.com")
+        self.assertIsNone(result)
+
+    async def test_invalidate(self):
+        redis = AsyncMock()
+        self.cache.init(redis)
+        await self.cache.set(self.user)
+        await self.cache.invalidate("test@example.com")
+        redis.get.return_value = None
+        self.assertIsNone(await self.cache.get("test@example.com"))
+        redis.delete.assert_awaited_once_with("user:test@example.com")
+
+    async def test_get_from_redis(self):
+        redis = AsyncMock()
+        redis.get.return_value = json.dumps({"id": 1, "username": "test", "email": "test@example.com",
+                                             "avatar": None, "confirmed": True,
+                                             "created_at": "2024-01-01T12:00:00", "role": "admin"}).encode()
+        self.cache.init(redis)
+        result = await self.cache.get("test@example.com")
+        self.assertEqual(result.id, self.user.id)
+        self.assertEqual(result.email, self.user.email)
+        self.assertEqual(result.created_at, datetime(2024, 1, 1, 12, 0))
+        self.assertIs(result.role, Role.admin)
+        redis.get.assert_awaited_once_with("user:test@example.com")
+
+    async def test_invalid_redis_entry_ignored(self):
+        redis = AsyncMock()
+        redis.get.return_value = b"\x80\x04not json"
+        self.cache.init(redis)
+        with self.assertLogs("src.services.cache", level="WARNING"):
+            self.assertIsNone(await self.cache.get("test@example.com"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import asyncio
+import socket
+import time
+import unittest
+
+from aiosmtpd.controller import Controller
+from fakeredis import FakeServer, aioredis
+
+from src.services.email_queue import EmailQueue
+from src.services.email_worker import EmailWorker, SMTPSender
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class RecordingHandler:
+    """
+    Локальний SMTP-сервер: запам'ятовує листи та сесії, відхиляє адреси reject@ (550)
+    і тимчасово - busy@ (451).
+    """
+
+    def __init__(self):
+        self.messages = []
+        self.sessions = []
+
+    async def handle_RCPT(self, server, session, envelope, address, rcpt_options):
+        if address.startswith("reject@"):
+            return "550 mailbox unavailable"
+        if address.startswith("busy@"):
+            return "451 try again later"
+        envelope.rcpt_tos.append(address)
+        return "250 OK"
+
+    async def handle_DATA(self, server, session, envelope):
+        if not any(known is session for known in self.sessions):
+            self.sessions.append(session)
+        self.messages.append(envelope)
+        return "250 Message accepted"
+
+
+class TestEmailQueue(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.handler = RecordingHandler()
+        self.controller = Controller(self.handler, hostname="127.0.0.1", port=free_port())
+        self.controller.start()
+        self.server = FakeServer()
+        self.queue = EmailQueue()
+        self.queue.init(aioredis.FakeRedis(server=self.server, decode_responses=True))
+        self.sender = SMTPSender("127.0.0.1", self.controller.port)
+        self.worker = EmailWorker(self.queue, self.sender, "noreply@example.com", "Notes", batch_size=10,
+                                  max_attempts=3, backoff=1)
+
+    async def asyncTearDown(self):
+        await self.sender.close()
+        self.controller.stop()
+
+    async def enqueue(self, email: str) -> str:
+        return await self.queue.enqueue("Confirm your email ", [email], "email_template.html",
+                                        {"host": "http://test/", "username": "user", "token": "abc"})
+
+    async def test_batch_reuses_connection(self):
+        for i in range(5):
+            await self.enqueue(f"user{i}@example.com")
+        self.assertEqual(await self.worker.run_once(), 5)
+        await self.enqueue("user5@example.com")
+        self.assertEqual(await self.worker.run_once(), 1)
+
+        self.assertEqual(len(self.handler.messages), 6)
+        self.assertEqual(len(self.handler.sessions), 1)
+        self.assertEqual(self.sender.connections, 1)
+        self.assertIn(b"http://test/api/auth/confirmed_email/abc", self.handler.messages[0].content)
+        depth = await self.queue.depth()
+        self.assertEqual((depth["queued"], depth["processing"], depth["delayed"], depth["dead"]), (0, 0, 0, 0))
+
+    async def test_permanent_failure_dead_lettered(self):
+        await self.enqueue("reject@example.com")
+        await self.enqueue("user@example.com")
+        await self.worker.run_once()
+
+        self.assertEqual([m.rcpt_tos for m in self.handler.messages], [["user@example.com"]])
+        depth = await self.queue.depth()
+        self.assertEqual((depth["delayed"], depth["dead"]), (0, 1))
+
+    async def test_transient_failure_retried_then_dead_lettered(self):
+        await self.enqueue("busy@example.com")
+        await self.worker.run_once()
+        depth = await self.queue.depth()
+        self.assertEqual((depth["queued"], depth["delayed"], depth["dead"]), (0, 1, 0))
+
+        # до настання часу повтору лист лишається відкладеним
+        self.assertEqual(await self.queue.promote_due(), 0)
+        for _ in range(2):
+            self.assertEqual(await self.queue.promote_due(now=time.time() + 3600), 1)
+            await self.worker.run_once()
+
+        depth = await self.queue.depth()
+        self.assertEqual((depth["delayed"], depth["dead"]), (0, 1))
+        self.assertEqual(self.handler.messages, [])
+
+    async def test_recover_returns_unfinished_jobs(self):
+        await self.enqueue("user@example.com")
+        await self.queue.reserve(self.worker.name, 10)
+        self.assertEqual((await self.queue.depth())["processing"], 1)
+
+        self.assertEqual(await self.queue.recover(self.worker.name), 1)
+        await self.worker.run_once()
+        self.assertEqual(len(self.handler.messages), 1)
+
+    async def test_run_survives_redis_outage(self):
+        self.worker.backoff = 0.01
+        self.worker.poll_timeout = 0.01
+        self.server.connected = False
+        with self.assertLogs("src.services.email_worker", level="WARNING"):
+            task = asyncio.create_task(self.worker.run())
+            await asyncio.sleep(0.05)
+        self.assertFalse(task.done())
+
+        self.server.connected = True
+        await self.enqueue("user@example.com")
+        for _ in range(100):
+            if self.handler.messages:
+                break
+            await asyncio.sleep(0.01)
+        self.worker.stop()
+        await asyncio.wait_for(task, 1)
+        self.assertEqual(len(self.handler.messages), 1)
+
+    def test_retry_delay_backoff(self):
+        self.worker.max_delay = 10
+        self.assertEqual([self.worker.retry_delay(n) for n in range(5)], [1, 2, 4, 8, 10])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+from datetime import datetime
+
+from fastapi import HTTPException
+
+from src.services.pagination import encode_cursor, decode_cursor
+
+
+class TestPagination(unittest.TestCase):
+
+    def test_roundtrip_note_cursor(self):
+        key = (datetime(2023, 8, 10, 13, 49, 25, 84369), 42)
+        cursor = encode_cursor(*key)
+        self.assertEqual(decode_cursor(cursor, datetime, int), key)
+
+    def test_roundtrip_tag_cursor(self):
+        cursor = encode_cursor("news", 7)
+        self.assertEqual(decode_cursor(cursor, str, int), ("news", 7))
+
+    def test_empty_cursor(self):
+        self.assertIsNone(decode_cursor("", datetime, int))
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(HTTPException) as ctx:
+            decode_cursor("not-a-cursor", datetime, int)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_wrong_arity(self):
+        with self.assertRaises(HTTPException):
+            decode_cursor(encode_cursor("news"), str, int)
+
+
+if __name__ == '__main__':
+    unittest.main()
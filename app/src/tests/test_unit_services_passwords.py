@@ -0,0 +1,56 @@
+import asyncio
+import unittest
+
+from src.services.passwords import PasswordHasher
+
+
+class TestPasswordHasher(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.hasher = PasswordHasher(rounds=4, concurrency=2)
+
+    def tearDown(self):
+        self.hasher.close()
+
+    async def test_hash_and_verify(self):
+        hashed = await self.hasher.hash("secret")
+        valid, new_hash = await self.hasher.verify_and_update("secret", hashed)
+        self.assertTrue(valid)
+        self.assertIsNone(new_hash)
+
+    async def test_verify_wrong_password(self):
+        hashed = await self.hasher.hash("secret")
+        valid, new_hash = await self.hasher.verify_and_update("wrong", hashed)
+        self.assertFalse(valid)
+        self.assertIsNone(new_hash)
+
+    async def test_rehash_when_rounds_change(self):
+        hashed = await self.hasher.hash("secret")
+        self.hasher.rounds = 5
+        valid, new_hash = await self.hasher.verify_and_update("secret", hashed)
+        self.assertTrue(valid)
+        self.assertIsNotNone(new_hash)
+        self.assertIn("$05$", new_hash)
+        valid, newer_hash = await self.hasher.verify_and_update("secret", new_hash)
+        self.assertTrue(valid)
+        self.assertIsNone(newer_hash)
+
+
+class TestPasswordHasherLoops(unittest.TestCase):
+
+    def test_semaphore_bound_to_running_loop(self):
+        hasher = PasswordHasher(rounds=4, concurrency=1)
+        self.addCleanup(hasher.close)
+        self.assertIsNone(hasher._semaphore)
+
+        async def burst():
+            hashes = await asyncio.gather(*(hasher.hash("secret") for _ in range(3)))
+            return all([(await hasher.verify_and_update("secret", hashed))[0] for hashed in hashes])
+
+        # як у застосунку та тестах: кожен запуск зі своїм циклом подій
+        self.assertTrue(asyncio.run(burst()))
+        self.assertTrue(asyncio.run(burst()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from fakeredis import FakeServer, aioredis
+
+from src.services.rate_limit import Policy, RateLimiter, RateLimitMiddleware, load_policies, token_subject
+
+
+def scope(method: str = "GET", path: str = "/api/notes/", token: str | None = None, ip: str = "10.0.0.1") -> dict:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return {"type": "http", "method": method, "path": path, "headers": headers, "client": (ip, 5000)}
+
+
+class TestRateLimiter(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.server = FakeServer()
+        self.limiter = RateLimiter([
+            Policy("login", "/api/auth/login", "sliding_window", methods=["POST"], key="ip", limit=3, window=60),
+            Policy("read", "/api/*", "token_bucket", methods=["GET"], rate=1, burst=2),
+        ])
+        self.limiter.init(aioredis.FakeRedis(server=self.server))
+
+    async def test_sliding_window(self):
+        policy = self.limiter.match("POST", "/api/auth/login")
+        with patch("src.services.rate_limit.time.time", return_value=600.0):
+            decisions = [await self.limiter.hit(policy, "ip:1") for _ in range(4)]
+        self.assertEqual([d.allowed for d in decisions], [True, True, True, False])
+        self.assertEqual(decisions[2].remaining, 0)
+        self.assertAlmostEqual(decisions[3].retry_after, 60)
+        # посеред наступного вікна половина попереднього ще враховується: floor(3 * 0.5) = 1
+        with patch("src.services.rate_limit.time.time", return_value=690.0):
+            decisions = [await self.limiter.hit(policy, "ip:1") for _ in range(3)]
+        self.assertEqual([d.allowed for d in decisions], [True, True, False])
+
+    async def test_token_bucket(self):
+        policy = self.limiter.match("GET", "/api/notes/1")
+        with patch("src.services.rate_limit.time.time", return_value=1000.0):
+            decisions = [await self.limiter.hit(policy, "user:a") for _ in range(3)]
+            self.assertTrue((await self.limiter.hit(policy, "user:b")).allowed)
+        self.assertEqual([d.allowed for d in decisions], [True, True, False])
+        self.assertAlmostEqual(decisions[2].retry_after, 1)
+        with patch("src.services.rate_limit.time.time", return_value=1001.0):
+            self.assertTrue((await self.limiter.hit(policy, "user:a")).allowed)
+
+    async def test_local_fallback_when_redis_down(self):
+        self.server.connected = False
+        policy = self.limiter.match("GET", "/api/notes/")
+        with self.assertLogs("src.services.rate_limit", level="WARNING"):
+            decisions = [await self.limiter.hit(policy, "user:a") for _ in range(3)]
+        self.assertEqual([d.allowed for d in decisions], [True, True, False])
+        self.assertGreater(self.limiter._redis_down_until, 0)
+
+    def test_match_first_policy_wins(self):
+        self.assertEqual(self.limiter.match("POST", "/api/auth/login").name, "login")
+        self.assertEqual(self.limiter.match("GET", "/api/auth/login").name, "read")
+        self.assertIsNone(self.limiter.match("POST", "/api/notes/"))
+
+    def test_default_policy_table(self):
+        policies = load_policies(Path(__file__).parent.parent / "conf" / "rate_limits.json")
+        self.assertIn("api_read", [policy.name for policy in policies])
+
+
+class TestRateLimitMiddleware(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.limiter = RateLimiter([Policy("read", "/api/*", "token_bucket", methods=["GET"], rate=1, burst=1)])
+        self.calls = 0
+
+        async def app(scope, receive, send):
+            self.calls += 1
+
+        def decode(token: str) -> dict:
+            if not token.startswith("valid-"):
+                raise ValueError("invalid token")
+            return {"sub": token.removeprefix("valid-")}
+
+        identify = token_subject(decode, (ValueError,))
+        self.middleware = RateLimitMiddleware(app, self.limiter, identify)
+
+    async def call(self, request_scope) -> list:
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        await self.middleware(request_scope, None, send)
+        return sent
+
+    async def test_keyed_by_user_then_ip(self):
+        self.assertEqual(await self.call(scope(token="valid-a@example.com")), [])
+        sent = await self.call(scope(token="valid-a@example.com", ip="10.0.0.2"))
+        self.assertEqual(sent[0]["status"], 429)
+        self.assertIn((b"retry-after", b"1"), sent[0]["headers"])
+
+        # інший користувач з тієї ж адреси має власний ліміт, недійсний токен ключується IP
+        self.assertEqual(await self.call(scope(token="valid-b@example.com")), [])
+        self.assertEqual(await self.call(scope(token="forged")), [])
+        self.assertEqual((await self.call(scope(token="forged")))[0]["status"], 429)
+        self.assertEqual(self.calls, 3)
+
+    async def test_unmatched_requests_pass(self):
+        for _ in range(3):
+            self.assertEqual(await self.call(scope(path="/docs")), [])
+        self.assertEqual(self.calls, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+from fakeredis import aioredis
+
+from src.services.refresh_tokens import RefreshTokenStore, Rotation
+
+
+class TestRefreshTokenStore(unittest.IsolatedAsyncioTestCase):
+
+    async def asyncSetUp(self):
+        self.redis = aioredis.FakeRedis(decode_responses=True)
+        self.store = RefreshTokenStore(ttl=3600)
+        self.store.init(self.redis)
+        self.email = "test@example.com"
+
+    async def test_rotation_chain(self):
+        family, jti = await self.store.start(self.email, "phone")
+        rotation, next_jti = await self.store.rotate(self.email, family, jti)
+        self.assertIs(rotation, Rotation.ROTATED)
+        rotation, _ = await self.store.rotate(self.email, family, next_jti)
+        self.assertIs(rotation, Rotation.ROTATED)
+
+    async def test_reuse_revokes_family(self):
+        family, jti = await self.store.start(self.email, "phone")
+        _, next_jti = await self.store.rotate(self.email, family, jti)
+
+        rotation, new_jti = await self.store.rotate(self.email, family, jti)
+        self.assertIs(rotation, Rotation.REUSED)
+        self.assertIsNone(new_jti)
+        # після відкликання не працює і токен законного клієнта
+        rotation, _ = await self.store.rotate(self.email, family, next_jti)
+        self.assertIs(rotation, Rotation.UNKNOWN)
+        self.assertEqual(await self.store.sessions(self.email), [])
+
+    async def test_sessions_per_device(self):
+        phone, phone_jti = await self.store.start(self.email, "phone")
+        await self.store.start(self.email, "laptop")
+        self.assertEqual({s["device"] for s in await self.store.sessions(self.email)}, {"phone", "laptop"})
+
+        # повторний вхід з пристрою замінює його сесію
+        await self.store.start(self.email, "phone")
+        rotation, _ = await self.store.rotate(self.email, phone, phone_jti)
+        self.assertIs(rotation, Rotation.UNKNOWN)
+        self.assertEqual(len(await self.store.sessions(self.email)), 2)
+
+        self.assertTrue(await self.store.revoke(self.email, "laptop"))
+        self.assertFalse(await self.store.revoke(self.email, "laptop"))
+        await self.store.revoke_all(self.email)
+        self.assertEqual(await self.store.sessions(self.email), [])
+
+    async def test_ttl_set_and_extended(self):
+        family, jti = await self.store.start(self.email, "phone")
+        key = self.store.family_key(family)
+        self.assertGreater(await self.redis.ttl(key), 3500)
+        await self.redis.expire(key, 10)
+        await self.store.rotate(self.email, family, jti)
+        self.assertGreater(await self.redis.ttl(key), 3500)
+
+        await self.redis.delete(key)
+        rotation, _ = await self.store.rotate(self.email, family, jti)
+        self.assertIs(rotation, Rotation.UNKNOWN)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from src.services.rendering import TEMPLATE_FOLDER, create_environment, precompile, render, render_many
+
+
+class TestRendering(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.env = create_environment(TEMPLATE_FOLDER, self.cache_dir.name)
+
+    def tearDown(self):
+        self.cache_dir.cleanup()
+
+    def test_precompile_writes_bytecode_cache(self):
+        names = precompile(self.env)
+        self.assertIn("email_template.html", names)
+        self.assertEqual(len(list(Path(self.cache_dir.name).iterdir())), len(names))
+
+    def test_render_many_matches_render(self):
+        contexts = [{"host": "http://test/", "username": f"user{i}", "token": f"t{i}"} for i in range(3)]
+        result = render_many("email_template.html", contexts, self.env)
+        self.assertEqual(result, [render("email_template.html", context, self.env) for context in contexts])
+        self.assertIn("http://test/api/auth/confirmed_email/t2", result[2])
+
+    def test_autoescape(self):
+        html = render("email_template.html", {"host": "", "username": "<b>x</b>", "token": ""}, self.env)
+        self.assertIn("&lt;b&gt;x&lt;/b&gt;", html)
+
+
+if __name__ == '__main__':
+    unittest.main()
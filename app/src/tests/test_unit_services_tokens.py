@@ -0,0 +1,96 @@
+import time
+import unittest
+from unittest.mock import patch
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+from src.services.tokens import InvalidToken, TokenCodec, VerifiedTokenCache
+
+SECRET = "test-secret-key-of-at-least-32-bytes"
+
+
+def pem_pair(private_key) -> tuple[bytes, bytes]:
+    private = private_key.private_bytes(serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8,
+                                        serialization.NoEncryption())
+    public = private_key.public_key().public_bytes(serialization.Encoding.PEM,
+                                                   serialization.PublicFormat.SubjectPublicKeyInfo)
+    return private, public
+
+
+class TestTokenCodec(unittest.TestCase):
+
+    def claims(self, ttl: int = 60) -> dict:
+        return {"sub": "test@example.com", "scope": "access_token", "exp": int(time.time()) + ttl}
+
+    def test_hs256_roundtrip_both_backends(self):
+        for backend in ("jose", "pyjwt"):
+            with self.subTest(backend=backend):
+                codec = TokenCodec("HS256", secret_key=SECRET, backend=backend)
+                token = codec.encode(self.claims())
+                self.assertEqual(codec.decode(token)["sub"], "test@example.com")
+                # токени обох бекендів сумісні між собою
+                other = TokenCodec("HS256", secret_key=SECRET, backend="pyjwt" if backend == "jose" else "jose")
+                self.assertEqual(other.decode(token)["scope"], "access_token")
+
+    def test_repeated_decode_uses_cache(self):
+        codec = TokenCodec("HS256", secret_key=SECRET)
+        token = codec.encode(self.claims())
+        with patch.object(codec.backend, "decode", wraps=codec.backend.decode) as decode:
+            for _ in range(5):
+                codec.decode(token)
+        decode.assert_called_once()
+
+    def test_cached_token_expires_with_exp(self):
+        codec = TokenCodec("HS256", secret_key=SECRET)
+        token = codec.encode(self.claims(ttl=10))
+        codec.decode(token)
+        with patch("src.services.tokens.time.time", return_value=time.time() + 11):
+            self.assertIsNone(codec.cache.get(token))
+
+    def test_invalid_tokens_rejected(self):
+        codec = TokenCodec("HS256", secret_key=SECRET)
+        with self.assertRaises(InvalidToken):
+            codec.decode(codec.encode(self.claims(ttl=-10)))
+        with self.assertRaises(InvalidToken):
+            codec.decode(TokenCodec("HS256", secret_key=SECRET[::-1] + "!").encode(self.claims()))
+
+    def test_rs256_verify_with_public_key_only(self):
+        private, public = pem_pair(rsa.generate_private_key(public_exponent=65537, key_size=2048))
+        for backend in ("jose", "pyjwt"):
+            with self.subTest(backend=backend):
+                signer = TokenCodec("RS256", private_key=private, public_key=public, backend=backend)
+                verifier = TokenCodec("RS256", public_key=public, backend=backend)
+                self.assertEqual(verifier.decode(signer.encode(self.claims()))["sub"], "test@example.com")
+                with self.assertRaises(RuntimeError):
+                    verifier.encode(self.claims())
+
+    def test_eddsa_requires_pyjwt(self):
+        private, public = pem_pair(ed25519.Ed25519PrivateKey.generate())
+        signer = TokenCodec("EdDSA", private_key=private, public_key=public, backend="pyjwt")
+        verifier = TokenCodec("EdDSA", public_key=public, backend="pyjwt")
+        self.assertEqual(verifier.decode(signer.encode(self.claims()))["sub"], "test@example.com")
+        with self.assertRaises(ValueError):
+            TokenCodec("EdDSA", public_key=public, backend="jose")
+
+
+class TestVerifiedTokenCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = VerifiedTokenCache(maxsize=2, ttl=60)
+        cache.set("a", {"sub": "a"})
+        cache.set("b", {"sub": "b"})
+        cache.get("a")
+        cache.set("c", {"sub": "c"})
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+
+    def test_returns_copy(self):
+        cache = VerifiedTokenCache()
+        cache.set("a", {"sub": "a"})
+        cache.get("a")["sub"] = "changed"
+        self.assertEqual(cache.get("a"), {"sub": "a"})
+
+
+if __name__ == '__main__':
+    unittest.main()